@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure the number of attribute reads and writes per second on a model.
+
+The "generic" model customizes how its attributes are read,
+which makes it go through ``Model.__getattr__`` and ``Model.__setattr__``
+instead of the attribute descriptors generated for its columns.
+
+Usage, from the repository root:
+
+    PYTHONPATH=. python benchmarks/attributes.py [operations]
+"""
+
+import sys
+import timeit
+
+from orator import Model
+
+
+class FastUser(Model):
+
+    __casts__ = {'age': 'int'}
+
+
+class GenericUser(Model):
+
+    __casts__ = {'age': 'int'}
+
+    def get_attribute(self, key, original=None):
+        return super().get_attribute(key, original)
+
+
+def main(operations=1000000):
+    for name, model in [('generic', GenericUser), ('descriptors', FastUser)]:
+        user = model.hydrate([{'id': 1, 'name': 'john', 'age': '42'}])[0]
+
+        def read():
+            return user.name, user.age
+
+        def write():
+            user.name = 'jane'
+
+        for operation, func in [('read', read), ('write', write)]:
+            elapsed = min(timeit.repeat(func, number=operations, repeat=3))
+
+            print('%-12s %-6s %10d ops/s'
+                  % (name, operation, operations / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
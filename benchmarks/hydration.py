@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure the number of rows hydrated into models per second.
+
+The "constructor" path is the one taken by models defining
+their own constructor, which hydrate each row through
+``Model.__init__`` and ``fill()``.
+
+Usage, from the repository root:
+
+    PYTHONPATH=. python benchmarks/hydration.py [rows] [columns]
+"""
+
+import sys
+import timeit
+
+from orator import Model
+
+
+class FastUser(Model):
+
+    __table__ = 'users'
+
+
+class ConstructedUser(Model):
+
+    __table__ = 'users'
+
+    def __init__(self, _attributes=None, **attributes):
+        super().__init__(_attributes, **attributes)
+
+
+def main(rows=100000, columns=10):
+    records = []
+    for r in range(rows):
+        record = {'id': r}
+        for c in range(columns):
+            record['column_%d' % c] = 'value %d' % r
+
+        records.append(record)
+
+    for name, model in [('constructor', ConstructedUser), ('fast', FastUser)]:
+        elapsed = min(timeit.repeat(
+            lambda: model.hydrate(records), number=1, repeat=3))
+
+        print('%-12s %10d rows/s' % (name, rows / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measure the number of models serialized per second.
+
+The "per model" path converts each model through ``attributes_to_dict()``
+and ``relations_to_dict()``, while ``Collection.serialize()`` applies
+the serializer compiled for the model class.
+
+Usage, from the repository root:
+
+    PYTHONPATH=. python benchmarks/serialization.py [models]
+"""
+
+import sys
+import timeit
+
+from orator import Model
+
+
+class User(Model):
+
+    __hidden__ = ['password']
+    __casts__ = {'age': 'int', 'options': 'dict'}
+
+
+def main(count=10000):
+    users = User.hydrate([{
+        'id': i, 'name': 'john', 'email': 'john%d@doe.com' % i,
+        'password': 'secret', 'age': '42', 'options': '{"admin": false}',
+        'created_at': '2016-01-01 12:00:00', 'updated_at': '2016-01-01 12:00:00'
+    } for i in range(count)])
+
+    def per_model():
+        return [dict(u.attributes_to_dict(), **u.relations_to_dict())
+                for u in users]
+
+    for name, func in [('per model', per_model), ('compiled', users.serialize)]:
+        elapsed = min(timeit.repeat(func, number=1, repeat=3))
+
+        print('%-10s %10d models/s' % (name, count / elapsed))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -2,7 +2,10 @@
 
 __version__ = '0.12.4'
 
-from .orm import Model, SoftDeletes, Collection, accessor, mutator, scope # noqa
+from .orm import ( # noqa
+    Model, SoftDeletes, Collection, Session, IdentityMap,
+    accessor, mutator, scope
+)
 from .database_manager import DatabaseManager # noqa
 from .query.expression import QueryExpression # noqa
 from .schema import Schema # noqa
@@ -12,6 +12,7 @@ from ..query.processors.processor import QueryProcessor
 from ..schema.builder import SchemaBuilder
 from ..dbal.schema_manager import SchemaManager
 from ..exceptions.query import raise_from_cause
+from ..exceptions.connectors import PoolTimeout
 
 
 query_logger = logging.getLogger('orator.connection.queries')
@@ -28,14 +29,17 @@ def run(wrapped):
 
         start = time.time()
         try:
-            result = wrapped(self, query, bindings, *args, **kwargs)
-        except Exception as e:
-            result = self._try_again_if_caused_by_lost_connection(
-                e, query, bindings, wrapped
-            )
+            try:
+                result = wrapped(self, query, bindings, *args, **kwargs)
+            except Exception as e:
+                result = self._try_again_if_caused_by_lost_connection(
+                    e, query, bindings, wrapped
+                )
 
-        t = self._get_elapsed_time(start)
-        self.log_query(query, bindings, t)
+            t = self._get_elapsed_time(start)
+            self.log_query(query, bindings, t)
+        finally:
+            self._release_after_statement()
 
         return result
 
@@ -66,6 +70,14 @@ class Connection(ConnectionInterface):
 
         self._read_connection = None
 
+        self._pool = None
+        self._read_pool = None
+        self._scopes = 0
+
+        self._read_router = None
+        self._replica = None
+        self._replica_connections = {}
+
         self._database = database
 
         if table_prefix is None:
@@ -78,6 +90,13 @@ class Connection(ConnectionInterface):
 
         self._config = config
 
+        self._sticky = config.get('sticky', False)
+        self._records_modified_at = None
+
+        self._server_side_cursors = config.get('server_side_cursors', False)
+
+        self._prepared_statements = config.get('prepared_statements', False)
+
         self._reconnector = None
 
         self._transactions = 0
@@ -128,7 +147,7 @@ class Connection(ConnectionInterface):
         return QueryProcessor()
 
     def get_database_platform(self):
-        return self._connection.get_database_platform()
+        return self.get_connection().get_database_platform()
 
     def get_schema_builder(self):
         """
@@ -187,7 +206,13 @@ class Connection(ConnectionInterface):
         if bindings is None:
             bindings = {}
 
-        return self.select(query, bindings)
+        result = self.select(query, bindings, False)
+
+        # This is used to run queries returning data,
+        # like "INSERT ... RETURNING", so we assume records have been modified.
+        self.records_have_been_modified()
+
+        return result
 
     @run
     def select(self, query, bindings=None, use_read_connection=True):
@@ -195,48 +220,150 @@ class Connection(ConnectionInterface):
             return []
 
         bindings = self.prepare_bindings(bindings)
-        cursor = self._get_cursor_for_select(use_read_connection)
-        cursor.execute(query, bindings)
+        cursor = self._execute_for_select(query, bindings, use_read_connection)
 
         return cursor.fetchall()
 
     def select_many(self, size, query, bindings=None,
-                    use_read_connection=True, abort=False):
+                    use_read_connection=True, abort=False, server_side=None):
+        """
+        Run a select statement and yield the results by chunks.
+
+        With server-side cursors, the rows are fetched from the server
+        as the chunks are consumed rather than all at once.
+
+        :param size: The chunk size
+        :type size: int
+
+        :param server_side: Whether to use a server-side cursor,
+                            defaults to the "server_side_cursors" option
+        :type server_side: bool or None
+        """
+        if server_side is None:
+            server_side = bool(self._server_side_cursors)
+
         if self.pretending():
             yield []
         else:
             bindings = self.prepare_bindings(bindings)
-            cursor = self._get_cursor_for_select(use_read_connection)
 
             try:
-                cursor.execute(query, bindings)
+                cursor = self._execute_for_select(
+                    query, bindings, use_read_connection, server_side)
             except Exception as e:
                 if self._caused_by_lost_connection(e) and not abort:
+                    self._forget_prepared_statements()
+
                     self.reconnect()
 
                     for results in self.select_many(
-                            size, query, bindings, use_read_connection, True):
+                            size, query, bindings, use_read_connection, True,
+                            server_side):
                         yield results
                 else:
                     raise
             else:
-                results = cursor.fetchmany(size)
-                while results:
-                    yield results
+                # The connection is kept until the rows are all fetched,
+                # whatever the queries run in between.
+                self._scopes += 1
 
+                try:
                     results = cursor.fetchmany(size)
+                    while results:
+                        yield results
+
+                        results = cursor.fetchmany(size)
+                finally:
+                    if server_side:
+                        # Server-side cursors hold resources on the server
+                        # until they are closed.
+                        cursor.close()
+
+                    self._scopes -= 1
+                    self._release_after_statement()
+
+    def _get_cursor_for_select(self, use_read_connection=True, exclude=None,
+                               server_side=False):
+        self._replica = None
 
-    def _get_cursor_for_select(self, use_read_connection=True):
         if use_read_connection:
-            self._cursor = self.get_read_connection().cursor()
+            connection = self._get_read_connection(exclude)
         else:
-            self._cursor = self.get_connection().cursor()
+            connection = self.get_connection()
+
+        if server_side:
+            self._cursor = connection.server_side_cursor(self._get_itersize())
+        else:
+            self._cursor = connection.cursor()
 
         return self._cursor
 
+    def _get_itersize(self):
+        if isinstance(self._server_side_cursors, dict):
+            return self._server_side_cursors.get('itersize')
+
+    def _execute_for_select(self, query, bindings, use_read_connection=True,
+                            server_side=False):
+        """
+        Execute a select query and return the cursor holding the results.
+
+        When the query is routed to a replica that has lost its connection,
+        the replica is taken out of the rotation
+        and the query is tried again on another one.
+        """
+        failed = []
+
+        while True:
+            cursor = self._get_cursor_for_select(
+                use_read_connection, failed, server_side)
+            replica = self._replica
+
+            if replica is None:
+                self._execute(cursor, query, bindings, not server_side)
+
+                return cursor
+
+            self._read_router.begin(replica)
+            start = time.time()
+            lost = False
+
+            try:
+                self._execute(cursor, query, bindings, not server_side)
+
+                return cursor
+            except Exception as e:
+                lost = self._caused_by_lost_connection(e)
+                if not lost:
+                    raise
+
+                self._drop_replica_connection(replica)
+                failed.append(replica)
+            finally:
+                self._read_router.end(
+                    replica, self._get_elapsed_time(start), lost)
+
     def insert(self, query, bindings=None):
         return self.statement(query, bindings)
 
+    @run
+    def insert_many(self, query, bindings=None):
+        """
+        Run an insert statement once per list of bindings.
+
+        :return: The number of records inserted
+        :rtype: int
+        """
+        if self.pretending():
+            return len(bindings or [])
+
+        cursor = self._new_cursor()
+        cursor.executemany(query, [self.prepare_bindings(b)
+                                   for b in bindings or []])
+
+        self.records_have_been_modified()
+
+        return cursor.rowcount
+
     def update(self, query, bindings=None):
         return self.affecting_statement(query, bindings)
 
@@ -250,7 +377,11 @@ class Connection(ConnectionInterface):
 
         bindings = self.prepare_bindings(bindings)
 
-        return self._new_cursor().execute(query, bindings)
+        result = self._execute(self._new_cursor(), query, bindings)
+
+        self.records_have_been_modified()
+
+        return result
 
     @run
     def affecting_statement(self, query, bindings=None):
@@ -260,10 +391,47 @@ class Connection(ConnectionInterface):
         bindings = self.prepare_bindings(bindings)
 
         cursor = self._new_cursor()
-        cursor.execute(query, bindings)
+        self._execute(cursor, query, bindings)
+
+        self.records_have_been_modified()
 
         return cursor.rowcount
 
+    def _execute(self, cursor, query, bindings, prepare=True):
+        """
+        Execute a query on a cursor, as a prepared statement
+        if the "prepared_statements" option is enabled.
+        """
+        if prepare and self._prepared_statements \
+                and self._is_preparable(query):
+            return self._execute_prepared(cursor, query, bindings)
+
+        return cursor.execute(query, bindings)
+
+    def _is_preparable(self, query):
+        return query.lstrip()[:6].lower() in (
+            'select', 'insert', 'update', 'delete')
+
+    def _execute_prepared(self, cursor, query, bindings):
+        """
+        Execute a query as a prepared statement.
+
+        Drivers without prepared statements execute the query as is.
+        """
+        return cursor.execute(query, bindings)
+
+    def _forget_prepared_statements(self):
+        """
+        Forget the statements prepared on the current dbapi connections.
+        """
+        pass
+
+    def _get_prepared_statements_size(self):
+        if isinstance(self._prepared_statements, dict):
+            return self._prepared_statements.get('max_size', 100)
+
+        return 100
+
     def _new_cursor(self):
         self._cursor = self.get_connection().cursor()
 
@@ -277,7 +445,11 @@ class Connection(ConnectionInterface):
         if self.pretending():
             return True
 
-        return bool(self.get_connection().execute(query))
+        result = bool(self.get_connection().execute(query))
+
+        self.records_have_been_modified()
+
+        return result
 
     def prepare_bindings(self, bindings):
         if bindings is None:
@@ -293,6 +465,7 @@ class Connection(ConnectionInterface):
             yield self
         except Exception as e:
             self.rollback()
+            self._release_if_out_of_scope()
             raise
 
         try:
@@ -300,13 +473,34 @@ class Connection(ConnectionInterface):
         except Exception:
             self.rollback()
             raise
+        finally:
+            self._release_if_out_of_scope()
+
+    @contextmanager
+    def scope(self):
+        """
+        Keep the pooled dbapi connections checked out
+        until the end of the block.
+
+        When the outermost scope ends, the connections
+        are given back to their pool.
+        """
+        self._scopes += 1
+
+        try:
+            yield self
+        finally:
+            self._scopes -= 1
+
+            if self._scopes == 0:
+                self.release()
 
     def begin_transaction(self):
         self._transactions += 1
 
     def commit(self):
         if self._transactions == 1:
-            self._connection.commit()
+            self.get_connection().commit()
 
         self._transactions -= 1
 
@@ -314,7 +508,7 @@ class Connection(ConnectionInterface):
         if self._transactions == 1:
             self._transactions = 0
 
-            self._connection.rollback()
+            self.get_connection().rollback()
         else:
             self._transactions -= 1
 
@@ -337,11 +531,14 @@ class Connection(ConnectionInterface):
     def _try_again_if_caused_by_lost_connection(
             self, e, query, bindings, callback, *args, **kwargs):
         if self._caused_by_lost_connection(e):
+            # Prepared statements do not survive the connection
+            self._forget_prepared_statements()
+
             self.reconnect()
 
             return callback(self, query, bindings, *args, **kwargs)
 
-        raise_from_cause(self._connection.get_api(), query, bindings, e)
+        raise_from_cause(self.get_connection().get_api(), query, bindings, e)
 
     def _caused_by_lost_connection(self, e):
         message = str(e).lower()
@@ -364,12 +561,25 @@ class Connection(ConnectionInterface):
     def disconnect(self):
         connection_logger.debug('%s is disconnecting' %
                                 self.__class__.__name__)
+        if self._pool is not None:
+            # A disconnection usually means that the connections
+            # are unusable, so they are closed rather than reused.
+            self._transactions = 0
+            self._give_back_connections(discard=True)
+
+            connection_logger.debug('%s disconnected' %
+                                    self.__class__.__name__)
+
+            return
+
         if self._connection:
             self._connection.close()
 
         if self._read_connection and self._connection != self._read_connection:
             self._read_connection.close()
 
+        self._give_back_replica_connections(discard=True)
+
         self.set_connection(None).set_read_connection(None)
 
         connection_logger.debug('%s disconnected' % self.__class__.__name__)
@@ -382,9 +592,83 @@ class Connection(ConnectionInterface):
         raise Exception('Lost connection and no reconnector available')
 
     def _reconnect_if_missing_connection(self):
-        if self.get_connection() is None or self.get_read_connection() is None:
+        if self._pool is not None:
+            # Pooled connections are checked out when they are needed.
+            return
+
+        # The read connection falls back on the write connection,
+        # so we only need to check the latter.
+        if self.get_connection() is None:
             self.reconnect()
 
+    def release(self):
+        """
+        Give the pooled dbapi connections back to their pool
+        and end the read-your-writes stickiness.
+
+        Nothing is released while a transaction is running.
+
+        :return: Whether the connections have been released
+        :rtype: bool
+        """
+        if self._transactions >= 1:
+            return False
+
+        self._records_modified_at = None
+
+        return self._release_connections()
+
+    def _release_connections(self):
+        if self._transactions >= 1:
+            return False
+
+        if self._pool is None:
+            # Without a pool, the replica connections are closed
+            # instead of being kept open for the life of the connection.
+            self._give_back_replica_connections(discard=True)
+
+            return False
+
+        self._give_back_connections()
+
+        return True
+
+    def _release_if_out_of_scope(self):
+        if self._scopes == 0:
+            self._release_connections()
+
+    def _release_after_statement(self):
+        # Outside of a scope or a transaction, the pooled connections
+        # are given back after each statement, so that they are not kept
+        # by threads that never release them.
+        if self._pool is not None:
+            self._release_if_out_of_scope()
+
+    def _give_back_connections(self, discard=False):
+        if self._connection is not None:
+            self._pool.checkin(self._connection, discard)
+            self._connection = None
+
+        if self._read_connection is not None:
+            self._read_pool.checkin(self._read_connection, discard)
+            self._read_connection = None
+
+        self._give_back_replica_connections(discard)
+
+    def _give_back_replica_connections(self, discard=False):
+        connections = self._replica_connections
+        self._replica_connections = {}
+        self._replica = None
+
+        for replica, connection in connections.items():
+            replica.give_back(connection, discard)
+
+    def _drop_replica_connection(self, replica):
+        connection = self._replica_connections.pop(replica, None)
+
+        if connection is not None:
+            replica.give_back(connection, discard=True)
+
     def log_query(self, query, bindings, time_=None):
         if self.pretending():
             self._logged_queries.append(
@@ -421,16 +705,141 @@ class Connection(ConnectionInterface):
         return self._logged_queries
 
     def get_connection(self):
+        if self._connection is None and self._pool is not None:
+            self._connection = self._pool.checkout()
+
         return self._connection
 
     def get_read_connection(self):
+        return self._get_read_connection()
+
+    def _get_read_connection(self, exclude=None):
         if self._transactions >= 1:
             return self.get_connection()
 
+        if self._sticks_to_write_connection():
+            return self.get_connection()
+
+        if self._read_router is not None:
+            return self._get_routed_connection(exclude)
+
+        if self._read_connection is None and self._read_pool is not None:
+            self._read_connection = self._read_pool.checkout()
+
         if self._read_connection is not None:
             return self._read_connection
 
-        return self._connection
+        return self.get_connection()
+
+    def records_have_been_modified(self):
+        """
+        Indicate that records have been modified on the write connection.
+
+        With the "sticky" option, the following reads
+        will also be made on the write connection.
+        """
+        if self._sticky and not self._pretending:
+            self._records_modified_at = time.time()
+
+    def _sticks_to_write_connection(self):
+        """
+        Determine whether reads must use the write connection
+        to see the records modified by the previous writes.
+
+        The "sticky" option is either True, to stick until the connection
+        is released, or the number of seconds to stick after a write.
+
+        :rtype: bool
+        """
+        if self._records_modified_at is None:
+            return False
+
+        if self._sticky is True:
+            return True
+
+        if time.time() - self._records_modified_at < self._sticky:
+            return True
+
+        self._records_modified_at = None
+
+        return False
+
+    def shares_database_across_connections(self):
+        """
+        Determine whether other connections with the same configuration,
+        like the ones of other threads, access the same database.
+
+        :rtype: bool
+        """
+        return True
+
+    def streaming_blocks_connection(self):
+        """
+        Determine whether a server-side cursor keeps the connection busy
+        until all its rows are fetched, preventing any other query.
+
+        :rtype: bool
+        """
+        return False
+
+    def reads_own_writes(self):
+        """
+        Determine whether the reads must be made by this connection
+        to see its own writes, during a transaction
+        or while sticking to the write connection.
+
+        :rtype: bool
+        """
+        return self._transactions >= 1 or self._sticks_to_write_connection()
+
+    def _get_routed_connection(self, exclude=None):
+        """
+        Get a connection to the replica chosen by the read router.
+
+        Replicas that cannot be reached are taken out of the rotation.
+        If no replica is available, the write connection is used.
+
+        :param exclude: Replicas that must not be used
+        :type exclude: list
+        """
+        exclude = list(exclude or [])
+
+        while True:
+            replica = self._read_router.choose(exclude)
+
+            if replica is None:
+                return self.get_connection()
+
+            connection = self._replica_connections.get(replica)
+
+            if connection is None:
+                if replica.pool is None:
+                    # Without a pool, a single replica connection is kept
+                    # open, like the read connection of a connection
+                    # without replicas.
+                    self._give_back_replica_connections(discard=True)
+
+                try:
+                    connection = replica.connect()
+                except PoolTimeout:
+                    exclude.append(replica)
+
+                    continue
+                except Exception as e:
+                    connection_logger.warning(
+                        'Unable to connect to read replica %s: %s'
+                        % (replica.name, e))
+
+                    self._read_router.mark_down(replica)
+                    exclude.append(replica)
+
+                    continue
+
+                self._replica_connections[replica] = connection
+
+            self._replica = replica
+
+            return connection
 
     def set_connection(self, connection):
         if self._transactions >= 1:
@@ -446,6 +855,69 @@ class Connection(ConnectionInterface):
 
         return self
 
+    def get_pool(self):
+        """
+        Get the pool of the write connections.
+
+        :rtype: orator.connectors.pool.ConnectionPool or None
+        """
+        return self._pool
+
+    def set_pool(self, pool):
+        """
+        Use a pool to get the write connections.
+
+        :param pool: The connection pool
+        :type pool: orator.connectors.pool.ConnectionPool
+
+        :rtype: Connection
+        """
+        self._pool = pool
+
+        return self
+
+    def get_read_pool(self):
+        """
+        Get the pool of the read connections.
+
+        :rtype: orator.connectors.pool.ConnectionPool or None
+        """
+        return self._read_pool
+
+    def set_read_pool(self, pool):
+        """
+        Use a pool to get the read connections.
+
+        :param pool: The connection pool
+        :type pool: orator.connectors.pool.ConnectionPool
+
+        :rtype: Connection
+        """
+        self._read_pool = pool
+
+        return self
+
+    def get_read_router(self):
+        """
+        Get the router spreading the read queries over the replicas.
+
+        :rtype: orator.connectors.read_router.ReadRouter or None
+        """
+        return self._read_router
+
+    def set_read_router(self, router):
+        """
+        Use a router to spread the read queries over several replicas.
+
+        :param router: The read router
+        :type router: orator.connectors.read_router.ReadRouter
+
+        :rtype: Connection
+        """
+        self._read_router = router
+
+        return self
+
     def set_reconnector(self, reconnector):
         self._reconnector = reconnector
 
@@ -524,7 +996,7 @@ class Connection(ConnectionInterface):
         return SchemaManager(self)
 
     def get_params(self):
-        return self._connection.get_params()
+        return self.get_connection().get_params()
 
     def get_marker(self):
         return self._marker
@@ -549,8 +1021,11 @@ class Connection(ConnectionInterface):
             except Exception:
                 self.rollback()
                 raise
+            finally:
+                self._release_if_out_of_scope()
         else:
             self.rollback()
+            self._release_if_out_of_scope()
             e = exc_type(exc_val)
             e.__traceback__ = exc_tb
             raise e
@@ -563,4 +1038,4 @@ class Connection(ConnectionInterface):
         return self._server_version
 
     def get_server_version(self):
-        return self._connection.get_server_version()
+        return self.get_connection().get_server_version()
@@ -75,6 +75,20 @@ class ConnectionInterface:
         """
         raise NotImplementedError()
 
+    def insert_many(self, query, bindings=None):
+        """
+        Run an insert statement once per list of bindings
+
+        :param query: The insert statement
+        :type query: str
+        :param bindings: The bindings of each row
+        :type bindings: list
+
+        :return: The number of records inserted
+        :rtype: int
+        """
+        raise NotImplementedError()
+
     def update(self, query, bindings=None):
         """
         Run an update statement against the database
@@ -35,15 +35,20 @@ class MySQLConnection(Connection):
     def get_schema_manager(self):
         return MySQLSchemaManager(self)
 
+    def streaming_blocks_connection(self):
+        # The rows of unbuffered cursors must be read
+        # before the next query is sent
+        return True
+
     def begin_transaction(self):
-        self._connection.autocommit(False)
+        self.get_connection().autocommit(False)
 
         super().begin_transaction()
 
     def commit(self):
         if self._transactions == 1:
-            self._connection.commit()
-            self._connection.autocommit(True)
+            self.get_connection().commit()
+            self.get_connection().autocommit(True)
 
         self._transactions -= 1
 
@@ -51,8 +56,8 @@ class MySQLConnection(Connection):
         if self._transactions == 1:
             self._transactions = 0
 
-            self._connection.rollback()
-            self._connection.autocommit(True)
+            self.get_connection().rollback()
+            self.get_connection().autocommit(True)
         else:
             self._transactions -= 1
 
@@ -1,17 +1,27 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import division
+
+import re
+import json
+import time
+import itertools
 from .connection import Connection, run
 from ..query.grammars.postgres_grammar import PostgresQueryGrammar
 from ..query.processors.postgres_processor import PostgresQueryProcessor
 from ..schema.grammars import PostgresSchemaGrammar
 from ..dbal.postgres_schema_manager import PostgresSchemaManager
+from ..utils.lru_cache import LRUCache
+from ..utils.qmarker import qmark
 
 
 class PostgresConnection(Connection):
 
     name = 'pgsql'
 
+    # Prepared statements names must be unique within a session
+    _statement_ids = itertools.count(1)
+
     def get_default_query_grammar(self):
         return PostgresQueryGrammar(marker=self._marker)
 
@@ -31,19 +41,202 @@ class PostgresConnection(Connection):
 
         bindings = self.prepare_bindings(bindings)
 
-        self._new_cursor().execute(query, bindings)
+        self._execute(self._new_cursor(), query, bindings)
+
+        self.records_have_been_modified()
 
         return True
 
+    def copy_from(self, table, rows, columns=None, format='text'):
+        """
+        Load rows into a table with COPY FROM STDIN.
+
+        The rows are encoded as they are sent,
+        so that any number of rows can be loaded in constant memory.
+
+        :param table: The table name
+        :type table: str
+
+        :param rows: The rows, as dicts or sequences, or a file-like
+                     object of data already encoded in the given format
+        :type rows: iterable or file
+
+        :param columns: The columns of the rows, defaults to the keys
+                        of the first row when the rows are dicts
+        :type columns: list or None
+
+        :param format: The format of a file-like object
+                       (text, csv or binary)
+        :type format: str
+
+        :return: The number of rows loaded
+        :rtype: int
+        """
+        if hasattr(rows, 'read'):
+            stream = rows
+        else:
+            stream = CopyStream(rows, columns)
+            columns = stream.columns
+            format = 'text'
+
+        grammar = self.get_query_grammar()
+
+        query = 'COPY %s' % grammar.wrap_table(table)
+        if columns:
+            query += ' (%s)' % grammar.columnize(columns)
+
+        query += ' FROM STDIN WITH (FORMAT %s)' % format
+
+        count = self._copy(self.get_connection(), query, stream)
+
+        self.records_have_been_modified()
+
+        return count
+
+    def copy_to(self, query, file, format='csv', header=False):
+        """
+        Export the results of a query with COPY TO STDOUT.
+
+        :param query: The query to export or a table name
+        :type query: orator.query.builder.QueryBuilder or str
+
+        :param file: The file-like object receiving the data
+        :type file: file
+
+        :param format: The export format (csv, text or binary)
+        :type format: str
+
+        :param header: Whether to include a header line in csv format
+        :type header: bool
+
+        :return: The number of rows exported
+        :rtype: int
+        """
+        connection = self.get_read_connection()
+
+        if isinstance(query, str):
+            source = self.get_query_grammar().wrap_table(query)
+        else:
+            source = '(%s)' % self._inline_bindings(
+                connection, query.to_sql(), query.get_bindings())
+
+        options = 'FORMAT %s' % format
+        if header:
+            options += ', HEADER true'
+
+        query = 'COPY %s TO STDOUT WITH (%s)' % (source, options)
+
+        return self._copy(connection, query, file)
+
+    def _copy(self, connection, query, file):
+        self._reconnect_if_missing_connection()
+
+        cursor = connection.cursor()
+        self._cursor = cursor
+
+        start = time.time()
+
+        try:
+            if not self.pretending():
+                cursor.copy_expert(query, file)
+
+            self.log_query(query, None, self._get_elapsed_time(start))
+        finally:
+            self._release_after_statement()
+
+        if self.pretending():
+            return 0
+
+        return cursor.rowcount
+
+    def _inline_bindings(self, connection, query, bindings):
+        if self._marker == '?':
+            query = qmark(query)
+
+        if not bindings:
+            return query.replace('%%', '%')
+
+        return connection.cursor().mogrify(query, bindings).decode()
+
+    def _execute_prepared(self, cursor, query, bindings):
+        """
+        Execute a query with PREPARE and EXECUTE.
+
+        The statements are prepared once per dbapi connection,
+        and the least recently used ones are deallocated.
+        """
+        connection = cursor.connection
+
+        if not hasattr(connection, 'plain_cursor'):
+            return cursor.execute(query, bindings)
+
+        statements = self._get_prepared_statements(connection)
+
+        name = statements.get(query)
+        if name is None:
+            name = 'orator_%d' % next(self._statement_ids)
+
+            connection.plain_cursor().execute(
+                'PREPARE %s AS %s' % (name, self._to_positional(query)))
+
+            statements.put(query, name)
+
+        if not bindings:
+            return cursor.execute('EXECUTE %s' % name)
+
+        marker = self._marker or '%s'
+
+        return cursor.execute(
+            'EXECUTE %s (%s)' % (name, ', '.join([marker] * len(bindings))),
+            bindings
+        )
+
+    def _get_prepared_statements(self, connection):
+        if connection.prepared_statements is None:
+            def deallocate(query, name):
+                try:
+                    connection.plain_cursor().execute('DEALLOCATE %s' % name)
+                except Exception:
+                    pass
+
+            connection.prepared_statements = LRUCache(
+                self._get_prepared_statements_size(), deallocate)
+
+        return connection.prepared_statements
+
+    def _to_positional(self, query):
+        """
+        Replace the markers of a query by positional parameters ($1, $2...).
+        """
+        if self._marker == '?':
+            query = qmark(query)
+
+        position = itertools.count(1)
+
+        return re.sub('%%|%s',
+                      lambda m: '%' if m.group(0) == '%%'
+                      else '$%d' % next(position),
+                      query)
+
+    def _forget_prepared_statements(self):
+        connections = [self._connection, self._read_connection]
+        connections += list(self._replica_connections.values())
+
+        for connection in connections:
+            statements = getattr(connection, 'prepared_statements', None)
+
+            if statements is not None:
+                statements.clear()
+
     def begin_transaction(self):
-        self._connection.autocommit = False
+        self.get_connection().autocommit = False
 
         super().begin_transaction()
 
     def commit(self):
         if self._transactions == 1:
-            self._connection.commit()
-            self._connection.autocommit = True
+            self.get_connection().commit()
+            self.get_connection().autocommit = True
 
         self._transactions -= 1
 
@@ -51,12 +244,16 @@ class PostgresConnection(Connection):
         if self._transactions == 1:
             self._transactions = 0
 
-            self._connection.rollback()
-            self._connection.autocommit = True
+            self.get_connection().rollback()
+            self.get_connection().autocommit = True
         else:
             self._transactions -= 1
 
     def _get_cursor_query(self, query, bindings):
+        if self._prepared_statements and not self._pretending:
+            # The cursor holds the EXECUTE query
+            return super()._get_cursor_query(query, bindings)
+
         if self._pretending:
             return self._cursor.mogrify(query, bindings).decode()
 
@@ -64,3 +261,82 @@ class PostgresConnection(Connection):
             return super()._get_cursor_query(query, bindings)
 
         return self._cursor.query.decode()
+
+
+class CopyStream:
+    """
+    A file-like object encoding rows in the COPY text format
+    as they are read.
+    """
+
+    def __init__(self, rows, columns=None):
+        """
+        :param rows: The rows, as dicts or sequences
+        :type rows: iterable
+
+        :param columns: The columns of the rows
+        :type columns: list or None
+        """
+        self._rows = iter(rows)
+        self._buffer = ''
+
+        first = next(self._rows, None)
+        if first is not None:
+            if columns is None and isinstance(first, dict):
+                columns = list(first.keys())
+
+            self._rows = itertools.chain([first], self._rows)
+
+        self.columns = columns
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+
+        for row in self._rows:
+            line = self.encode_row(row)
+
+            chunks.append(line)
+            length += len(line)
+
+            if 0 <= size <= length:
+                break
+
+        data = ''.join(chunks)
+
+        if size < 0:
+            self._buffer = ''
+
+            return data
+
+        self._buffer = data[size:]
+
+        return data[:size]
+
+    def encode_row(self, row):
+        if isinstance(row, dict):
+            row = [row[column] for column in self.columns]
+
+        return '\t'.join([self.encode_value(value) for value in row]) + '\n'
+
+    @classmethod
+    def encode_value(cls, value):
+        if value is None:
+            return '\\N'
+
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            # The backslash of the bytea hex format must be escaped
+            return '\\\\x' + bytes(value).hex()
+
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value)
+        elif not isinstance(value, str):
+            value = str(value)
+
+        return value.replace('\\', '\\\\')\
+            .replace('\t', '\\t')\
+            .replace('\n', '\\n')\
+            .replace('\r', '\\r')
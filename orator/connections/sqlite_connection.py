@@ -23,15 +23,19 @@ class SQLiteConnection(Connection):
     def get_schema_manager(self):
         return SQLiteSchemaManager(self)
 
+    def shares_database_across_connections(self):
+        # In-memory and temporary databases are private to their connection
+        return self.get_database_name() not in (':memory:', '')
+
     def begin_transaction(self):
-        self._connection.isolation_level = 'DEFERRED'
+        self.get_connection().isolation_level = 'DEFERRED'
 
         super().begin_transaction()
 
     def commit(self):
         if self._transactions == 1:
-            self._connection.commit()
-            self._connection.isolation_level = None
+            self.get_connection().commit()
+            self.get_connection().isolation_level = None
 
         self._transactions -= 1
 
@@ -39,8 +43,8 @@ class SQLiteConnection(Connection):
         if self._transactions == 1:
             self._transactions = 0
 
-            self._connection.rollback()
-            self._connection.isolation_level = None
+            self.get_connection().rollback()
+            self.get_connection().isolation_level = None
         else:
             self._transactions -= 1
 
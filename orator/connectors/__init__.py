@@ -4,3 +4,5 @@ from .connector import Connector # noqa
 from .mysql_connector import MySQLConnector # noqa
 from .postgres_connector import PostgresConnector # noqa
 from .sqlite_connector import SQLiteConnector # noqa
+from .pool import ConnectionPool # noqa
+from .read_router import ReadRouter, Replica # noqa
@@ -1,11 +1,14 @@
 # -*- coding: utf-8 -*-
 
 import random
+import threading
 from ..exceptions import ArgumentError
 from ..exceptions.connectors import UnsupportedDriver
 from .mysql_connector import MySQLConnector
 from .postgres_connector import PostgresConnector
 from .sqlite_connector import SQLiteConnector
+from .pool import ConnectionPool
+from .read_router import ReadRouter, Replica
 from ..connections import (
     MySQLConnection,
     PostgresConnection,
@@ -29,16 +32,24 @@ class ConnectionFactory:
         'pgsql': PostgresConnection
     }
 
+    def __init__(self):
+        self._pools = {}
+        self._routers = {}
+        self._pools_lock = threading.Lock()
+
     def make(self, config, name=None):
         if 'read' in config:
             return self._create_read_write_connection(config)
 
         return self._create_single_connection(config)
 
-    def _create_single_connection(self, config):
-        conn = self.create_connector(config).connect(config)
+    def _create_single_connection(self, config, pool_source=None):
+        if config.get('pool'):
+            conn = None
+        else:
+            conn = self.create_connector(config).connect(config)
 
-        return self._create_connection(
+        connection = self._create_connection(
             config['driver'],
             conn,
             config['database'],
@@ -46,23 +57,113 @@ class ConnectionFactory:
             config
         )
 
+        if config.get('pool'):
+            connection.set_pool(
+                self._get_pool(pool_source or config, config, 'write'))
+
+        return connection
+
     def _create_read_write_connection(self, config):
         connection = self._create_single_connection(
-            self._get_write_config(config))
+            self._get_write_config(config), config)
 
-        connection.set_read_connection(self._create_read_connection(config))
+        if config['read']:
+            connection.set_read_router(self._get_read_router(config))
 
         return connection
 
-    def _create_read_connection(self, config):
-        read_config = self._get_read_config(config)
+    def _get_pool(self, source, config, type):
+        """
+        Get the pool shared by every connection made from a configuration.
+
+        Since DatabaseManager instances are thread-local, each thread makes
+        its own connection from the same configuration,
+        so the pools are kept here and indexed by the configuration identity.
+
+        :param source: The configuration given to the factory
+        :type source: dict
+
+        :param config: The resolved configuration of the pooled connections
+        :type config: dict
+
+        :param type: The pool type, either "read" or "write"
+        :type type: str
+
+        :rtype: ConnectionPool
+        """
+        key = (id(source), type)
+
+        with self._pools_lock:
+            if key not in self._pools:
+                def creator():
+                    return self.create_connector(config).connect(config)
+
+                pool = ConnectionPool.from_config(creator, config['pool'])
+
+                # We keep a reference to the source configuration
+                # so that its identity cannot be reused by another one.
+                self._pools[key] = (source, pool)
+
+            return self._pools[key][1]
+
+    def _get_read_router(self, config):
+        """
+        Get the router shared by every connection made from a configuration.
+
+        :param config: The configuration given to the factory
+        :type config: dict
+
+        :rtype: ReadRouter
+        """
+        key = id(config)
+
+        with self._pools_lock:
+            if key not in self._routers:
+                replicas = [self._make_replica(read_config)
+                            for read_config in self._get_read_configs(config)]
+
+                router = ReadRouter.from_config(
+                    replicas, config.get('read_router'))
+
+                self._routers[key] = (config, router)
+
+            return self._routers[key][1]
+
+    def _make_replica(self, config):
+        def creator():
+            return self.create_connector(config).connect(config)
+
+        pool = None
+        if config.get('pool'):
+            pool = ConnectionPool.from_config(creator, config['pool'])
+
+        name = config.get('database', '')
+        if config.get('host'):
+            name = '%s/%s' % (config['host'], name)
+
+        return Replica(name, creator, pool)
+
+    def get_pools(self):
+        """
+        Get the connection pools created by the factory.
+
+        :rtype: list
+        """
+        pools = [pool for _, pool in self._pools.values()]
+
+        for _, router in self._routers.values():
+            pools += [replica.pool for replica in router.get_replicas()
+                      if replica.pool is not None]
 
-        return self.create_connector(read_config).connect(read_config)
+        return pools
 
-    def _get_read_config(self, config):
-        read_config = self._get_read_write_config(config, 'read')
+    def _get_read_configs(self, config):
+        read_configs = config['read']
+        if not isinstance(read_configs, list):
+            read_configs = [read_configs]
 
-        return self._merge_read_write_config(config, read_config)
+        return [self._merge_read_write_config(config, read_config)
+                for read_config in read_configs]
 
     def _get_write_config(self, config):
         write_config = self._get_read_write_config(config, 'write')
@@ -70,7 +171,7 @@ class ConnectionFactory:
         return self._merge_read_write_config(config, write_config)
 
     def _get_read_write_config(self, config, type):
-        if config.get(type, []):
+        if isinstance(config[type], list) and config[type]:
             return random.choice(config[type])
 
         return config[type]
@@ -6,7 +6,9 @@ from ..exceptions.connectors import MissingPackage
 class Connector:
 
     RESERVED_KEYWORDS = [
-        'log_queries', 'driver', 'prefix', 'name'
+        'log_queries', 'driver', 'prefix', 'name', 'pool',
+        'read_router', 'sticky', 'server_side_cursors',
+        'prepared_statements'
     ]
 
     SUPPORTED_PACKAGES = []
@@ -46,6 +48,33 @@ class Connector:
     def get_params(self):
         return self._params
 
+    def ping(self):
+        """
+        Check that the underlying connection is still alive.
+
+        :rtype: bool
+        """
+        try:
+            cursor = self._connection.cursor()
+            cursor.execute('SELECT 1')
+            cursor.close()
+        except Exception:
+            return False
+
+        return True
+
+    def server_side_cursor(self, itersize=None):
+        """
+        Get a cursor fetching the rows from the server
+        as they are needed instead of all at once.
+
+        Drivers without server-side cursors return a regular cursor.
+
+        :param itersize: The number of rows fetched at once when iterating
+        :type itersize: int or None
+        """
+        return self._connection.cursor()
+
     def get_database(self):
         return self._params.get('database')
 
@@ -13,6 +13,7 @@ try:
     MySQLdb.converters.conversions[Date] = MySQLdb.converters.Thing2Literal
 
     from MySQLdb.cursors import DictCursor as cursor_class
+    from MySQLdb.cursors import SSDictCursor as ss_cursor_class
     keys_fix = {
         'password': 'passwd',
         'database': 'db'
@@ -28,10 +29,12 @@ except ImportError as e:
         pymysql.converters.conversions[Date] = pymysql.converters.escape_date
 
         from pymysql.cursors import DictCursor as cursor_class
+        from pymysql.cursors import SSDictCursor as ss_cursor_class
         keys_fix = {}
     except ImportError as e:
         mysql = None
         cursor_class = object
+        ss_cursor_class = object
 
 from ..dbal.platforms import MySQLPlatform, MySQL57Platform
 from .connector import Connector
@@ -51,7 +54,7 @@ class Record(dict):
         return serialize(self)
 
 
-class BaseDictCursor(cursor_class):
+class RecordCursorMixin:
 
     def _fetch_row(self, size=1):
         # Overridden for mysqclient
@@ -66,7 +69,7 @@ class BaseDictCursor(cursor_class):
         return Record(super()._conv_row(row))
 
 
-class DictCursor(BaseDictCursor):
+class QmarkCursorMixin:
 
     def execute(self, query, args=None):
         query = qmark(query)
@@ -79,12 +82,36 @@ class DictCursor(BaseDictCursor):
         return super().executemany(query, denullify(args))
 
 
+class BaseDictCursor(RecordCursorMixin, cursor_class):
+
+    pass
+
+
+class DictCursor(QmarkCursorMixin, BaseDictCursor):
+
+    pass
+
+
+class BaseSSDictCursor(RecordCursorMixin, ss_cursor_class):
+    """
+    Unbuffered cursor, streaming the rows from the server.
+    """
+
+    pass
+
+
+class SSDictCursor(QmarkCursorMixin, BaseSSDictCursor):
+
+    pass
+
+
 class MySQLConnector(Connector):
 
     RESERVED_KEYWORDS = [
         'log_queries', 'driver', 'prefix',
         'engine', 'collation',
-        'name', 'use_qmark'
+        'name', 'use_qmark', 'pool', 'read_router', 'sticky',
+        'server_side_cursors', 'prepared_statements'
     ]
 
     SUPPORTED_PACKAGES = ['PyMySQL', 'mysqlclient']
@@ -98,6 +125,8 @@ class MySQLConnector(Connector):
         config['autocommit'] = True
         config['cursorclass'] = self.get_cursor_class(config)
 
+        self._server_side_cursor_class = self.get_cursor_class(config, True)
+
         return self.get_api().connect(**self.get_config(config))
 
     def get_default_config(self):
@@ -106,12 +135,30 @@ class MySQLConnector(Connector):
             'use_unicode': True
         }
 
-    def get_cursor_class(self, config):
+    def get_cursor_class(self, config, server_side=False):
+        if server_side:
+            if config.get('use_qmark'):
+                return SSDictCursor
+
+            return BaseSSDictCursor
+
         if config.get('use_qmark'):
             return DictCursor
 
         return BaseDictCursor
 
+    def server_side_cursor(self, itersize=None):
+        """
+        Get an unbuffered cursor, streaming the rows from the server.
+
+        No other query can be run on the connection
+        until all the rows have been fetched or the cursor is closed.
+
+        :param itersize: Unused, rows are streamed one at a time
+        :type itersize: int or None
+        """
+        return self._connection.cursor(self._server_side_cursor_class)
+
     def get_api(self):
         return mysql
 
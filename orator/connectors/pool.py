@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+import threading
+from collections import deque
+from ..exceptions.connectors import PoolTimeout
+
+
+logger = logging.getLogger('orator.connectors.pool')
+
+
+class PoolEntry:
+
+    def __init__(self, connector):
+        """
+        :param connector: A connected connector
+        :type connector: orator.connectors.connector.Connector
+        """
+        self.connector = connector
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of dbapi connections.
+
+    Connections are created lazily up to ``max_size``, handed out
+    with ``checkout()`` and given back with ``checkin()``.
+    """
+
+    def __init__(self, creator, min_size=0, max_size=10, timeout=30,
+                 max_idle=None, max_lifetime=None, pre_ping=True):
+        """
+        :param creator: A callable returning a new connected connector
+        :type creator: callable
+
+        :param min_size: The number of connections to keep open
+        :type min_size: int
+
+        :param max_size: The maximum number of open connections
+        :type max_size: int
+
+        :param timeout: The number of seconds to wait for a connection
+        :type timeout: float
+
+        :param max_idle: The number of seconds an unused connection
+                         is kept open above min_size
+        :type max_idle: float or None
+
+        :param max_lifetime: The number of seconds after which
+                             a connection is recycled
+        :type max_lifetime: float or None
+
+        :param pre_ping: Whether to check connections on checkout
+        :type pre_ping: bool
+        """
+        if max_size < 1:
+            raise ValueError('The pool max_size must be at least 1')
+
+        self._creator = creator
+        self._min_size = min(min_size, max_size)
+        self._max_size = max_size
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._max_lifetime = max_lifetime
+        self._pre_ping = pre_ping
+
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+
+        self._condition = threading.Condition()
+
+        for _ in range(self._min_size):
+            self._idle.append(self._create())
+            self._size += 1
+
+    @classmethod
+    def from_config(cls, creator, config):
+        """
+        Create a pool from the "pool" section of a connection configuration.
+
+        :param creator: A callable returning a new connected connector
+        :type creator: callable
+
+        :param config: The pool configuration
+        :type config: dict or bool
+
+        :rtype: ConnectionPool
+        """
+        if not isinstance(config, dict):
+            config = {}
+
+        options = {}
+        for key in ['min_size', 'max_size', 'timeout',
+                    'max_idle', 'max_lifetime', 'pre_ping']:
+            if key in config:
+                options[key] = config[key]
+
+        return cls(creator, **options)
+
+    def checkout(self):
+        """
+        Get a connection from the pool, waiting for one if necessary.
+
+        :rtype: orator.connectors.connector.Connector
+
+        :raises: PoolTimeout
+        """
+        deadline = time.time() + self._timeout
+
+        while True:
+            entry = self._acquire(deadline)
+
+            if entry is None:
+                # A slot has been reserved for us,
+                # so we can open a new connection outside of the lock.
+                try:
+                    entry = self._create()
+                except Exception:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+
+                    raise
+            elif not self._is_usable(entry):
+                self._close(entry)
+
+                continue
+
+            entry.last_used = time.time()
+
+            with self._condition:
+                self._in_use[id(entry.connector)] = entry
+
+            return entry.connector
+
+    def checkin(self, connector, discard=False):
+        """
+        Give a connection back to the pool.
+
+        :param connector: The connector to give back
+        :type connector: orator.connectors.connector.Connector
+
+        :param discard: Whether to close the connection instead of reusing it
+        :type discard: bool
+        """
+        with self._condition:
+            entry = self._in_use.pop(id(connector), None)
+
+        if entry is None:
+            return
+
+        if discard or self._is_expired(entry):
+            self._close(entry)
+
+            return
+
+        entry.last_used = time.time()
+
+        with self._condition:
+            self._idle.append(entry)
+            self._condition.notify()
+
+        self._reap()
+
+    def dispose(self):
+        """
+        Close every idle connection of the pool.
+        """
+        with self._condition:
+            entries = list(self._idle)
+            self._idle.clear()
+
+        for entry in entries:
+            self._close(entry)
+
+    def _acquire(self, deadline):
+        """
+        Take an idle entry or reserve a slot for a new one.
+
+        :param deadline: The time after which we give up waiting
+        :type deadline: float
+
+        :return: An idle entry or None if a new connection must be opened
+        :rtype: PoolEntry or None
+        """
+        with self._condition:
+            while True:
+                if self._idle:
+                    # The most recently used connection is the most likely
+                    # to still be alive, and using it lets the others age
+                    # so that they can be reaped.
+                    return self._idle.pop()
+
+                if self._size < self._max_size:
+                    self._size += 1
+
+                    return
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise PoolTimeout(self._max_size, self._timeout)
+
+                self._condition.wait(remaining)
+
+    def _create(self):
+        logger.debug('Opening a new pooled connection')
+
+        return PoolEntry(self._creator())
+
+    def _close(self, entry):
+        logger.debug('Closing a pooled connection')
+
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+        try:
+            entry.connector.close()
+        except Exception:
+            pass
+
+    def _is_expired(self, entry):
+        if self._max_lifetime is None:
+            return False
+
+        return time.time() - entry.created_at > self._max_lifetime
+
+    def _is_usable(self, entry):
+        if self._is_expired(entry):
+            return False
+
+        if self._pre_ping:
+            return entry.connector.ping()
+
+        return True
+
+    def _reap(self):
+        """
+        Close the connections that have been idle for too long.
+        """
+        if self._max_idle is None:
+            return
+
+        now = time.time()
+        reaped = []
+
+        with self._condition:
+            # Idle connections are ordered from the least
+            # to the most recently used.
+            while (self._idle
+                   and self._size - len(reaped) > self._min_size
+                   and now - self._idle[0].last_used > self._max_idle):
+                reaped.append(self._idle.popleft())
+
+        for entry in reaped:
+            self._close(entry)
+
+    @property
+    def size(self):
+        """
+        The number of open connections.
+
+        :rtype: int
+        """
+        return self._size
+
+    @property
+    def idle(self):
+        """
+        The number of connections waiting in the pool.
+
+        :rtype: int
+        """
+        return len(self._idle)
+
+    @property
+    def checked_out(self):
+        """
+        The number of connections currently in use.
+
+        :rtype: int
+        """
+        return len(self._in_use)
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+import uuid
+
 try:
     import psycopg2
     import psycopg2.extras
@@ -23,11 +25,23 @@ from ..utils.helpers import serialize
 
 class BaseDictConnection(connection_class):
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # The statements prepared in this session
+        self.prepared_statements = None
+
     def cursor(self, *args, **kwargs):
         kwargs.setdefault('cursor_factory', BaseDictCursor)
 
         return super().cursor(*args, **kwargs)
 
+    def plain_cursor(self):
+        """
+        Get a cursor sending the queries as is.
+        """
+        return self.cursor(cursor_factory=extensions.cursor)
+
 
 class DictConnection(BaseDictConnection):
 
@@ -78,7 +92,9 @@ class PostgresConnector(Connector):
 
     RESERVED_KEYWORDS = [
         'log_queries', 'driver', 'prefix', 'name',
-        'register_unicode', 'use_qmark'
+        'register_unicode', 'use_qmark', 'pool',
+        'read_router', 'sticky', 'server_side_cursors',
+        'prepared_statements'
     ]
 
     SUPPORTED_PACKAGES = ['psycopg2']
@@ -106,6 +122,26 @@ class PostgresConnector(Connector):
     def get_api(self):
         return psycopg2
 
+    def server_side_cursor(self, itersize=None):
+        """
+        Get a named cursor, whose rows are kept on the server
+        until they are fetched.
+
+        :param itersize: The number of rows fetched at once when iterating
+        :type itersize: int or None
+        """
+        # Outside of a transaction, the cursor must be declared
+        # WITH HOLD to survive the implicit commit of its declaration.
+        cursor = self._connection.cursor(
+            'orator_%s' % uuid.uuid4().hex,
+            withhold=self._connection.autocommit
+        )
+
+        if itersize:
+            cursor.itersize = itersize
+
+        return cursor
+
     @property
     def autocommit(self):
         return self._connection.autocommit
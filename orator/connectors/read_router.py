@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import logging
+import threading
+from ..exceptions import ArgumentError
+
+
+logger = logging.getLogger('orator.connectors.read_router')
+
+
+class Replica:
+    """
+    A read replica and its statistics.
+    """
+
+    def __init__(self, name, creator, pool=None):
+        """
+        :param name: The replica name
+        :type name: str
+
+        :param creator: A callable returning a new connected connector
+        :type creator: callable
+
+        :param pool: The pool of the replica connections, if any
+        :type pool: orator.connectors.pool.ConnectionPool
+        """
+        self.name = name
+        self.pool = pool
+
+        self._creator = creator
+
+        self.queries = 0
+        self.failures = 0
+        self.outstanding = 0
+        self.latency = None
+        self.down_until = 0
+
+    def connect(self):
+        """
+        Get a connection to the replica.
+
+        :rtype: orator.connectors.connector.Connector
+        """
+        if self.pool is not None:
+            return self.pool.checkout()
+
+        return self._creator()
+
+    def give_back(self, connector, discard=False):
+        """
+        Give back a connection obtained with connect().
+
+        :param connector: The connector
+        :type connector: orator.connectors.connector.Connector
+
+        :param discard: Whether the connection must be closed
+        :type discard: bool
+        """
+        if self.pool is not None:
+            return self.pool.checkin(connector, discard)
+
+        if discard:
+            try:
+                connector.close()
+            except Exception:
+                pass
+
+    def is_up(self, now=None):
+        if now is None:
+            now = time.time()
+
+        return self.down_until <= now
+
+    def get_stats(self):
+        """
+        Get the counters of the replica.
+
+        :rtype: dict
+        """
+        return {
+            'name': self.name,
+            'queries': self.queries,
+            'failures': self.failures,
+            'outstanding': self.outstanding,
+            'latency': self.latency,
+            'up': self.is_up()
+        }
+
+
+class ReadRouter:
+    """
+    Spread the read queries over a set of replicas.
+
+    Replicas failing to connect or losing their connection are taken
+    out of the rotation for ``cooldown`` seconds.
+    """
+
+    POLICIES = ['round_robin', 'least_outstanding', 'latency_weighted']
+
+    # The weight of the last query in the latency moving average
+    LATENCY_SMOOTHING = 0.2
+
+    def __init__(self, replicas, policy='round_robin', cooldown=30):
+        """
+        :param replicas: The replicas to route to
+        :type replicas: list of Replica
+
+        :param policy: The routing policy
+        :type policy: str
+
+        :param cooldown: The number of seconds a failing replica
+                         stays out of the rotation
+        :type cooldown: float
+        """
+        if not replicas:
+            raise ArgumentError('A read router needs at least one replica')
+
+        if policy not in self.POLICIES:
+            raise ArgumentError('Invalid read routing policy [%s]' % policy)
+
+        self._replicas = list(replicas)
+        self._policy = policy
+        self._cooldown = cooldown
+
+        self._next = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, replicas, config):
+        """
+        Create a router from the "read_router" section of a configuration.
+
+        :param replicas: The replicas to route to
+        :type replicas: list of Replica
+
+        :param config: The router configuration
+        :type config: dict or None
+
+        :rtype: ReadRouter
+        """
+        if not isinstance(config, dict):
+            config = {}
+
+        options = {}
+        for key in ['policy', 'cooldown']:
+            if key in config:
+                options[key] = config[key]
+
+        return cls(replicas, **options)
+
+    def choose(self, exclude=None):
+        """
+        Choose the replica that should run the next read query.
+
+        :param exclude: Replicas that must not be chosen
+        :type exclude: list
+
+        :rtype: Replica or None
+        """
+        exclude = exclude or []
+        now = time.time()
+
+        with self._lock:
+            candidates = [r for r in self._replicas if r not in exclude]
+
+            if not candidates:
+                return
+
+            up = [r for r in candidates if r.is_up(now)]
+
+            # When every replica is down, we try the one
+            # that will be back in the rotation first.
+            if not up:
+                return min(candidates, key=lambda r: r.down_until)
+
+            return getattr(self, '_choose_%s' % self._policy)(up)
+
+    def _choose_round_robin(self, replicas):
+        replica = replicas[self._next % len(replicas)]
+
+        self._next += 1
+
+        return replica
+
+    def _choose_least_outstanding(self, replicas):
+        return min(replicas, key=lambda r: (r.outstanding, r.queries))
+
+    def _choose_latency_weighted(self, replicas):
+        # Replicas without latency yet are given the best known latency
+        # so that they get a chance to be measured.
+        known = [r.latency for r in replicas if r.latency is not None]
+        default = min(known) if known else 1.0
+
+        weights = []
+        for replica in replicas:
+            latency = replica.latency if replica.latency is not None \
+                else default
+
+            weights.append(1.0 / max(latency, 0.001))
+
+        threshold = random.random() * sum(weights)
+        for replica, weight in zip(replicas, weights):
+            threshold -= weight
+            if threshold <= 0:
+                return replica
+
+        return replicas[-1]
+
+    def begin(self, replica):
+        """
+        Record the start of a query on a replica.
+
+        :type replica: Replica
+        """
+        with self._lock:
+            replica.outstanding += 1
+
+    def end(self, replica, elapsed, failed=False):
+        """
+        Record the end of a query on a replica.
+
+        :type replica: Replica
+
+        :param elapsed: The query duration in milliseconds
+        :type elapsed: float
+
+        :param failed: Whether the replica failed to run the query
+        :type failed: bool
+        """
+        with self._lock:
+            replica.outstanding -= 1
+            replica.queries += 1
+
+            if replica.latency is None:
+                replica.latency = elapsed
+            else:
+                replica.latency += \
+                    (elapsed - replica.latency) * self.LATENCY_SMOOTHING
+
+        if failed:
+            self.mark_down(replica)
+
+    def mark_down(self, replica):
+        """
+        Take a replica out of the rotation.
+
+        :type replica: Replica
+        """
+        logger.warning('Read replica %s is unavailable for %ss'
+                       % (replica.name, self._cooldown))
+
+        with self._lock:
+            replica.failures += 1
+            replica.down_until = time.time() + self._cooldown
+
+    def get_replicas(self):
+        return self._replicas
+
+    def get_policy(self):
+        return self._policy
+
+    def get_stats(self):
+        """
+        Get the counters of every replica.
+
+        :rtype: list
+        """
+        return [replica.get_stats() for replica in self._replicas]
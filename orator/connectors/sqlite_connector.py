@@ -42,7 +42,8 @@ class SQLiteConnector(Connector):
 
     RESERVED_KEYWORDS = [
         'log_queries', 'driver', 'prefix', 'name',
-        'foreign_keys', 'use_qmark'
+        'foreign_keys', 'use_qmark', 'pool', 'read_router',
+        'sticky', 'server_side_cursors', 'prepared_statements'
     ]
 
     def _do_connect(self, config):
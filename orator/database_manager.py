@@ -94,6 +94,29 @@ class BaseDatabaseManager(ConnectionResolverInterface):
             self._connections[name].disconnect()
             del self._connections[name]
 
+    def release(self, name=None):
+        """
+        Give the pooled connections of the current thread back to their pool.
+
+        This is meant to be called when a unit of work, like a request,
+        ends. Connections without pool are left untouched.
+
+        :param name: The name of the connection, all connections if omitted
+        :type name: str
+
+        :rtype: None
+        """
+        if name is not None:
+            names = [name]
+        else:
+            names = list(self._connections.keys())
+
+        for name in names:
+            if name in self._connections:
+                logger.debug('Releasing %s' % name)
+
+                self._connections[name].release()
+
     def reconnect(self, name=None):
         if name is None:
             name = self.get_default_connection()
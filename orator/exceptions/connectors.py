@@ -28,3 +28,12 @@ class MissingPackage(ConnectorException):
                 '", "'.join(supported_packages))
 
         super().__init__(message)
+
+
+class PoolTimeout(ConnectorException):
+
+    def __init__(self, size, timeout):
+        message = ('No connection available in the pool '
+                   '(size: %d, timeout: %ss)' % (size, timeout))
+
+        super().__init__(message)
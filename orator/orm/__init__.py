@@ -4,6 +4,8 @@ from .builder import Builder # noqa
 from .model import Model # noqa
 from .mixins import SoftDeletes # noqa
 from .collection import Collection # noqa
+from .session import Session # noqa
+from .identity_map import IdentityMap # noqa
 from .factory import Factory # noqa
 from .utils import ( # noqa
     mutator, accessor, column, # noqa
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import simplejson as json
+
+
+def _cast_json(model, value):
+    if isinstance(value, str):
+        return json.loads(value)
+
+    return value
+
+
+_CASTS = {
+    'int': lambda model, value: int(value),
+    'integer': lambda model, value: int(value),
+    'real': lambda model, value: float(value),
+    'float': lambda model, value: float(value),
+    'double': lambda model, value: float(value),
+    'string': lambda model, value: str(value),
+    'str': lambda model, value: str(value),
+    'bool': lambda model, value: bool(value),
+    'boolean': lambda model, value: bool(value),
+    'dict': _cast_json,
+    'list': _cast_json,
+    'json': _cast_json,
+}
+
+_JSON_CASTS = ['list', 'dict', 'json', 'object']
+
+
+def cast_date(model, value):
+    return model.as_datetime(value)
+
+
+# The conversions worth remembering for each instance,
+# only the ones giving immutable values since they are shared by every read
+_MEMOIZED = [cast_date]
+
+
+def compile_cast(cast):
+    """
+    Resolve the function converting the values of a cast type.
+
+    :param cast: The cast type
+    :type cast: str
+
+    :return: The conversion function, taking the model and the value,
+             and whether its results should be remembered
+    :rtype: tuple
+    """
+    func = _CASTS.get(cast.lower().strip())
+
+    return func, func in _MEMOIZED
+
+
+class AttributeDescriptor:
+    """
+    Give access to a column of a model class,
+    with its cast resolved once for all.
+    """
+
+    def __init__(self, owner, name, cast=None, date=False):
+        """
+        :param owner: The model class
+        :type owner: type
+
+        :param name: The column name
+        :type name: str
+
+        :param cast: The cast type of the column
+        :type cast: str or None
+
+        :param date: Whether the column holds dates
+        :type date: bool
+        """
+        self.owner = owner
+        self.name = name
+
+        self.date = date
+        self.json = False
+        self.getter = cast_date if date else None
+
+        if cast is not None:
+            self.getter = compile_cast(cast)[0]
+            self.json = cast.lower().strip() in _JSON_CASTS
+
+        self.memoize = self.getter in _MEMOIZED
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            # Let the model class forward the attribute to a query
+            raise AttributeError(self.name)
+
+        if type(instance) is not self.owner:
+            return self._get_inherited(instance)
+
+        try:
+            value = instance._attributes[self.name]
+        except KeyError:
+            return self._get_missing(instance)
+
+        if value is None or self.getter is None:
+            return value
+
+        if self.memoize:
+            return instance._get_cached_cast(self.name, value, self.getter)
+
+        return self.getter(instance, value)
+
+    def __set__(self, instance, value):
+        if type(instance) is not self.owner:
+            return instance.set_attribute(self.name, value)
+
+        if self.date and value:
+            value = instance.from_datetime(value)
+
+        if self.json:
+            value = json.dumps(value)
+
+        instance._track_change(self.name)
+
+        instance._attributes[self.name] = value
+
+    def __delete__(self, instance):
+        instance._track_change(self.name)
+
+        try:
+            del instance._attributes[self.name]
+        except KeyError:
+            raise AttributeError(self.name)
+
+    def _get_inherited(self, instance):
+        # The descriptor belongs to a parent class,
+        # the subclass resolves its attributes itself.
+        if self.name in instance._attributes:
+            return instance.get_attribute(self.name)
+
+        return self._get_missing(instance)
+
+    def _get_missing(self, instance):
+        if self.name in instance._relations:
+            return instance._relations[self.name]
+
+        raise AttributeError(self.name)
@@ -1,22 +1,51 @@
 # -*- coding: utf-8 -*-
 
 import copy
-from collections import OrderedDict
+import threading
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from collections import OrderedDict, namedtuple
 from ..exceptions.orm import ModelNotFound
 from ..utils import Null
 from ..query.expression import QueryExpression
-from ..pagination import Paginator, LengthAwarePaginator
+from ..pagination import (
+    Paginator, LengthAwarePaginator, CursorPaginator, Cursor
+)
 from ..support import Collection
 from .scopes import Scope
+from .identity_map import IdentityMap
+
+
+@lru_cache(maxsize=128)
+def _get_record_class(fields):
+    return namedtuple('Record', fields, rename=True)
 
 
 class Builder:
 
     _passthru = [
-        'to_sql', 'lists', 'insert', 'insert_get_id', 'pluck', 'count',
-        'min', 'max', 'avg', 'sum', 'exists', 'get_bindings', 'raw'
+        'to_sql', 'lists', 'insert', 'insert_many', 'insert_get_id',
+        'insert_many_get_ids',
+        'pluck', 'count', 'min', 'max', 'avg', 'sum', 'exists',
+        'get_bindings', 'raw', 'copy_from', 'copy_to'
     ]
 
+    # The thread pools eagerly loading the relationships in parallel,
+    # by number of workers, shared by all the queries
+    _eager_executors = {}
+    _eager_executors_lock = threading.Lock()
+    _eager_thread = threading.local()
+
+    # The "has" conditions that can be checked with an EXISTS subquery,
+    # mapped to whether the subquery must be negated.
+    _has_exists_operators = {
+        ('>=', '1'): False,
+        ('>', '0'): False,
+        ('<', '1'): True,
+        ('=', '0'): True,
+    }
+
     def __init__(self, query):
         """
         Constructor
@@ -28,6 +57,7 @@ class Builder:
 
         self._model = None
         self._eager_load = {}
+        self._eager_workers = None
         self._macros = {}
         self._scopes = OrderedDict()
 
@@ -83,6 +113,14 @@ class Builder:
 
         return self
 
+    def has_global_scopes(self):
+        """
+        Determine if global scopes will be applied to the query.
+
+        :rtype: bool
+        """
+        return len(self._scopes) > 0
+
     def find(self, id, columns=None):
         """
         Find a model by its primary key
@@ -102,6 +140,13 @@ class Builder:
         if isinstance(id, list):
             return self.find_many(id, columns)
 
+        identity_map = self._get_identity_map(columns)
+        if identity_map is not None:
+            model = identity_map.get(self._model, id)
+
+            if model is not None:
+                return self.eager_load_relations([model])[0]
+
         self._query.where(self._model.get_qualified_key_name(), '=', id)
 
         return self.first(columns)
@@ -147,6 +192,16 @@ class Builder:
         if not id:
             return self._model.new_collection()
 
+        identity_map = self._get_identity_map(columns)
+        if identity_map is not None:
+            models = identity_map.get_many(self._model, id)
+
+            if models is not None:
+                unique = OrderedDict((m.get_key(), m) for m in models)
+
+                return self._model.new_collection(
+                    self.eager_load_relations(list(unique.values())))
+
         self._query.where_in(self._model.get_qualified_key_name(), id)
 
         return self.get(columns)
@@ -281,7 +336,7 @@ class Builder:
         :rtype: list
         """
         connection = self._model.get_connection_name()
-        for results in self.apply_scopes().get_query().chunk(count):
+        for results in self._chunk_results(count):
             models = self._model.hydrate(results, connection)
 
             # If we actually found models we will also eager load any
@@ -296,6 +351,197 @@ class Builder:
 
             yield collection
 
+    def chunk_by_id(self, count, column=None, alias=None):
+        """
+        Chunk the results of the query by comparing IDs.
+
+        :param count: The chunk size
+        :type count: int
+
+        :param column: The ID column, defaults to the model key
+        :type column: str
+
+        :param alias: The ID attribute, if different from the column
+        :type alias: str
+
+        :return: The current chunk
+        :rtype: Collection
+        """
+        if column is None:
+            column = self._model.get_qualified_key_name()
+
+            if alias is None:
+                alias = self._model.get_key_name()
+
+        connection = self._model.get_connection_name()
+        for results in self.apply_scopes().get_query().chunk_by_id(
+                count, column, alias):
+            models = self._model.hydrate(results, connection)
+
+            if len(models) > 0:
+                models = self.eager_load_relations(models)
+
+            yield self._model.new_collection(models)
+
+    def lazy(self, chunk_size=1000):
+        """
+        Execute the query and yield the models one at a time.
+
+        The rows are fetched by chunks and hydrated as they are consumed,
+        so that only one chunk is held in memory.
+        The eager loaded relationships are loaded for each chunk.
+
+        :param chunk_size: The number of rows fetched at once
+        :type chunk_size: int
+
+        :rtype: generator
+        """
+        connection = self._model.get_connection_name()
+        instance = self._model.new_instance().set_connection(connection)
+
+        for results in self._chunk_results(chunk_size):
+            if not self._eager_load:
+                if results:
+                    instance._generate_attribute_descriptors(
+                        list(results[0].keys()))
+
+                for result in results:
+                    yield instance.new_from_builder(result)
+
+                continue
+
+            models = self._model.hydrate(results, connection)
+
+            for model in self.eager_load_relations(models):
+                yield model
+
+    def cursor(self):
+        """
+        Execute the query and yield the models one at a time.
+
+        :rtype: generator
+        """
+        return self.lazy()
+
+    def _chunk_results(self, count):
+        """
+        Get the rows of the query by chunks.
+
+        :param count: The chunk size
+        :type count: int
+
+        :rtype: generator
+        """
+        query = self.apply_scopes().get_query()
+
+        # Some server-side cursors keep their connection busy until they
+        # are exhausted, so the eager loading queries run between the chunks
+        # need the rows to be fetched by the client.
+        if (self._eager_load
+                and query.get_connection().streaming_blocks_connection()):
+            return query.chunk(count, server_side=False)
+
+        return query.chunk(count)
+
+    def get_rows(self, columns=None, tuples=False):
+        """
+        Execute the query and get the records without hydrating models.
+
+        The global scopes and the casts of the model are applied.
+
+        :param columns: The columns to get
+        :type columns: list
+
+        :param tuples: Whether to get named tuples rather than dictionaries
+        :type tuples: bool
+
+        :rtype: list
+        """
+        rows = self.apply_scopes().get_query().get(columns).all()
+
+        return self._to_records(rows, tuples)
+
+    def as_dicts(self, columns=None):
+        """
+        Execute the query and get the records as dictionaries.
+
+        :param columns: The columns to get
+        :type columns: list
+
+        :rtype: list
+        """
+        return self.get_rows(columns)
+
+    def as_tuples(self, columns=None):
+        """
+        Execute the query and get the records as named tuples.
+
+        :param columns: The columns to get
+        :type columns: list
+
+        :rtype: list
+        """
+        return self.get_rows(columns, True)
+
+    def iter_rows(self, chunk_size=1000, columns=None, tuples=False):
+        """
+        Execute the query and yield the records one at a time,
+        fetching them by chunks, without hydrating models.
+
+        :param chunk_size: The number of records fetched at once
+        :type chunk_size: int
+
+        :param columns: The columns to get
+        :type columns: list
+
+        :param tuples: Whether to get named tuples rather than dictionaries
+        :type tuples: bool
+
+        :rtype: generator
+        """
+        query = self.apply_scopes().get_query()
+
+        if columns and not query.columns:
+            query.columns = list(columns)
+
+        for rows in query.chunk(chunk_size):
+            for record in self._to_records(rows, tuples):
+                yield record
+
+    def _to_records(self, rows, tuples=False):
+        """
+        Convert rows to plain records, applying the casts of the model.
+
+        :param rows: The rows returned by the connection
+        :type rows: list
+
+        :param tuples: Whether to create named tuples rather than dictionaries
+        :type tuples: bool
+
+        :rtype: list
+        """
+        model = self._model
+        casts = [(key, cast)
+                 for key, (cast, _) in model._get_cast_plan().items()
+                 if cast is not None]
+
+        records = []
+        for row in rows:
+            record = dict(row)
+
+            for key, cast in casts:
+                value = record.get(key)
+
+                if value is not None:
+                    record[key] = cast(model, value)
+
+            if tuples:
+                record = _get_record_class(tuple(record))(*record.values())
+
+            records.append(record)
+
+        return records
+
     def lists(self, column, key=None):
         """
         Get a list with the values of a given column
@@ -377,6 +623,36 @@ class Builder:
 
         return Paginator(self.get(columns).all(), per_page, page)
 
+    def cursor_paginate(self, per_page=None, cursor=None, columns=None):
+        """
+        Paginate the given query using a cursor.
+
+        :param per_page: The number of records per page
+        :type per_page: int
+
+        :param cursor: The cursor of the page, encoded or not
+        :type cursor: str or Cursor or None
+
+        :param columns: The columns to return
+        :type columns: list
+
+        :return: The paginator
+        :rtype: CursorPaginator
+        """
+        if columns is None:
+            columns = ['*']
+
+        cursor = Cursor.decode(cursor)
+        per_page = per_page or self._model.get_per_page()
+
+        if not self._query.orders:
+            self._query.order_by(self._model.get_qualified_key_name())
+
+        self._query.for_cursor_page(cursor, per_page)
+
+        return CursorPaginator(self.get(columns).all(), per_page, cursor,
+                               self._query.get_cursor_parameters())
+
     def update(self, _values=None, **values):
         """
         Update a record in the database
@@ -392,6 +668,98 @@ class Builder:
 
         return self._query.update(self._add_updated_at_column(values))
 
+    def update_many(self, values, key=None, batch_size=None):
+        """
+        Update several records with different values.
+
+        :param values: The values of each record, including its key
+        :type values: list of dict
+
+        :param key: The column identifying the records,
+                    defaults to the model primary key
+        :type key: str or None
+
+        :param batch_size: The number of records per statement
+        :type batch_size: int or None
+
+        :return: The number of records affected
+        :rtype: int
+        """
+        if key is None:
+            key = self._model.get_key_name()
+
+        if self._model.uses_timestamps():
+            column = self._model.get_updated_at_column()
+            timestamp = self._model.fresh_timestamp_string()
+
+            values = [dict(row) for row in values]
+            for row in values:
+                row.setdefault(column, timestamp)
+
+        return self._query.update_many(values, key, batch_size)
+
+    def upsert(self, values, unique_by, update=None, batch_size=None):
+        """
+        Insert records, or update them if they already exist.
+
+        The timestamps of the records are set, and only
+        the "updated at" one is changed for existing records.
+
+        :param values: The records to insert
+        :type values: dict or list or iterable of dict
+
+        :param unique_by: The columns identifying existing records
+        :type unique_by: str or list
+
+        :param update: The columns or values to update
+        :type update: list or dict or None
+
+        :param batch_size: The number of rows per statement
+        :type batch_size: int or None
+
+        :return: The number of records affected
+        :rtype: int
+        """
+        if isinstance(values, dict):
+            values = [values]
+
+        if not self._model.uses_timestamps():
+            return self._query.upsert(values, unique_by, update, batch_size)
+
+        timestamp = self._model.fresh_timestamp_string()
+        created_at = self._model.get_created_at_column()
+        updated_at = self._model.get_updated_at_column()
+
+        def add_timestamps(row):
+            row = dict(row)
+            row.setdefault(created_at, timestamp)
+            row.setdefault(updated_at, timestamp)
+
+            return row
+
+        rows = iter(values)
+
+        first = next(rows, None)
+        if first is None:
+            return 0
+
+        first = add_timestamps(first)
+
+        if update is None:
+            unique = unique_by if isinstance(unique_by, (list, tuple)) \
+                else [unique_by]
+
+            update = [c for c in sorted(first.keys())
+                      if c not in unique and c != created_at]
+        elif isinstance(update, dict):
+            update = self._add_updated_at_column(dict(update))
+        elif update and updated_at not in update:
+            update = list(update) + [updated_at]
+
+        rows = chain([first], map(add_timestamps, rows))
+
+        return self._query.upsert(rows, unique_by, update, batch_size)
+
     def increment(self, column, amount=1, extras=None):
         """
         Increment a column's value by a given amount
@@ -492,14 +860,60 @@ class Builder:
         :return: A list of models
         :rtype: orator.orm.collection.Collection
         """
-        results = self.apply_scopes().get_query().get(columns).all()
+        query = self.apply_scopes().get_query()
+        results = query.get(columns).all()
 
         connection = self._model.get_connection_name()
 
+        # Rows with other columns than the ones of the model,
+        # like subselects or joined columns, get their own instances
+        identity_map = IdentityMap.current()
+        if identity_map is not None \
+                and self._selects_whole_records(query, columns):
+            return identity_map.hydrate(self._model, results, connection)
+
         models = self._model.hydrate(results, connection)
 
         return models
 
+    def _selects_whole_records(self, query, columns=None):
+        """
+        Determine if the query retrieves every column of the model table only.
+
+        :param columns: The columns given to get()
+        :type columns: list
+
+        :rtype: bool
+        """
+        if query.joins or query.unions or query.distinct_:
+            return False
+
+        table = self._model.get_table()
+        columns = query.columns or columns or ['*']
+
+        return all(c in ('*', '%s.*' % table) for c in columns)
+
+    def _get_identity_map(self, columns):
+        """
+        Get the current identity map if the query is a plain
+        primary key lookup that it can answer.
+
+        :rtype: IdentityMap or None
+        """
+        identity_map = IdentityMap.current()
+        if identity_map is None or self.has_global_scopes():
+            return
+
+        query = self._query
+        if query.wheres or query.joins or query.unions \
+                or query.lock_ is not None or query.distinct_:
+            return
+
+        if list(columns) != ['*'] or query.columns:
+            return
+
+        return identity_map
+
     def eager_load_relations(self, models):
         """
         Eager load the relationship of the models.
@@ -510,20 +924,182 @@ class Builder:
         :return: The models
         :rtype: list
         """
+        if self._loads_in_parallel():
+            return self._load_relations_in_parallel(models)
+
         for name, constraints in self._eager_load.items():
             if name.find('.') == -1:
                 models = self._load_relation(models, name, constraints)
 
         return models
 
+    def load_in_parallel(self, workers=4):
+        """
+        Eager load the relationships concurrently on a pool of threads.
+
+        Each thread queries the database with its own connection,
+        so the relationships are only loaded in parallel
+        when a connection pool is configured.
+
+        :param workers: The maximum number of threads, None or 0 to disable
+        :type workers: int or None
+
+        :rtype: Builder
+        """
+        self._eager_workers = workers
+
+        return self
+
+    def _loads_in_parallel(self):
+        """
+        Determine if the relationships can be eager loaded concurrently.
+
+        Other connections cannot see the changes made by the current one
+        during a transaction, or before they reached the read replicas,
+        nor the SQLite in-memory databases of other connections.
+        Without a pool, the connections of the threads
+        would not be closed once done.
+
+        :rtype: bool
+        """
+        if not self._eager_workers or IdentityMap.current() is not None:
+            return False
+
+        # The threads of the pool do not wait for each other
+        if getattr(self._eager_thread, 'loading', False):
+            return False
+
+        connection = self._query.get_connection()
+        if connection.get_pool() is None:
+            return False
+
+        if connection.pretending() or connection.reads_own_writes():
+            return False
+
+        return connection.shares_database_across_connections()
+
+    @classmethod
+    def _get_eager_executor(cls, workers):
+        """
+        Get the thread pool eagerly loading the relationships
+        with the given number of workers.
+
+        :type workers: int
+
+        :rtype: ThreadPoolExecutor
+        """
+        with cls._eager_executors_lock:
+            if workers not in cls._eager_executors:
+                cls._eager_executors[workers] = ThreadPoolExecutor(
+                    max_workers=workers)
+
+            return cls._eager_executors[workers]
+
+    def _load_relations_in_parallel(self, models):
+        """
+        Eagerly load the relationships on a set of models,
+        running the queries on a pool of threads.
+
+        The results are matched to the models by the current thread.
+
+        :rtype: list
+        """
+        loads = []
+
+        executor = self._get_eager_executor(self._eager_workers)
+
+        for name, constraints in self._eager_load.items():
+            if name.find('.') != -1:
+                continue
+
+            missing, loaded = self._partition_loaded(
+                models, name, constraints)
+
+            if loaded:
+                self._load_nested_relations(loaded, name)
+
+            if not missing:
+                continue
+
+            relation = self.get_relation(name)
+
+            missing = relation.init_relation(missing, name)
+
+            futures = [executor.submit(self._get_eager_results_in_thread,
+                                       name, batch, constraints)
+                       for batch in self._get_eager_batches(missing)]
+
+            loads.append((name, relation, missing, futures))
+
+        for name, relation, missing, futures in loads:
+            results = futures[0].result()
+
+            for future in futures[1:]:
+                results.merge(future.result())
+
+            relation.match(missing, results, name)
+
+        return models
+
+    def _get_eager_results_in_thread(self, name, models, constraints):
+        """
+        Get the eagerly loaded results of a relation from a pool thread,
+        giving its connections back once done.
+
+        :rtype: Collection
+        """
+        self._eager_thread.loading = True
+
+        try:
+            return self._get_eager_results(
+                self.get_relation(name), models, constraints)
+        finally:
+            self._eager_thread.loading = False
+
+            self._model.get_connection_resolver().release()
+
     def _load_relation(self, models, name, constraints):
         """
         Eagerly load the relationship on a set of models.
 
+        The parents are split into batches, loaded by one query each,
+        whose results are matched together.
+
+        The relation is only queried for the models
+        on which it has not been loaded yet.
+
         :rtype: list
         """
+        missing, loaded = self._partition_loaded(models, name, constraints)
+
+        if loaded:
+            self._load_nested_relations(loaded, name)
+
+            if missing:
+                self._load_relation(missing, name, constraints)
+
+            return models
+
         relation = self.get_relation(name)
 
+        batches = self._get_eager_batches(models)
+
+        models = relation.init_relation(models, name)
+
+        results = self._get_eager_results(relation, batches[0], constraints)
+
+        for batch in batches[1:]:
+            results.merge(self._get_eager_results(
+                self.get_relation(name), batch, constraints))
+
+        return relation.match(models, results, name)
+
+    def _get_eager_results(self, relation, models, constraints):
+        """
+        Get the eagerly loaded results of a relation for a set of models.
+
+        :rtype: Collection
+        """
         relation.add_eager_constraints(models)
 
         if callable(constraints):
@@ -531,11 +1107,104 @@ class Builder:
         else:
             relation.merge_query(constraints)
 
-        models = relation.init_relation(models, name)
+        return relation.get_eager()
+
+    def _partition_loaded(self, models, name, constraints):
+        """
+        Split the models between those on which the relation must be loaded
+        and those on which it is already loaded.
 
-        results = relation.get_eager()
+        Relations loaded with constraints are always queried.
 
-        return relation.match(models, results, name)
+        :rtype: tuple
+        """
+        if callable(constraints) or not isinstance(constraints, Builder) \
+                or constraints.get_query().wheres:
+            return models, []
+
+        loaded = [model for model in models if model.relation_loaded(name)]
+        if not loaded:
+            return models, []
+
+        missing = [model for model in models
+                   if not model.relation_loaded(name)]
+
+        return missing, loaded
+
+    def _load_nested_relations(self, models, name):
+        """
+        Eager load the nested relationships of a relation
+        already loaded on a set of models.
+
+        :type models: list
+        :type name: str
+        """
+        nested = self._nested_relations(name)
+        if not nested:
+            return
+
+        related = OrderedDict()
+
+        for model in models:
+            for item in self._get_loaded_models(model.get_relation(name)):
+                related.setdefault(item.__class__, []).append(item)
+
+        for items in related.values():
+            items[0].new_query().with_(nested).eager_load_relations(items)
+
+    def _get_loaded_models(self, value):
+        """
+        Get the models of a loaded relation.
+
+        :rtype: list
+        """
+        from .relations.result import Result
+        from .relations.wrapper import Wrapper
+
+        if issubclass(type(value), (Result, Wrapper)):
+            value = value.__wrapped__
+
+        if value is None:
+            return []
+
+        if isinstance(value, Collection):
+            return value.all()
+
+        return [value]
+
+    def _get_eager_batches(self, models):
+        """
+        Split the models whose relations are eagerly loaded
+        so that the keys of each batch can be bound to a single query.
+
+        :type models: list
+
+        :rtype: list
+        """
+        if self._model is None:
+            return [models]
+
+        size = self._model.__eager_batch_size__
+
+        if size is None:
+            grammar = self._query.get_grammar()
+
+            # The keys bound as a single array do not count
+            # towards the parameters limit
+            if self._model.__eager_where_any__ \
+                    and grammar.supports_array_bindings():
+                return [models]
+
+            # Leave some room for the bindings of the relation constraints
+            size = grammar.get_max_parameters() // 2
+
+        if isinstance(models, Collection):
+            models = models.all()
+
+        if len(models) <= size:
+            return [models]
+
+        return [models[i:i + size] for i in range(0, len(models), size)]
 
     def get_relation(self, relation):
         """
@@ -870,6 +1539,16 @@ class Builder:
         if isinstance(count, str) and count.isdigit():
             count = QueryExpression(count)
 
+        # Checking for at least one (or no) related model does not need
+        # to count them all, an EXISTS subquery can stop at the first match.
+        negate = self._has_exists_operators.get((operator, str(count)))
+        if negate is not None:
+            has_query.get_query().columns = [QueryExpression('1')]
+
+            return self.where_exists(has_query, boolean, negate)
+
+        self._query.add_binding(has_query.get_query().get_bindings(), 'where')
+
         return self.where(
             QueryExpression('(%s)' % has_query.to_sql()),
             operator, count, boolean)
@@ -891,7 +1570,156 @@ class Builder:
             relation_query.wheres, relation_query.get_bindings()
         )
 
-        self._query.add_binding(has_query.get_query().get_bindings(), 'where')
+    def with_count(self, *relations):
+        """
+        Add subselects counting the related models of each model.
+
+        The counts are set on the models as "<relation>_count" attributes,
+        a relation can be given as "<relation> as <attribute>"
+        and with a callable constraining the counted models:
+
+            Post.with_count('comments',
+                            {'comments as approved': lambda q: ...})
+
+        :param relations: The relations to count
+        :type relations: tuple
+
+        :rtype: Builder
+        """
+        return self.with_aggregate(relations, 'count')
+
+    def with_sum(self, relation, column):
+        """
+        Add a subselect summing a column of the related models of each model,
+        set on the models as a "<relation>_sum_<column>" attribute.
+
+        :param relation: The relation name, a list of names,
+                         or a dict of names and constraints
+        :type relation: str or list or dict
+
+        :param column: The column to sum
+        :type column: str
+
+        :rtype: Builder
+        """
+        return self.with_aggregate([relation], 'sum', column)
+
+    def with_max(self, relation, column):
+        """
+        Add a subselect getting the maximum of a column of the related
+        models of each model, set on the models
+        as a "<relation>_max_<column>" attribute.
+
+        :param relation: The relation name, a list of names,
+                         or a dict of names and constraints
+        :type relation: str or list or dict
+
+        :param column: The column
+        :type column: str
+
+        :rtype: Builder
+        """
+        return self.with_aggregate([relation], 'max', column)
+
+    def with_exists(self, *relations):
+        """
+        Add subselects checking if each model has related models,
+        set on the models as "<relation>_exists" attributes worth 1 or 0.
+
+        :param relations: The relations to check
+        :type relations: tuple
+
+        :rtype: Builder
+        """
+        return self.with_aggregate(relations, 'exists')
+
+    def with_aggregate(self, relations, function, column=None):
+        """
+        Add subselects aggregating the related models of each model.
+
+        :param relations: The relation names or dicts of names and constraints
+        :type relations: list
+
+        :param function: The aggregate function:
+                         count, sum, min, max, avg or exists
+        :type function: str
+
+        :param column: The aggregated column
+        :type column: str or None
+
+        :rtype: Builder
+        """
+        if not self._query.columns:
+            self._query.select('%s.*' % self._model.get_table())
+
+        for name, constraints in self._parse_aggregate_relations(relations):
+            alias = None
+            if ' as ' in name.lower():
+                segments = name.split()
+                name, alias = segments[0], segments[-1]
+
+            relation = self._get_has_relation_query(name)
+
+            query = relation.get_relation_count_query(
+                relation.get_related().new_query(), self)
+
+            if callable(constraints):
+                constraints(query)
+
+            query = query.apply_scopes()
+
+            relation_query = relation.get_base_query()
+
+            query.merge_wheres(
+                relation_query.wheres, relation_query.get_bindings())
+
+            if function == 'exists':
+                sql = 'CASE WHEN EXISTS(%s) THEN 1 ELSE 0 END'
+
+                query.get_query().columns = [QueryExpression('1')]
+            else:
+                sql = '(%s)'
+
+                if function != 'count':
+                    qualified = column
+                    if '.' not in qualified:
+                        qualified = '%s.%s' % (
+                            relation.get_related().get_table(), column)
+
+                    query.get_query().columns = [QueryExpression('%s(%s)' % (
+                        function.upper(),
+                        self._query.get_grammar().wrap(qualified)))]
+
+            if alias is None:
+                alias = '_'.join([name, function]
+                                 + ([column.split('.')[-1]] if column else []))
+
+            self._query.select_raw(
+                '%s AS %s' % (sql % query.to_sql(),
+                              self._query.get_grammar().wrap(alias)),
+                query.get_bindings())
+
+        return self
+
+    def _parse_aggregate_relations(self, relations):
+        """
+        Get the names and constraints of the aggregated relations.
+
+        :type relations: list
+
+        :rtype: list
+        """
+        parsed = []
+
+        for relation in relations:
+            if isinstance(relation, dict):
+                parsed += list(relation.items())
+            elif isinstance(relation, (list, tuple)):
+                parsed += self._parse_aggregate_relations(relation)
+            else:
+                parsed.append((relation, None))
+
+        return parsed
 
     def _get_has_relation_query(self, relation):
         """
@@ -935,15 +1763,15 @@ class Builder:
 
         for relation in relations:
             if isinstance(relation, dict):
-                name = list(relation.keys())[0]
-                constraints = relation[name]
+                items = relation.items()
             else:
-                name = relation
-                constraints = self.__class__(self.get_query().new_query())
+                query = self.__class__(self.get_query().new_query())
+                items = [(relation, query)]
 
-            results = self._parse_nested_with(name, results)
+            for name, constraints in items:
+                results = self._parse_nested_with(name, results)
 
-            results[name] = constraints
+                results[name] = constraints
 
         return results
 
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from collections import OrderedDict
 from ..support.collection import Collection as BaseCollection
 
 
@@ -31,3 +32,178 @@ class Collection(BaseCollection):
         :rtype: list
         """
         return list(map(lambda m: m.get_key(), self.items))
+
+    def serialize(self):
+        """
+        Get the collection of items as a serialized object.
+
+        The models of a class are converted with the serializer
+        compiled once for their class.
+
+        :rtype: list
+        """
+        from .model import Model
+
+        serializers = {}
+        serialized = []
+
+        for item in self.items:
+            cls = item.__class__
+
+            if cls not in serializers:
+                serializers[cls] = None
+
+                if isinstance(item, Model) \
+                        and cls.serialize is Model.serialize:
+                    serializers[cls] = item._get_serializer()
+
+            serializer = serializers[cls]
+
+            if serializer is not None and serializer.accepts(item):
+                serialized.append(serializer.serialize(item))
+            elif hasattr(item, 'serialize'):
+                serialized.append(item.serialize())
+            elif hasattr(item, 'to_dict'):
+                serialized.append(item.to_dict())
+            else:
+                serialized.append(item)
+
+        return serialized
+
+    def save(self, options=None, batch_size=None):
+        """
+        Save the models of the collection.
+
+        The inserts and updates are grouped per model class
+        and sent with insert_many() and update_many()
+        instead of one query per model, the keys generated by the database
+        being read back. The models whose key changed are saved one by one.
+
+        :param options: The save options
+        :type options: dict
+
+        :param batch_size: The number of models per statement
+        :type batch_size: int or None
+
+        :return: Whether every model has been saved
+        :rtype: bool
+        """
+        if options is None:
+            options = {}
+
+        saved = True
+        inserts = OrderedDict()
+        updates = OrderedDict()
+
+        for model in self.items:
+            if model.exists:
+                batchable = self._can_be_updated_in_batch(model)
+            else:
+                batchable = self._can_be_inserted_in_batch(model)
+
+            if not batchable:
+                saved = model.save(options) is not False and saved
+
+                continue
+
+            if not model._prepare_save(options):
+                saved = False
+
+                continue
+
+            if model.exists:
+                values = model._prepare_update(options)
+                groups = updates
+            else:
+                values = model._prepare_insert(options)
+                groups = inserts
+
+            if values is False:
+                saved = False
+
+                continue
+
+            group = (model.__class__, model.get_connection_name())
+            groups.setdefault(group, []).append((model, values))
+
+        for models in inserts.values():
+            self._insert_models(models, batch_size)
+
+            for model, _ in models:
+                model.set_exists(True)
+                model._fire_model_event('created')
+                model._finish_save(options)
+
+        for models in updates.values():
+            self._update_models(models, batch_size)
+
+            for model, dirty in models:
+                if dirty:
+                    model._fire_model_event('updated')
+
+                model._finish_save(options)
+
+        return saved
+
+    def _insert_models(self, models, batch_size):
+        key_name = models[0][0].get_key_name()
+
+        # Rows inserted together must have the same columns
+        # and either all or none of them get their key from the database
+        groups = OrderedDict()
+        for model, attributes in models:
+            generated = model._has_generated_key()
+            if generated:
+                attributes = OrderedDict(
+                    (k, v) for k, v in attributes.items() if k != key_name)
+
+            group = (generated, tuple(sorted(attributes)))
+            groups.setdefault(group, []).append((model, attributes))
+
+        query = models[0][0].new_query()
+        for (generated, _), batch in groups.items():
+            rows = [attributes for _, attributes in batch]
+
+            if not generated:
+                query.insert_many(rows, batch_size)
+
+                continue
+
+            ids = query.insert_many_get_ids(rows, key_name, batch_size)
+
+            for (model, _), id in zip(batch, ids):
+                model.set_attribute(key_name, id)
+
+    def _update_models(self, models, batch_size):
+        key_name = models[0][0].get_key_name()
+
+        rows = []
+        for model, dirty in models:
+            if dirty:
+                row = dict(dirty)
+                row[key_name] = model._get_key_for_save_query()
+
+                rows.append(row)
+
+        if rows:
+            models[0][0].new_query().update_many(rows, key_name, batch_size)
+
+    def _can_be_inserted_in_batch(self, model):
+        from .model import Model
+
+        cls = model.__class__
+
+        # Models customizing how they are inserted are saved on their own
+        return (cls._perform_insert is Model._perform_insert
+                and cls._insert_and_set_id is Model._insert_and_set_id)
+
+    def _can_be_updated_in_batch(self, model):
+        from .model import Model
+
+        cls = model.__class__
+
+        # Models customizing how they are updated are saved on their own
+        return (cls._perform_update is Model._perform_update
+                and cls._set_keys_for_save_query
+                is Model._set_keys_for_save_query
+                and not model.is_dirty(model.get_key_name()))
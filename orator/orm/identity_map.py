@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+
+class IdentityMap:
+    """
+    Keep a single instance per model class and primary key.
+
+    While an identity map is active, the models loaded more than once
+    are the same instances, and the primary key lookups of loaded models
+    do not query the database.
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self._models = {}
+
+        self.hits = 0
+
+    @classmethod
+    def current(cls):
+        """
+        Get the identity map of the current thread.
+
+        :rtype: IdentityMap or None
+        """
+        maps = getattr(cls._local, 'maps', None)
+        if maps:
+            return maps[-1]
+
+    def __enter__(self):
+        if not hasattr(self._local, 'maps'):
+            self._local.maps = []
+
+        self._local.maps.append(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._local.maps.remove(self)
+
+        self.clear()
+
+    def get(self, model, key):
+        """
+        Get the loaded instance of a model.
+
+        :param model: A model of the class to look for
+        :type model: orator.orm.Model
+
+        :param key: The primary key value
+        :type key: mixed
+
+        :rtype: orator.orm.Model or None
+        """
+        instance = self._models.get(self._identify(model, key))
+
+        if instance is not None:
+            self.hits += 1
+
+        return instance
+
+    def get_many(self, model, keys):
+        """
+        Get the loaded instances of a model, if they are all loaded.
+
+        :param model: A model of the class to look for
+        :type model: orator.orm.Model
+
+        :param keys: The primary key values
+        :type keys: list
+
+        :rtype: list or None
+        """
+        instances = [self._models.get(self._identify(model, key))
+                     for key in keys]
+
+        if any(instance is None for instance in instances):
+            return
+
+        self.hits += len(instances)
+
+        return instances
+
+    def add(self, model):
+        """
+        Register a loaded model.
+
+        :type model: orator.orm.Model
+        """
+        key = model.get_attributes().get(model.get_key_name())
+
+        if key is not None:
+            self._models[self._identify(model, key)] = model
+
+    def remove(self, model):
+        """
+        Forget a model.
+
+        :type model: orator.orm.Model
+        """
+        key = model.get_attributes().get(model.get_key_name())
+
+        self._models.pop(self._identify(model, key), None)
+
+    def hydrate(self, model, items, connection=None):
+        """
+        Create a collection of models from plain lists,
+        reusing the instances already loaded.
+
+        :param model: A model of the class to hydrate
+        :type model: orator.orm.Model
+
+        :param items: The records
+        :type items: list
+
+        :param connection: The connection name
+        :type connection: str
+
+        :rtype: orator.orm.Collection
+        """
+        instance = model.__class__().set_connection(connection)
+        key_name = instance.get_key_name()
+
+        models = []
+        for item in items:
+            try:
+                key = item[key_name]
+            except (KeyError, IndexError, TypeError):
+                key = None
+
+            identity = self._identify(instance, key)
+
+            existing = self._models.get(identity)
+            if existing is not None:
+                self.hits += 1
+                models.append(existing)
+
+                continue
+
+            new = instance.new_from_builder(item)
+            if key is not None:
+                self._models[identity] = new
+
+            models.append(new)
+
+        return instance.new_collection(models)
+
+    def clear(self):
+        self._models.clear()
+        self.hits = 0
+
+    def _identify(self, model, key):
+        return model.__class__, model.get_connection_name(), key
+
+    def __len__(self):
+        return len(self._models)
+
+    def __contains__(self, model):
+        key = model.get_attributes().get(model.get_key_name())
+
+        return self._identify(model, key) in self._models
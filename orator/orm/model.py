@@ -13,6 +13,8 @@ from ..exceptions.orm import (MassAssignmentError, RelatedClassNotFound,
                               ValidationError)
 from .builder import Builder
 from .collection import Collection
+from .session import Session
+from .identity_map import IdentityMap
 from .relations import (
     Relation, HasOne, HasMany, BelongsTo, BelongsToMany, HasManyThrough,
     MorphOne, MorphMany, MorphTo, MorphToMany
@@ -20,9 +22,15 @@ from .relations import (
 from .relations.wrapper import Wrapper, BelongsToManyWrapper
 from .utils import mutator, accessor
 from .scopes import Scope
+from .attributes import AttributeDescriptor, compile_cast, cast_date
+from .serializer import Serializer
 from ..events import Event
 
 
+# The original value of the attributes that did not exist
+_MISSING = object()
+
+
 class ModelRegister(dict):
 
     def __init__(self, *args, **kwargs):
@@ -92,6 +100,13 @@ class Model(metaclass=MetaModel):
 
     __morph_name__ = None
 
+    # The number of parents whose relations are eagerly loaded per query,
+    # None to bind as many keys as the database accepts
+    __eager_batch_size__ = None
+
+    # Whether the keys of eager loads are bound as a single array
+    __eager_where_any__ = False
+
     _per_page = 15
 
     _with = []
@@ -102,6 +117,9 @@ class Model(metaclass=MetaModel):
 
     _accessor_cache = {}
     _mutator_cache = {}
+    _descriptor_cache = {}
+    _cast_plan_cache = {}
+    _serializer_cache = {}
 
     __resolver = None
     __columns__ = []
@@ -127,7 +145,8 @@ class Model(metaclass=MetaModel):
         self._boot_if_not_booted()
 
         self._exists = False
-        self._original = {}
+        self._changes = {}
+        self._cast_values = {}
 
         # Setting default attributes' values
         self._attributes = dict((k, v) for k, v in self.__attributes__.items())
@@ -153,6 +172,10 @@ class Model(metaclass=MetaModel):
 
             klass._boot()
 
+            self._generate_attribute_descriptors(
+                list(klass.__columns__) + list(klass.__casts__)
+                + self.get_dates())
+
             self._fire_model_event('booted')
 
     @classmethod
@@ -171,6 +194,72 @@ class Model(metaclass=MetaModel):
 
         cls._boot_mixins()
 
+    def _generate_attribute_descriptors(self, columns):
+        """
+        Give direct access to the given columns through descriptors
+        resolving their cast once for all.
+
+        The columns conflicting with an attribute of the class are skipped,
+        as well as the classes customizing how attributes are read or set.
+
+        :param columns: The column names
+        :type columns: list
+        """
+        klass = self.__class__
+
+        if not klass._can_use_attribute_descriptors():
+            return
+
+        descriptors = klass._descriptor_cache.setdefault(klass, {})
+        dates = None
+
+        for name in columns:
+            if name in descriptors or name.startswith('_') \
+                    or not name.isidentifier() \
+                    or klass._has_class_attribute(name):
+                continue
+
+            if dates is None:
+                dates = self.get_dates()
+
+            descriptor = AttributeDescriptor(
+                klass, name, klass.__casts__.get(name), name in dates)
+
+            setattr(klass, name, descriptor)
+            descriptors[name] = descriptor
+
+    @classmethod
+    def _can_use_attribute_descriptors(cls):
+        """
+        Determine if the class reads and sets its attributes
+        the default way.
+
+        :rtype: bool
+        """
+        for method in ['get_attribute', '_get_attribute_value',
+                       '_get_attribute_from_dict', '_has_cast',
+                       '_get_cast_type', '_cast_attribute',
+                       'set_attribute', '_has_set_mutator',
+                       '__getattr__', '__setattr__']:
+            if getattr(cls, method) is not getattr(Model, method):
+                return False
+
+        return True
+
+    @classmethod
+    def _has_class_attribute(cls, name):
+        """
+        Determine if a name is defined by the class, the attribute
+        descriptors of parent classes excepted.
+
+        :rtype: bool
+        """
+        for klass in cls.__mro__:
+            if name in vars(klass):
+                return not isinstance(vars(klass)[name], AttributeDescriptor)
+
+        return False
+
     @classmethod
     def _boot_columns(cls):
         connection = cls.resolve_connection()
@@ -355,14 +444,64 @@ class Model(metaclass=MetaModel):
         :return: A new instance for the current model
         :rtype: Model
         """
-        model = self.new_instance({}, True)
-
         if attributes is None:
             attributes = {}
 
+        connection = connection or self.__connection__
+
+        if self._builds_existing_by_default():
+            return self._new_existing(attributes, connection)
+
+        model = self.new_instance({}, True)
+
         model.set_raw_attributes(attributes, True)
 
-        model.set_connection(connection or self.__connection__)
+        model.set_connection(connection)
+
+        return model
+
+    @classmethod
+    def _builds_existing_by_default(cls):
+        """
+        Determine if the model class builds existing instances
+        the default way, in which case they can be built
+        without going through the constructor.
+
+        :rtype: bool
+        """
+        for method in ['__init__', 'new_from_builder', 'new_instance',
+                       'set_raw_attributes', 'set_connection']:
+            if getattr(cls, method) is not getattr(Model, method):
+                return False
+
+        return True
+
+    @classmethod
+    def _new_existing(cls, attributes, connection=None):
+        """
+        Create an existing instance without going through the constructor.
+
+        The attributes are set as they are: there is no default value,
+        no mass assignment check and no mutator.
+        The model class must already be booted.
+
+        :param attributes: The model attributes
+        :type attributes: dict
+
+        :param connection: The connection name
+        :type connection: str
+
+        :rtype: Model
+        """
+        model = object.__new__(cls)
+
+        values = model.__dict__
+        values['_exists'] = True
+        values['_attributes'] = dict(attributes)
+        values['_changes'] = {}
+        values['_cast_values'] = {}
+        values['_relations'] = {}
+        values['__connection__'] = connection
 
         return model
 
@@ -377,9 +516,18 @@ class Model(metaclass=MetaModel):
         """
         instance = cls().set_connection(connection)
 
-        collection = instance.new_collection(items)
+        if items:
+            instance._generate_attribute_descriptors(list(items[0].keys()))
+
+        if cls._builds_existing_by_default():
+            new = cls._new_existing
+            connection = connection or cls.__connection__
+
+            return instance.new_collection(
+                [new(item, connection) for item in items])
 
-        return collection.map(lambda item: instance.new_from_builder(item))
+        return instance.new_collection(
+            [instance.new_from_builder(item) for item in items])
 
     @classmethod
     def hydrate_raw(cls, query, bindings=None, connection=None):
@@ -1322,6 +1470,10 @@ class Model(metaclass=MetaModel):
             raise Exception('No primary key defined on the model.')
 
         if self._exists:
+            session = Session.current()
+            if session is not None:
+                return session.delete(self)
+
             if self._fire_model_event('deleting') is False:
                 return False
 
@@ -1331,6 +1483,10 @@ class Model(metaclass=MetaModel):
 
             self._exists = False
 
+            identity_map = IdentityMap.current()
+            if identity_map is not None:
+                identity_map.remove(self)
+
             self._fire_model_event('deleted')
 
             return True
@@ -1631,18 +1787,16 @@ class Model(metaclass=MetaModel):
         """
         Save the model to the database.
         """
-        if options is None or options.get('run_validation', True):
-            if self.is_valid():
-                self._attributes = self.__cleaned_data__
-            else:
-                raise ValidationError(self.errors)
-
         if options is None:
             options = {}
 
+        session = Session.current()
+        if session is not None:
+            return session.save(self, options)
+
         query = self.new_query()
 
-        if self._fire_model_event('saving') is False:
+        if not self._prepare_save(options):
             return False
 
         if self._exists:
@@ -1655,6 +1809,24 @@ class Model(metaclass=MetaModel):
 
         return saved
 
+    def _prepare_save(self, options):
+        """
+        Validate the model and fire the "saving" event.
+
+        :param options: The save options
+        :type options: dict
+
+        :return: Whether the model should be saved
+        :rtype: bool
+        """
+        if options.get('run_validation', True):
+            if self.is_valid():
+                self._replace_attributes(self.__cleaned_data__)
+            else:
+                raise ValidationError(self.errors)
+
+        return self._fire_model_event('saving') is not False
+
     def _finish_save(self, options):
         """
         Finish processing on a successful save operation.
@@ -1679,23 +1851,41 @@ class Model(metaclass=MetaModel):
         if options is None:
             options = {}
 
-        dirty = self.get_dirty()
+        dirty = self._prepare_update(options)
+
+        if dirty is False:
+            return False
 
         if len(dirty):
-            if self._fire_model_event('updating') is False:
-                return False
+            self._set_keys_for_save_query(query).update(dirty)
+
+            self._fire_model_event('updated')
+
+        return True
 
-            if self.__timestamps__ and options.get('timestamps', True):
-                self._update_timestamps()
+    def _prepare_update(self, options):
+        """
+        Fire the "updating" event and update the timestamps
+        of a model about to be updated.
 
-            dirty = self.get_dirty()
+        :param options: The save options
+        :type options: dict
 
-            if len(dirty):
-                self._set_keys_for_save_query(query).update(dirty)
+        :return: The attributes to update or False if the update is cancelled
+        :rtype: dict or bool
+        """
+        dirty = self.get_dirty()
 
-                self._fire_model_event('updated')
+        if not len(dirty):
+            return dirty
 
-        return True
+        if self._fire_model_event('updating') is False:
+            return False
+
+        if self.__timestamps__ and options.get('timestamps', True):
+            self._update_timestamps()
+
+        return self.get_dirty()
 
     def _perform_insert(self, query, options=None):
         """
@@ -1710,13 +1900,10 @@ class Model(metaclass=MetaModel):
         if options is None:
             options = {}
 
-        if self._fire_model_event('creating') is False:
-            return False
-
-        if self.__timestamps__ and options.get('timestamps', True):
-            self._update_timestamps()
+        attributes = self._prepare_insert(options)
 
-        attributes = self._attributes
+        if attributes is False:
+            return False
 
         if self.__incrementing__:
             self._insert_and_set_id(query, attributes)
@@ -1729,6 +1916,35 @@ class Model(metaclass=MetaModel):
 
         return True
 
+    def _prepare_insert(self, options):
+        """
+        Fire the "creating" event and set the timestamps
+        of a model about to be inserted.
+
+        :param options: The save options
+        :type options: dict
+
+        :return: The attributes to insert or False if the insert is cancelled
+        :rtype: dict or bool
+        """
+        if self._fire_model_event('creating') is False:
+            return False
+
+        if self.__timestamps__ and options.get('timestamps', True):
+            self._update_timestamps()
+
+        return self._attributes
+
+    def _has_generated_key(self):
+        """
+        Determine if the key of the model is generated by the database
+        when it is inserted.
+
+        :rtype: bool
+        """
+        return (self.__incrementing__
+                and self._attributes.get(self.get_key_name()) is None)
+
     def _insert_and_set_id(self, query, attributes):
         """
         Insert the given attributes and set the ID on the model.
@@ -1803,8 +2019,9 @@ class Model(metaclass=MetaModel):
         """
         Get the primary key value for a save query.
         """
-        if self.get_key_name() in self._original:
-            return self._original[self.get_key_name()]
+        original = self._changes.get(self.get_key_name(), _MISSING)
+        if original is not _MISSING:
+            return original
 
         return self._attributes[self.get_key_name()]
 
@@ -2288,12 +2505,46 @@ class Model(metaclass=MetaModel):
         :return: The dictionary version of the model instance
         :rtype: dict
         """
+        serializer = self._get_serializer()
+        if serializer is not None:
+            return serializer.serialize(self)
+
         attributes = self.attributes_to_dict()
 
         attributes.update(self.relations_to_dict())
 
         return attributes
 
+    def _get_serializer(self):
+        """
+        Get the serializer compiled for the model class,
+        if it applies to the model.
+
+        :rtype: Serializer or None
+        """
+        klass = self.__class__
+        serializer = klass._serializer_cache.get(klass)
+
+        if serializer is not None and serializer.accepts(self):
+            return serializer
+
+        for name in ['__hidden__', '__visible__', '__appends__', '__casts__']:
+            if getattr(self, name) is not getattr(klass, name):
+                return
+
+        for method in ['attributes_to_dict', '_get_dictable_attributes',
+                       '_get_dictable_appends', '_get_dictable_items',
+                       'get_hidden', 'get_visible', '_cast_attribute',
+                       '_format_date', '_format_date_attribute']:
+            if getattr(klass, method) is not getattr(Model, method):
+                return
+
+        serializer = Serializer(self)
+
+        klass._serializer_cache[klass] = serializer
+
+        return serializer
+
     @deprecated
     def to_dict(self):
         """
@@ -2317,7 +2568,7 @@ class Model(metaclass=MetaModel):
             if key not in attributes or key in mutated_attributes:
                 continue
 
-            attributes[key] = self._format_date(attributes[key])
+            attributes[key] = self._format_date_attribute(key, attributes[key])
 
         for key in mutated_attributes:
             if key not in attributes:
@@ -2456,10 +2707,36 @@ class Model(metaclass=MetaModel):
             value = self._cast_attribute(key, value)
         elif key in self.get_dates():
             if value is not None:
-                return self.as_datetime(value)
+                return self._get_cached_cast(key, value, cast_date)
 
         return value
 
+    def _get_cached_cast(self, key, value, cast):
+        """
+        Convert the value of an attribute, remembering the result
+        as long as the attribute keeps the same value.
+
+        :param key: The attribute name
+        :type key: str
+
+        :param value: The raw value of the attribute
+        :type value: mixed
+
+        :param cast: The conversion function
+        :type cast: callable
+
+        :rtype: mixed
+        """
+        cached = self._cast_values.get(key)
+        if cached is not None and cached[0] is value:
+            return cached[1]
+
+        result = cast(self, value)
+
+        self._cast_values[key] = (value, result)
+
+        return result
+
     def _get_attribute_from_dict(self, key):
         return self._attributes.get(key)
 
@@ -2578,21 +2855,35 @@ class Model(metaclass=MetaModel):
         if value is None:
             return None
 
-        type = self._get_cast_type(key)
-        if type in ['int', 'integer']:
-            return int(value)
-        elif type in ['real', 'float', 'double']:
-            return float(value)
-        elif type in ['string', 'str']:
-            return str(value)
-        elif type in ['bool', 'boolean']:
-            return bool(value)
-        elif (type in ['dict', 'list', 'json'] and
-              isinstance(value, str)):
-            return json.loads(value)
-        else:
+        cast, memoize = self._get_cast_plan()[key]
+        if cast is None:
             return value
 
+        if memoize:
+            return self._get_cached_cast(key, value, cast)
+
+        return cast(self, value)
+
+    def _get_cast_plan(self):
+        """
+        Get the conversion functions of the casted attributes,
+        resolved once per model class.
+
+        :rtype: dict
+        """
+        klass = self.__class__
+        casts = self.__casts__
+        plan = klass._cast_plan_cache.get(klass)
+
+        if plan is None or plan[0] is not casts:
+            plan = casts, {
+                key: compile_cast(type) for key, type in casts.items()
+            }
+
+            klass._cast_plan_cache[klass] = plan
+
+        return plan[1]
+
     def get_dates(self):
         """
         Get the attributes that should be converted to dates.
@@ -2653,6 +2944,24 @@ class Model(metaclass=MetaModel):
         """
         return 'iso'
 
+    def _format_date_attribute(self, key, value):
+        """
+        Format the value of a date attribute,
+        reusing the date already parsed for the attribute if any.
+
+        :param key: The attribute name
+        :type key: str
+
+        :param value: The raw value of the attribute
+        :type value: mixed
+
+        :rtype: str
+        """
+        if isinstance(value, str) and self.get_date_format() == 'iso':
+            value = self._get_cached_cast(key, value, cast_date)
+
+        return self._format_date(value)
+
     def _format_date(self, date):
         """
         Format a date or timestamp.
@@ -2691,6 +3000,8 @@ class Model(metaclass=MetaModel):
         if self._is_json_castable(key):
             value = json.dumps(value)
 
+        self._track_change(key)
+
         self._attributes[key] = value
 
     def replicate(self, except_=None):
@@ -2736,10 +3047,35 @@ class Model(metaclass=MetaModel):
         :param sync: Whether to sync the attributes or not
         :type sync: bool
         """
-        self._attributes = dict(attributes.items())
+        attributes = dict(attributes.items())
 
         if sync:
+            self._attributes = attributes
             self.sync_original()
+        else:
+            self._replace_attributes(attributes)
+
+    def _replace_attributes(self, attributes):
+        """
+        Replace the dictionary of model attributes,
+        keeping the original value of the attributes.
+
+        :param attributes: The model attributes
+        :type attributes: dict
+        """
+        if attributes is self._attributes:
+            return
+
+        changes = self._changes
+        for key, value in self._attributes.items():
+            if key not in changes:
+                changes[key] = value
+
+        for key in attributes:
+            if key not in changes:
+                changes[key] = _MISSING
+
+        self._attributes = attributes
 
     def set_raw_attribute(self, key, value, sync=False):
         """
@@ -2754,11 +3090,23 @@ class Model(metaclass=MetaModel):
         :param sync: Whether to sync the attributes or not
         :type sync: bool
         """
+        self._track_change(key)
+
         self._attributes[key] = value
 
         if sync:
             self.sync_original()
 
+    def _track_change(self, key):
+        """
+        Keep the original value of an attribute about to be modified.
+
+        :param key: The attribute name
+        :type key: str
+        """
+        if key not in self._changes:
+            self._changes[key] = self._attributes.get(key, _MISSING)
+
     def get_original(self, key=None, default=None):
         """
         Get the original values
@@ -2772,17 +3120,33 @@ class Model(metaclass=MetaModel):
         :rtype: mixed
         """
         if key is None:
-            return self._original
+            original = dict(self._attributes)
+
+            for key, value in self._changes.items():
+                if value is _MISSING:
+                    original.pop(key, None)
+                else:
+                    original[key] = value
+
+            return original
+
+        if key in self._changes:
+            value = self._changes[key]
+
+            return default if value is _MISSING else value
 
-        return self._original.get(key, default)
+        return self._attributes.get(key, default)
 
     def sync_original(self):
         """
         Sync the original attributes with the current.
 
+        Only the original value of the modified attributes are kept,
+        so syncing does not copy the attributes.
+
         :rtype: Builder
         """
-        self._original = dict(self._attributes.items())
+        self._changes = {}
 
         return self
 
@@ -2795,7 +3159,7 @@ class Model(metaclass=MetaModel):
 
         :rtype: Model
         """
-        self._original[attribute] = self._attributes[attribute]
+        self._changes.pop(attribute, None)
 
         return self
 
@@ -2808,17 +3172,28 @@ class Model(metaclass=MetaModel):
 
         :rtype: boolean
         """
-        dirty = self.get_dirty()
-
         if not attributes:
-            return len(dirty) > 0
+            attributes = list(self._changes)
 
         for attribute in attributes:
-            if attribute in dirty:
+            if self._is_attribute_dirty(attribute):
                 return True
 
         return False
 
+    def _is_attribute_dirty(self, key):
+        """
+        Determine if an attribute has been modified since last sync.
+
+        :rtype: bool
+        """
+        if key not in self._attributes or key not in self._changes:
+            return False
+
+        original = self._changes[key]
+
+        return original is _MISSING or self._attributes[key] != original
+
     def get_dirty(self):
         """
         Get the attribute that have been change since last sync.
@@ -2827,11 +3202,9 @@ class Model(metaclass=MetaModel):
         """
         dirty = {}
 
-        for key, value in self._attributes.items():
-            if key not in self._original:
-                dirty[key] = value
-            elif value != self._original[key]:
-                dirty[key] = value
+        for key in self._changes:
+            if self._is_attribute_dirty(key):
+                dirty[key] = self._attributes[key]
 
         return dirty
 
@@ -2872,6 +3245,27 @@ class Model(metaclass=MetaModel):
         """
         return self._relations[relation]
 
+    def relation_loaded(self, relation):
+        """
+        Determine if a relation has been loaded on the model.
+
+        :param relation: The name of the relation.
+        :type relation: str
+
+        :rtype: bool
+        """
+        if relation not in self._relations:
+            return False
+
+        value = self._relations[relation]
+
+        # The relations accessed as properties are only loaded
+        # once their lazy wrapper has been resolved.
+        if issubclass(type(value), Wrapper):
+            return value.__resolved__
+
+        return True
+
     def set_relation(self, relation, value):
         """
         Set the specific relation in the model.
@@ -2974,8 +3368,12 @@ class Model(metaclass=MetaModel):
         return self.get_attribute(item)
 
     def __setattr__(self, key, value):
-        if key in ['_attributes', '_exists', '_relations',
-                   '_original', '_errors'] or key.startswith('__'):
+        descriptors = self._descriptor_cache.get(self.__class__)
+        if descriptors is not None and key in descriptors:
+            return descriptors[key].__set__(self, value)
+
+        if key in ['_attributes', '_exists', '_relations', '_changes',
+                   '_cast_values', '_errors'] or key.startswith('__'):
             return object.__setattr__(self, key, value)
 
         if self._has_set_mutator(key):
@@ -2996,6 +3394,8 @@ class Model(metaclass=MetaModel):
         try:
             super().__delattr__(item)
         except AttributeError:
+            self._track_change(item)
+
             del self._attributes[item]
 
     def __getstate__(self):
@@ -3008,6 +3408,9 @@ class Model(metaclass=MetaModel):
     def __setstate__(self, state):
         self._boot_if_not_booted()
 
+        self._changes = {}
+        self._cast_values = {}
+
         self.set_raw_attributes(state['attributes'], True)
         self.set_relations(state['relations'])
         self.set_exists(state['exists'])
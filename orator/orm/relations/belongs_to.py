@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 
+from collections import OrderedDict
 from ...query.expression import QueryExpression
 from .relation import Relation
 from .result import Result
+from ..identity_map import IdentityMap
 
 
 class BelongsTo(Relation):
@@ -27,6 +29,7 @@ class BelongsTo(Relation):
         self._other_key = other_key
         self._relation = relation
         self._foreign_key = foreign_key
+        self._eager_keys = []
 
         super().__init__(query, parent)
 
@@ -37,8 +40,53 @@ class BelongsTo(Relation):
         if self._query is None:
             return None
 
+        identity_map = self._get_identity_map()
+        if identity_map is not None:
+            model = identity_map.get(
+                self._related, getattr(self._parent, self._foreign_key))
+
+            if model is not None:
+                return model
+
         return self._query.first()
 
+    def get_eager(self):
+        """
+        Get the relationship for eager loading.
+
+        :rtype: Collection
+        """
+        identity_map = self._get_identity_map()
+        if identity_map is not None:
+            models = identity_map.get_many(self._related, self._eager_keys)
+
+            if models is not None:
+                return self._related.new_collection(
+                    self._query.eager_load_relations(models))
+
+        return super().get_eager()
+
+    def _get_identity_map(self):
+        """
+        Get the current identity map if the relation query
+        only constrains the primary key of the related models.
+
+        :rtype: IdentityMap or None
+        """
+        identity_map = IdentityMap.current()
+        if identity_map is None:
+            return
+
+        if self._other_key != self._related.get_key_name():
+            return
+
+        query = self._query.get_query()
+        if len(query.wheres) != 1 or query.joins or query.columns \
+                or self._query.has_global_scopes():
+            return
+
+        return identity_map
+
     def add_constraints(self):
         """
         Set the base constraints on the relation query.
@@ -80,7 +128,9 @@ class BelongsTo(Relation):
         """
         key = '%s.%s' % (self._related.get_table(), self._other_key)
 
-        self._query.where_in(key, self._get_eager_model_keys(models))
+        self._eager_keys = self._get_eager_model_keys(models)
+
+        self._where_in_keys(key, self._eager_keys)
 
     def _get_eager_model_keys(self, models):
         """
@@ -90,18 +140,15 @@ class BelongsTo(Relation):
 
         :rtype: list
         """
-        keys = []
+        keys = OrderedDict()
 
         for model in models:
             value = getattr(model, self._foreign_key)
 
-            if value is not None and value not in keys:
-                keys.append(value)
+            if value is not None:
+                keys[value] = True
 
-        if not len(keys):
-            return [0]
-
-        return keys
+        return list(keys)
 
     def init_relation(self, models, relation):
         """
@@ -155,6 +202,9 @@ class BelongsTo(Relation):
         self._parent.set_attribute(
             self._foreign_key, model.get_attribute(self._other_key))
 
+        self._follow_key(
+            self._parent, self._foreign_key, model, self._other_key)
+
         return self._parent.set_relation(
             self._relation, Result(model, self, self._parent))
 
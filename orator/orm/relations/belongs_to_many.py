@@ -329,7 +329,7 @@ class BelongsToMany(Relation):
 
         :type models: list
         """
-        self._query.where_in(self.get_foreign_key(), self.get_keys(models))
+        self._where_in_keys(self.get_foreign_key(), self.get_keys(models))
 
     def init_relation(self, models, relation):
         """
@@ -82,8 +82,8 @@ class HasManyThrough(Relation):
         """
         table = self._parent.get_table()
 
-        self._query.where_in('%s.%s' %
-                             (table, self._first_key), self.get_keys(models))
+        self._where_in_keys('%s.%s' % (table, self._first_key),
+                            self.get_keys(models))
 
     def init_relation(self, models, relation):
         """
@@ -37,7 +37,7 @@ class HasOneOrMany(Relation):
 
         :type models: list
         """
-        return self._query.where_in(
+        return self._where_in_keys(
             self._foreign_key, self.get_keys(models, self._local_key))
 
     def match_one(self, models, results, relation):
@@ -159,6 +159,9 @@ class HasOneOrMany(Relation):
         model.set_attribute(self.get_plain_foreign_key(),
                             self.get_parent_key())
 
+        self._follow_key(model, self.get_plain_foreign_key(),
+                         self._parent, self._local_key)
+
         if model.save():
             return model
 
@@ -279,6 +282,9 @@ class HasOneOrMany(Relation):
         instance.set_attribute(
             self.get_plain_foreign_key(), self.get_parent_key())
 
+        self._follow_key(instance, self.get_plain_foreign_key(),
+                         self._parent, self._local_key)
+
         instance.save()
 
         return instance
@@ -1,13 +1,33 @@
 # -*- coding: utf-8 -*-
 
+import threading
 from contextlib import contextmanager
 from ...query.expression import QueryExpression
 from ..builder import Builder
 
 
+class _ConstraintsSwitch:
+    """
+    Tell whether new relations add their constraints,
+    which is switched off separately by each thread.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def __get__(self, instance, owner):
+        return not getattr(self._local, 'disabled', 0)
+
+    def disable(self):
+        self._local.disabled = getattr(self._local, 'disabled', 0) + 1
+
+    def enable(self):
+        self._local.disabled -= 1
+
+
 class Relation:
 
-    _constraints = True
+    _constraints = _ConstraintsSwitch()
 
     def __init__(self, query, parent):
         """
@@ -69,8 +89,13 @@ class Relation:
         """
         Get the relationship for eager loading.
 
+        The query is skipped when none of the parents has a key to look for.
+
         :rtype: Collection
         """
+        if self.get_base_query().matches_nothing():
+            return self._related.new_collection()
+
         return self.get()
 
     def touch(self):
@@ -115,35 +140,70 @@ class Relation:
     @contextmanager
     def no_constraints(cls, with_subclasses=False):
         """
-        Runs a callback with constraints disabled on the relation.
+        Runs a callback with constraints disabled on the relations
+        created by the current thread.
+
+        The constraints are disabled for every relation class,
+        with_subclasses is kept for compatibility.
         """
-        cls._constraints = False
+        switch = Relation.__dict__['_constraints']
 
-        if with_subclasses:
-            for klass in cls.__subclasses__():
-                klass._constraints = False
+        switch.disable()
 
         try:
             yield cls
-        except Exception:
-            raise
         finally:
-            cls._constraints = True
-            if with_subclasses:
-                for klass in cls.__subclasses__():
-                    klass._constraints = True
+            switch.enable()
 
     def get_keys(self, models, key=None):
         """
-        Get all the primary keys for an array of models.
+        Get all the distinct primary keys for an array of models,
+        leaving out the null keys.
 
         :type models: list
         :type key: str
 
         :rtype: list
         """
-        return list(set(map(lambda value: value.get_attribute(
-            key) if key else value.get_key(), models)))
+        if key:
+            keys = set(model.get_attribute(key) for model in models)
+        else:
+            keys = set(model.get_key() for model in models)
+
+        keys.discard(None)
+
+        return list(keys)
+
+    def _where_in_keys(self, column, keys):
+        """
+        Constrain the relation query to a set of keys,
+        as an array when the parent model asks for it.
+
+        :type column: str
+        :type keys: list
+        """
+        if self._parent.__eager_where_any__:
+            return self._query.where_any(column, keys)
+
+        return self._query.where_in(column, keys)
+
+    def _follow_key(self, model, attribute, owner, owner_attribute):
+        """
+        Within a session, set an attribute of a model
+        to the key of its owner once the owner has been inserted.
+
+        :type model: orator.orm.Model
+        :type attribute: str
+        :type owner: orator.orm.Model
+        :type owner_attribute: str
+        """
+        from ..session import Session
+
+        session = Session.current()
+        if session is None or owner.get_attribute(owner_attribute) is not None:
+            return
+
+        session.follow_key(model, attribute, owner, owner_attribute)
 
     def get_query(self):
         return self._query
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+from .attributes import cast_date
+
+
+def _identity(model, key, value):
+    return value
+
+
+def _mutate(model, key, value):
+    return model._mutate_attribute_for_dict(key)
+
+
+def _format_date(model, key, value):
+    return model._format_date_attribute(key, value)
+
+
+def _format_iso_date(model, key, value):
+    if isinstance(value, str):
+        return model._get_cached_cast(key, value, cast_date).isoformat()
+
+    return model._format_date(value)
+
+
+def _compile_cast(cast, memoize):
+    if cast is None:
+        return _identity
+
+    if memoize:
+        def handler(model, key, value):
+            if value is None:
+                return None
+
+            return model._get_cached_cast(key, value, cast)
+    else:
+        def handler(model, key, value):
+            if value is None:
+                return None
+
+            return cast(model, value)
+
+    return handler
+
+
+def _chain(first, second):
+    def handler(model, key, value):
+        return second(model, key, first(model, key, value))
+
+    return handler
+
+
+class Serializer:
+    """
+    Convert the models of a class to dictionaries.
+
+    What to do with each attribute is decided once
+    from the hidden, visible, date and casted attributes,
+    the accessors and the appended attributes of the class.
+    """
+
+    def __init__(self, model):
+        """
+        :param model: A model of the class to serialize
+        :type model: orator.orm.Model
+        """
+        self.hidden = model.__hidden__
+        self.visible = model.__visible__
+        self.appends = model.__appends__
+        self.casts = model.__casts__
+
+        self._dates = model.get_dates()
+        self._format_date = _format_date
+        if model.get_date_format() == 'iso':
+            self._format_date = _format_iso_date
+
+        self._casts = model._get_cast_plan()
+        self._mutated = model._get_mutated_attributes()
+        self._appended = list(model._get_dictable_appends())
+        self._handlers = {}
+
+    def accepts(self, model):
+        """
+        Determine if the serializer applies to a model,
+        whose hidden, visible, appended and casted attributes
+        may have been changed.
+
+        :rtype: bool
+        """
+        return (model.__hidden__ is self.hidden
+                and model.__visible__ is self.visible
+                and model.__appends__ is self.appends
+                and model.__casts__ is self.casts)
+
+    def serialize(self, model):
+        """
+        Convert a model to a dictionary.
+
+        :type model: orator.orm.Model
+
+        :rtype: dict
+        """
+        handlers = self._handlers
+        attributes = {}
+
+        for key, value in model._attributes.items():
+            try:
+                handler = handlers[key]
+            except KeyError:
+                handler = handlers[key] = self._get_handler(key)
+
+            if handler is _identity:
+                attributes[key] = value
+            elif handler is not None:
+                attributes[key] = handler(model, key, value)
+
+        for key in self._appended:
+            attributes[key] = model._mutate_attribute_for_dict(key)
+
+        if model._relations:
+            attributes.update(model.relations_to_dict())
+
+        return attributes
+
+    def _get_handler(self, key):
+        if self.visible:
+            if key not in self.visible:
+                return
+        elif key in self.hidden or key.startswith('_'):
+            return
+
+        if key in self._mutated:
+            return _mutate
+
+        handler = _identity
+
+        if key in self._dates:
+            handler = self._format_date
+
+        if key in self._casts:
+            cast = _compile_cast(*self._casts[key])
+
+            if handler is _identity:
+                handler = cast
+            elif cast is not _identity:
+                handler = _chain(handler, cast)
+
+        return handler
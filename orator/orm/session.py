@@ -0,0 +1,443 @@
+# -*- coding: utf-8 -*-
+
+import sys
+import threading
+from contextlib import contextmanager, ExitStack
+from collections import OrderedDict
+from .collection import Collection
+from .identity_map import IdentityMap
+from .relations import BelongsTo
+from .utils import belongs_to
+
+
+class Session:
+    """
+    A unit of work tracking the models saved and deleted in its scope.
+
+    While a session is active, ``save()`` and ``delete()`` only register
+    the models, which are flushed when the session is committed:
+    the inserts and updates are grouped per table in batched statements,
+    the parents being written before their children,
+    and the owners touched by the models are updated once.
+
+    The models are written within a transaction on each of their
+    connections, which is rolled back if the session ends with an error.
+    """
+
+    _local = threading.local()
+
+    # The parent classes of each model class
+    _dependencies = {}
+
+    def __init__(self, batch_size=None):
+        """
+        :param batch_size: The number of models per statement
+        :type batch_size: int or None
+        """
+        self._batch_size = batch_size
+
+        self._saved = OrderedDict()
+        self._deleted = OrderedDict()
+        self._touching = []
+        self._keys = []
+        self._flushing = False
+
+        self._connections = {}
+        self._transactions = ExitStack()
+
+    @classmethod
+    def current(cls):
+        """
+        Get the session tracking the models of the current thread.
+
+        :rtype: Session or None
+        """
+        sessions = getattr(cls._local, 'sessions', None)
+        if not sessions:
+            return
+
+        session = sessions[-1]
+        if session._flushing:
+            return
+
+        return session
+
+    def __enter__(self):
+        if not hasattr(self._local, 'sessions'):
+            self._local.sessions = []
+
+        self._local.sessions.append(self)
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._local.sessions.remove(self)
+
+        if exc_type is None:
+            self.commit()
+        else:
+            self.clear()
+            self._end_transactions(exc_type, exc_val, exc_tb)
+
+    def save(self, model, options=None):
+        """
+        Register a model to save.
+
+        :param model: The model
+        :type model: orator.orm.Model
+
+        :param options: The save options
+        :type options: dict
+
+        :rtype: bool
+        """
+        if options is None:
+            options = {}
+
+        if not model.exists and model._has_generated_key():
+            # The key generated by the database is set when flushing
+            model.set_attribute(model.get_key_name(), None)
+
+        self._deleted.pop(id(model), None)
+        self._saved[id(model)] = (model, options)
+
+        return True
+
+    def delete(self, model):
+        """
+        Register a model to delete.
+
+        :param model: The model
+        :type model: orator.orm.Model
+
+        :rtype: bool
+        """
+        self._saved.pop(id(model), None)
+        self._deleted[id(model)] = model
+
+        return True
+
+    def follow_key(self, model, attribute, owner, owner_attribute):
+        """
+        Set an attribute of a model to an attribute of its owner
+        once the owner has been inserted, typically a foreign key
+        referencing a key generated by the database.
+
+        :param model: The model
+        :type model: orator.orm.Model
+
+        :param attribute: The attribute of the model
+        :type attribute: str
+
+        :param owner: The owner
+        :type owner: orator.orm.Model
+
+        :param owner_attribute: The attribute of the owner
+        :type owner_attribute: str
+        """
+        self._keys.append((model, attribute, owner, owner_attribute))
+
+    def is_pending(self, model):
+        """
+        Determine if a model is waiting to be flushed.
+
+        :rtype: bool
+        """
+        return id(model) in self._saved or id(model) in self._deleted
+
+    def flush(self):
+        """
+        Write the registered models to the database,
+        within the transactions ended by commit().
+
+        :return: Whether every model has been saved and deleted
+        :rtype: bool
+        """
+        self._begin_transactions()
+
+        with self._suspended():
+            done = self._flush_saved()
+            done = self._flush_deleted() and done
+
+            touching, self._touching = self._touching, []
+            self._touch_owners(touching)
+
+        return done
+
+    def commit(self):
+        """
+        Flush the registered models and commit the transactions
+        on each of their connections.
+
+        :return: Whether every model has been saved and deleted
+        :rtype: bool
+        """
+        try:
+            done = self.flush()
+        except Exception:
+            self._end_transactions(*sys.exc_info())
+
+            raise
+
+        self._end_transactions(None, None, None)
+
+        return done
+
+    def clear(self):
+        """
+        Forget the registered models without writing them.
+        """
+        self._saved.clear()
+        self._deleted.clear()
+        self._touching = []
+        self._keys = []
+
+    def _begin_transactions(self):
+        """
+        Begin a transaction on the connections of the registered models
+        which are not already within one for the session.
+        """
+        models = [m for m, _ in self._saved.values()]
+        models += list(self._deleted.values()) + self._touching
+
+        for model in models:
+            connection = model.get_connection()
+
+            if id(connection) not in self._connections:
+                self._transactions.enter_context(connection.transaction())
+                self._connections[id(connection)] = connection
+
+    def _end_transactions(self, exc_type, exc_val, exc_tb):
+        """
+        Commit the transactions of the session,
+        or roll them back if an exception is given.
+        """
+        transactions, self._transactions = self._transactions, ExitStack()
+        self._connections = {}
+
+        transactions.__exit__(exc_type, exc_val, exc_tb)
+
+    def _flush_saved(self):
+        saved = self._saved
+        self._saved = OrderedDict()
+
+        keys = self._keys
+
+        # The models saved later still follow the keys of their owners
+        self._keys = [k for k in keys if id(k[0]) not in saved]
+
+        options = dict((id(m), o) for m, o in saved.values())
+
+        # The models of a class saved with the same options
+        # are saved together, once the classes they depend on are saved
+        groups = OrderedDict()
+        for model in self._sort([m for m, _ in saved.values()], keys):
+            key = tuple(sorted(options[id(model)].items()))
+            groups.setdefault((model.__class__, key), []).append(model)
+
+        done = True
+        for (_, options), models in groups.items():
+            options = dict(options)
+
+            self._set_followed_keys(models, keys)
+
+            saved = Collection(models).save(
+                dict(options, touch=False), self._batch_size)
+            done = saved and done
+
+            if options.get('touch', True):
+                self._touching += [m for m in models if not m.is_dirty()]
+
+        return done
+
+    def _flush_deleted(self):
+        deleted = self._deleted
+        self._deleted = OrderedDict()
+
+        # Children are deleted before their parents
+        models = list(reversed(self._sort(list(deleted.values()))))
+
+        groups = OrderedDict()
+        done = True
+
+        for model in models:
+            if not model.exists:
+                continue
+
+            if hasattr(model, '_do_perform_delete_on_model'):
+                done = model.delete() is not False and done
+
+                continue
+
+            group = (model.__class__, model.get_connection_name())
+            groups.setdefault(group, []).append(model)
+
+        for models in groups.values():
+            deleting = []
+            for model in models:
+                if model._fire_model_event('deleting') is False:
+                    done = False
+                else:
+                    deleting.append(model)
+
+            if not deleting:
+                continue
+
+            first = deleting[0]
+            first.new_query()\
+                .where_in(first.get_key_name(),
+                          [m.get_key() for m in deleting])\
+                .delete()
+
+            self._touching += deleting
+
+            identity_map = IdentityMap.current()
+
+            for model in deleting:
+                model.set_exists(False)
+
+                if identity_map is not None:
+                    identity_map.remove(model)
+
+                model._fire_model_event('deleted')
+
+        return done
+
+    def _touch_owners(self, models):
+        """
+        Touch the owners of the models,
+        with one query per owner table for "belongs to" relations.
+        """
+        owners = OrderedDict()
+
+        for model in models:
+            for name in model.__touches__:
+                if not hasattr(model, name):
+                    continue
+
+                wrapper = getattr(model, name)
+                relation = wrapper()
+
+                if not isinstance(relation, BelongsTo):
+                    if wrapper:
+                        relation.touch()
+                        wrapper.touch_owners()
+
+                    continue
+
+                key = model.get_attribute(relation.get_foreign_key())
+                if key is None:
+                    continue
+
+                related = relation.get_related()
+                group = (related.__class__, related.get_connection_name(),
+                         relation.get_other_key())
+
+                keys = owners.setdefault(group, (related, OrderedDict()))[1]
+                keys[key] = True
+
+        for (_, _, other_key), (related, keys) in owners.items():
+            keys = list(keys)
+
+            related.new_query().where_in(other_key, keys).update({
+                related.get_updated_at_column(): related.fresh_timestamp()
+            })
+
+            if related.__touches__:
+                self._touch_owners(
+                    related.new_query().where_in(other_key, keys).get())
+
+    def _set_followed_keys(self, models, keys):
+        """
+        Set the attributes following the ones of already inserted owners.
+        """
+        ids = set(id(model) for model in models)
+
+        for model, attribute, owner, owner_attribute in keys:
+            value = owner.get_attribute(owner_attribute)
+
+            if id(model) in ids and value is not None:
+                model.set_attribute(attribute, value)
+
+    def _sort(self, models, keys=None):
+        """
+        Sort models so that parents come before their children.
+        """
+        classes = []
+        for model in models:
+            if model.__class__ not in classes:
+                classes.append(model.__class__)
+
+        # Models following the keys of their owners depend on them
+        owners = {}
+        for model, _, owner, _ in keys or []:
+            if owner.__class__ is not model.__class__:
+                owners.setdefault(model.__class__, []).append(owner.__class__)
+
+        ordered = []
+        visiting = set()
+
+        def visit(cls):
+            if cls in ordered or cls in visiting:
+                return
+
+            visiting.add(cls)
+
+            for parent in self._get_parents(cls) + owners.get(cls, []):
+                if parent in classes:
+                    visit(parent)
+
+            ordered.append(cls)
+
+        for cls in classes:
+            visit(cls)
+
+        return sorted(models, key=lambda m: ordered.index(m.__class__))
+
+    @classmethod
+    def _get_parents(cls, model_class):
+        """
+        Get the classes a model class belongs to.
+
+        :rtype: list
+        """
+        if model_class in cls._dependencies:
+            return cls._dependencies[model_class]
+
+        parents = []
+        instance = None
+
+        for klass in model_class.__mro__:
+            for attribute in vars(klass).values():
+                if not isinstance(attribute, belongs_to) \
+                        or attribute.func is None:
+                    continue
+
+                if instance is None:
+                    instance = model_class()
+
+                try:
+                    related = attribute.func(instance)
+                except Exception:
+                    continue
+
+                if hasattr(related, 'get_model'):
+                    related = related.get_model().__class__
+
+                if isinstance(related, type) and related not in parents:
+                    parents.append(related)
+
+        cls._dependencies[model_class] = parents
+
+        return parents
+
+    @contextmanager
+    def _suspended(self):
+        # Models saved while flushing are written right away
+        flushing = self._flushing
+        self._flushing = True
+
+        try:
+            yield
+        finally:
+            self._flushing = flushing
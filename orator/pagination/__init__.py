@@ -2,3 +2,4 @@
 
 from .paginator import Paginator # noqa
 from .length_aware_paginator import LengthAwarePaginator # noqa
+from .cursor_paginator import CursorPaginator, Cursor # noqa
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+import json
+import base64
+import binascii
+from .base import BasePaginator
+from ..support.collection import Collection
+
+
+class Cursor:
+    """
+    The position of a page in a keyset pagination.
+
+    It holds the values of the order by columns of the first
+    or last item of a page, and in which direction to paginate from it.
+    """
+
+    def __init__(self, parameters, points_to_next_items=True):
+        """
+        :param parameters: The values of the order by columns
+        :type parameters: dict
+
+        :param points_to_next_items: Whether the cursor points
+                                     to the items after or before it
+        :type points_to_next_items: bool
+        """
+        self.parameters = parameters
+        self._points_to_next_items = points_to_next_items
+
+    def parameter(self, name):
+        """
+        Get the value of an order by column.
+
+        :param name: The column name
+        :type name: str
+        """
+        if name not in self.parameters:
+            raise KeyError('Unable to find parameter [%s] in the cursor'
+                           % name)
+
+        return self.parameters[name]
+
+    def points_to_next_items(self):
+        return self._points_to_next_items
+
+    def points_to_previous_items(self):
+        return not self._points_to_next_items
+
+    def encode(self):
+        """
+        Get the opaque representation of the cursor.
+
+        :rtype: str
+        """
+        payload = dict(self.parameters)
+        payload['_points_to_next_items'] = self._points_to_next_items
+
+        encoded = json.dumps(payload, default=str, sort_keys=True)
+
+        return base64.urlsafe_b64encode(encoded.encode()).decode()
+
+    @classmethod
+    def decode(cls, encoded):
+        """
+        Get a cursor from its encoded representation.
+
+        :param encoded: The encoded cursor
+        :type encoded: str or Cursor or None
+
+        :return: The cursor or None if it is invalid
+        :rtype: Cursor or None
+        """
+        if encoded is None or isinstance(encoded, Cursor):
+            return encoded
+
+        try:
+            payload = json.loads(
+                base64.urlsafe_b64decode(encoded.encode()).decode())
+        except (ValueError, TypeError, binascii.Error):
+            return
+
+        if not isinstance(payload, dict):
+            return
+
+        points_to_next_items = payload.pop('_points_to_next_items', True)
+
+        return cls(payload, points_to_next_items)
+
+    def __str__(self):
+        return self.encode()
+
+    def __eq__(self, other):
+        if not isinstance(other, Cursor):
+            return NotImplemented
+
+        return (self.parameters == other.parameters
+                and self._points_to_next_items
+                == other.points_to_next_items())
+
+
+class CursorPaginator(BasePaginator):
+    """
+    Paginator for keyset pagination.
+
+    Instead of page numbers, the pages are identified by cursors
+    built from the order by columns of the items.
+    """
+
+    def __init__(self, items, per_page, cursor=None, parameters=None,
+                 options=None):
+        """
+        Constructor
+
+        :param items: The items being paginated, with one more item
+                      than per_page if there are more items
+        :type items: mixed
+
+        :param per_page: The number of results per page
+        :type per_page: int
+
+        :param cursor: The cursor of the current page
+        :type cursor: Cursor or None
+
+        :param parameters: The names of the order by columns
+        :type parameters: list
+
+        :param options: Extra options to set
+        :type options: dict
+        """
+        if options is not None:
+            for key, value in options.items():
+                setattr(self, key, value)
+
+        self.per_page = per_page
+        self.cursor = cursor
+        self.parameters = parameters or ['id']
+
+        if isinstance(items, Collection):
+            self._items = items
+        else:
+            self._items = Collection.make(items)
+
+        self._has_more = len(self._items) > self.per_page
+
+        self._items = self._items[0:self.per_page]
+
+        # Previous items are fetched in reverse order
+        if self.cursor is not None and self.cursor.points_to_previous_items():
+            self._items = Collection.make(list(reversed(self._items.all())))
+
+    @property
+    def next_cursor(self):
+        """
+        Get the cursor of the next page.
+
+        :rtype: Cursor or None
+        """
+        if self.is_empty():
+            return
+
+        if self.cursor is None or self.cursor.points_to_next_items():
+            if not self._has_more:
+                return
+
+        return self._cursor_for(self._items.last(), True)
+
+    @property
+    def previous_cursor(self):
+        """
+        Get the cursor of the previous page.
+
+        :rtype: Cursor or None
+        """
+        if self.cursor is None or self.is_empty():
+            return
+
+        if self.cursor.points_to_previous_items() and not self._has_more:
+            return
+
+        return self._cursor_for(self._items.first(), False)
+
+    @property
+    def next_page(self):
+        """
+        Get the encoded cursor of the next page.
+
+        :rtype: str or None
+        """
+        cursor = self.next_cursor
+        if cursor is not None:
+            return cursor.encode()
+
+    @property
+    def previous_page(self):
+        """
+        Get the encoded cursor of the previous page.
+
+        :rtype: str or None
+        """
+        cursor = self.previous_cursor
+        if cursor is not None:
+            return cursor.encode()
+
+    def has_more_pages(self):
+        """
+        Determine if there are more items after the current page.
+
+        :rtype: bool
+        """
+        return self.next_cursor is not None
+
+    def has_pages(self):
+        """
+        Determine if there are enough items to split into multiple pages.
+
+        :rtype: bool
+        """
+        return self.has_more_pages() or self.previous_cursor is not None
+
+    def _cursor_for(self, item, points_to_next_items):
+        parameters = {}
+        for parameter in self.parameters:
+            if isinstance(item, (dict, list)):
+                parameters[parameter] = item[parameter]
+            else:
+                parameters[parameter] = getattr(item, parameter)
+
+        return Cursor(parameters, points_to_next_items)
+
+    def serialize(self):
+        """
+        Convert the object into something JSON serializable.
+
+        :rtype: list
+        """
+        return self._items.serialize()
+
+    def to_json(self, **options):
+        return self._items.to_json(**options)
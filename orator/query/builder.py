@@ -4,12 +4,14 @@ import re
 import copy
 import datetime
 
-from itertools import chain
+from itertools import chain, islice
 from collections import OrderedDict
 
 from .expression import QueryExpression
 from .join_clause import JoinClause
-from ..pagination import Paginator, LengthAwarePaginator
+from ..pagination import (
+    Paginator, LengthAwarePaginator, CursorPaginator, Cursor
+)
 from ..utils import Null
 from ..exceptions import ArgumentError
 from ..support import Collection
@@ -26,6 +28,18 @@ class QueryBuilder:
         'not similar to',
     ]
 
+    # The attributes the SQL of a select statement depends on
+    _structure = [
+        'aggregate_', 'columns', 'distinct_', 'from__', 'joins', 'wheres',
+        'groups', 'havings', 'orders', 'limit_', 'offset_', 'unions',
+        'union_limit', 'union_offset', 'union_orders', 'lock_'
+    ]
+
+    # Marker standing for a bound value in fingerprints
+    _parameter = object()
+
+    _scalars = {str, int, float, bool, type(None)}
+
     def __init__(self, connection, grammar, processor):
         """
         Constructor
@@ -589,6 +603,68 @@ class QueryBuilder:
     def or_where_not_in(self, column, values):
         return self.where_not_in(column, values, 'or')
 
+    def where_any(self, column, values, boolean='and', negate=False):
+        """
+        Add a where in clause binding the values as a single array,
+        when the database supports it.
+
+        The statement stays the same whatever the number of values,
+        other databases fall back to a regular where in clause.
+
+        :param column: The column
+        :type column: str
+
+        :param values: The values
+        :type values: list
+
+        :type boolean: str
+
+        :type negate: bool
+
+        :rtype: QueryBuilder
+        """
+        if isinstance(values, Collection):
+            values = values.all()
+
+        if not values or not self._grammar.supports_array_bindings():
+            return self.where_in(column, values, boolean, negate)
+
+        if negate:
+            type = 'not_any'
+        else:
+            type = 'any'
+
+        self.wheres.append({
+            'type': type,
+            'column': column,
+            'boolean': boolean
+        })
+
+        self.add_binding([list(values)], 'where')
+
+        return self
+
+    def where_not_any(self, column, values, boolean='and'):
+        return self.where_any(column, values, boolean, True)
+
+    def matches_nothing(self):
+        """
+        Determine if the where clauses cannot match any record,
+        because one of them is an empty where in clause
+        and they are all joined by "and".
+
+        :rtype: bool
+        """
+        if self.unions:
+            return False
+
+        for where in self.wheres[1:]:
+            if where['boolean'].lower() != 'and':
+                return False
+
+        return any(where['type'] == 'in' and not where['values']
+                   for where in self.wheres)
+
     def _where_in_sub(self, column, query, boolean, negate=False):
         """
         Add a where in with a sub select to the query
@@ -923,6 +999,119 @@ class QueryBuilder:
     def for_page(self, page, per_page=15):
         return self.skip((page - 1) * per_page).take(per_page)
 
+    def for_page_after_id(self, per_page=15, last_id=None, column='id'):
+        """
+        Constrain the query to the next "page" of results after a given ID.
+
+        :param per_page: The number of records per page
+        :type per_page: int
+
+        :param last_id: The last ID of the previous page
+        :type last_id: mixed
+
+        :param column: The ID column
+        :type column: str
+
+        :return: The current QueryBuilder instance
+        :rtype: QueryBuilder
+        """
+        self.orders = list(filter(lambda order: order.get('column') != column,
+                                  self.orders))
+
+        if last_id is not None:
+            self.where(column, '>', last_id)
+
+        return self.order_by(column, 'asc').limit(per_page)
+
+    def for_cursor_page(self, cursor, per_page=15):
+        """
+        Constrain the query to the page following
+        or preceding a pagination cursor.
+
+        :param cursor: The pagination cursor
+        :type cursor: Cursor or None
+
+        :param per_page: The number of records per page
+        :type per_page: int
+
+        :return: The current QueryBuilder instance
+        :rtype: QueryBuilder
+        """
+        if not self.orders:
+            self.order_by('id')
+
+        for order in self.orders:
+            if 'column' not in order \
+                    or isinstance(order['column'], QueryExpression):
+                raise ArgumentError(
+                    'Cursor pagination only supports ordering by columns')
+
+        if cursor is not None:
+            self._where_cursor(cursor)
+
+            # Previous items are fetched by reversing the order,
+            # the paginator will put them back in the right order.
+            if cursor.points_to_previous_items():
+                self.orders = [
+                    dict(order, direction='desc'
+                         if order['direction'] == 'asc' else 'asc')
+                    for order in self.orders
+                ]
+
+        return self.limit(per_page + 1)
+
+    def _where_cursor(self, cursor):
+        """
+        Add the clauses selecting the rows after or before a cursor.
+
+        For orders on (a, b), the rows after (x, y) are
+        a > x OR (a = x AND b > y).
+        """
+        clauses = []
+
+        for i, order in enumerate(self.orders):
+            clause = self.for_nested_where()
+
+            for previous in self.orders[:i]:
+                clause.where(previous['column'], '=',
+                             cursor.parameter(
+                                 self._get_cursor_parameter(previous)))
+
+            if (order['direction'] == 'asc') \
+                    == cursor.points_to_next_items():
+                operator = '>'
+            else:
+                operator = '<'
+
+            clause.where(order['column'], operator,
+                         cursor.parameter(self._get_cursor_parameter(order)))
+
+            clauses.append(clause)
+
+        if len(clauses) == 1:
+            self.merge_wheres(clauses[0].wheres,
+                              clauses[0].get_raw_bindings()['where'])
+
+            return self
+
+        nested = self.for_nested_where()
+        for clause in clauses:
+            nested.or_where(clause)
+
+        return self.where_nested(nested)
+
+    def _get_cursor_parameter(self, order):
+        return order['column'].split('.')[-1]
+
+    def get_cursor_parameters(self):
+        """
+        Get the names of the columns identifying a row
+        in a cursor pagination.
+
+        :rtype: list
+        """
+        return [self._get_cursor_parameter(order) for order in self.orders]
+
     def union(self, query, all=False):
         """
         Add a union statement to the query
@@ -996,6 +1185,80 @@ class QueryBuilder:
         """
         return self._grammar.compile_select(self)
 
+    def get_fingerprint(self):
+        """
+        Get the structure of the query without the values of its bindings.
+
+        Queries with the same fingerprint compile to the same SQL.
+
+        :rtype: tuple
+        """
+        fingerprint = self._fingerprint
+
+        return tuple([fingerprint(getattr(self, attribute))
+                      for attribute in self._structure])
+
+    def _fingerprint(self, value):
+        """
+        Get the fingerprint of a part of the query.
+
+        :param value: The part of the query
+        :type value: mixed
+        """
+        type_ = type(value)
+
+        if type_ in self._scalars:
+            return value
+
+        if type_ is list or type_ is tuple:
+            fingerprint = self._fingerprint
+
+            return tuple([fingerprint(v) for v in value])
+
+        if type_ is dict:
+            fingerprint = []
+
+            for key, v in value.items():
+                if key == 'value' or key == 'values':
+                    # Bound values are not part of the SQL,
+                    # but expressions are.
+                    v = self._bound_fingerprint(v)
+                elif type(v) not in self._scalars:
+                    v = self._fingerprint(v)
+
+                fingerprint.append((key, v))
+
+            return tuple(fingerprint)
+
+        if isinstance(value, QueryExpression):
+            return QueryExpression, value.get_value()
+
+        if isinstance(value, QueryBuilder):
+            return value.get_fingerprint()
+
+        if isinstance(value, JoinClause):
+            return (JoinClause, value.type, self._fingerprint(value.table),
+                    tuple([(self._fingerprint(clause['first']),
+                            clause['operator'],
+                            # Join wheres always use a marker
+                            self._parameter if clause['where']
+                            else self._fingerprint(clause['second']),
+                            clause['boolean'])
+                           for clause in value.clauses]))
+
+        return value
+
+    def _bound_fingerprint(self, value):
+        type_ = type(value)
+
+        if type_ is list or type_ is tuple:
+            return tuple([self._bound_fingerprint(v) for v in value])
+
+        if isinstance(value, QueryExpression):
+            return QueryExpression, value.get_value()
+
+        return self._parameter
+
     def find(self, id, columns=None):
         """
         Execute a query for a single record by id
@@ -1138,6 +1401,36 @@ class QueryBuilder:
 
         return Paginator(self.get(columns), per_page, page)
 
+    def cursor_paginate(self, per_page=15, cursor=None, columns=None):
+        """
+        Paginate the given query using a cursor.
+
+        Unlike paginate(), it does not count the records and uses
+        the order by columns rather than an offset to find the page,
+        so that deep pages are as fast as the first ones.
+
+        :param per_page: The number of records per page
+        :type per_page: int
+
+        :param cursor: The cursor of the page, encoded or not
+        :type cursor: str or Cursor or None
+
+        :param columns: The columns to return
+        :type columns: list
+
+        :return: The paginator
+        :rtype: CursorPaginator
+        """
+        if columns is None:
+            columns = ['*']
+
+        cursor = Cursor.decode(cursor)
+
+        self.for_cursor_page(cursor, per_page)
+
+        return CursorPaginator(self.get(columns), per_page, cursor,
+                               self.get_cursor_parameters())
+
     def get_count_for_pagination(self):
         self._backup_fields_for_count()
 
@@ -1159,13 +1452,17 @@ class QueryBuilder:
 
         self._backups = {}
 
-    def chunk(self, count):
+    def chunk(self, count, server_side=None):
         """
         Chunk the results of the query
 
         :param count: The chunk size
         :type count: int
 
+        :param server_side: Whether to use a server-side cursor,
+                            defaults to the "server_side_cursors" option
+        :type server_side: bool or None
+
         :return: The current chunk
         :rtype: list
         """
@@ -1173,10 +1470,51 @@ class QueryBuilder:
             count,
             self.to_sql(),
             self.get_bindings(),
-            not self._use_write_connection
+            not self._use_write_connection,
+            server_side=server_side
         ):
             yield chunk
 
+    def chunk_by_id(self, count, column='id', alias=None):
+        """
+        Chunk the results of the query by comparing IDs.
+
+        Each chunk is fetched with its own query, starting after the
+        last ID of the previous chunk, so that the records can be
+        modified while iterating and deep chunks stay fast.
+
+        :param count: The chunk size
+        :type count: int
+
+        :param column: The ID column
+        :type column: str
+
+        :param alias: The ID key in the results, if different from the column
+        :type alias: str
+
+        :return: The current chunk
+        :rtype: list
+        """
+        if alias is None:
+            alias = column.split('.')[-1]
+
+        last_id = None
+
+        while True:
+            clone = copy.copy(self)
+
+            results = clone.for_page_after_id(count, last_id, column).get()
+
+            if not results:
+                break
+
+            yield results
+
+            if len(results) < count:
+                break
+
+            last_id = results[-1][alias]
+
     def lists(self, column, key=None):
         """
         Get a list with the values of a given column
@@ -1399,6 +1737,237 @@ class QueryBuilder:
 
         return self._connection.insert(sql, bindings)
 
+    def insert_many(self, rows, batch_size=None):
+        """
+        Insert several records into the database in batches.
+
+        The rows are split in batches fitting in the parameters limit
+        of the database and each batch size is compiled only once.
+        Every row must have the same columns and the values are always bound.
+
+        :param rows: The records to insert
+        :type rows: list or iterable of dict
+
+        :param batch_size: The number of rows per batch
+        :type batch_size: int or None
+
+        :return: The number of records inserted
+        :rtype: int
+        """
+        rows = iter(rows)
+
+        first = next(rows, None)
+        if first is None:
+            return 0
+
+        columns = sorted(first.keys())
+        executemany = self._grammar.inserts_with_executemany()
+        batch_size = self._grammar.get_insert_batch_size(
+            len(columns), batch_size)
+
+        rows = chain([first], rows)
+        statements = {}
+        inserted = 0
+
+        for batch in self._get_insert_batches(rows, columns, batch_size):
+            count = 1 if executemany else len(batch)
+
+            sql = statements.get(count)
+            if sql is None:
+                sql = self._grammar.compile_insert_many(self, columns, count)
+
+                statements[count] = sql
+
+            if executemany:
+                inserted += self._connection.insert_many(sql, batch)
+            else:
+                inserted += self._connection.affecting_statement(
+                    sql, list(chain.from_iterable(batch)))
+
+        return inserted
+
+    def insert_many_get_ids(self, rows, sequence=None, batch_size=None):
+        """
+        Insert several records with multi-row statements
+        and get the values of their primary keys.
+
+        Except on PostgreSQL, the keys are derived from the last inserted id,
+        so the records must not set their primary key.
+
+        :param rows: The records to insert
+        :type rows: list of dict
+
+        :param sequence: The name of the primary key
+        :type sequence: str
+
+        :param batch_size: The number of rows per statement
+        :type batch_size: int or None
+
+        :return: The primary keys, in the order of the rows
+        :rtype: list
+        """
+        if not rows:
+            return []
+
+        columns = sorted(rows[0].keys())
+        batch_size = self._grammar.get_insert_batch_size(
+            len(columns), batch_size, multi_row=True)
+
+        statements = {}
+        ids = []
+
+        for batch in self._get_insert_batches(iter(rows), columns, batch_size):
+            count = len(batch)
+
+            sql = statements.get(count)
+            if sql is None:
+                sql = self._grammar.compile_insert_many_get_ids(
+                    self, columns, count, sequence)
+
+                statements[count] = sql
+
+            ids += self._processor.process_insert_many_get_ids(
+                self, sql, list(chain.from_iterable(batch)), count, sequence)
+
+        return ids
+
+    def upsert(self, values, unique_by, update=None, batch_size=None):
+        """
+        Insert records, or update them if they already exist,
+        in a single statement per batch.
+
+        :param values: The records to insert
+        :type values: dict or list or iterable of dict
+
+        :param unique_by: The columns identifying existing records
+        :type unique_by: str or list
+
+        :param update: The columns to update when a record exists:
+                       a list of columns updated with the inserted values
+                       or a dict of values. Defaults to every inserted column
+                       but the unique ones. An empty list leaves existing
+                       records untouched.
+        :type update: list or dict or None
+
+        :param batch_size: The number of rows per statement
+        :type batch_size: int or None
+
+        :return: The number of records affected
+        :rtype: int
+        """
+        if isinstance(values, dict):
+            values = [values]
+
+        if not isinstance(unique_by, (list, tuple)):
+            unique_by = [unique_by]
+
+        rows = iter(values)
+
+        first = next(rows, None)
+        if first is None:
+            return 0
+
+        columns = sorted(first.keys())
+
+        update_values = None
+        if update is None:
+            update = [c for c in columns if c not in unique_by]
+        elif isinstance(update, dict):
+            update_values = OrderedDict(sorted(update.items()))
+            update = []
+
+        update_bindings = self._clean_bindings(
+            (update_values or {}).values())
+
+        batch_size = self._grammar.get_insert_batch_size(
+            len(columns), batch_size, multi_row=True)
+
+        rows = chain([first], rows)
+        statements = {}
+        affected = 0
+
+        for batch in self._get_insert_batches(rows, columns, batch_size):
+            count = len(batch)
+
+            sql = statements.get(count)
+            if sql is None:
+                sql = self._grammar.compile_upsert(
+                    self, columns, count, unique_by, update, update_values)
+
+                statements[count] = sql
+
+            bindings = list(chain.from_iterable(batch)) + update_bindings
+
+            affected += self._connection.affecting_statement(sql, bindings)
+
+        return affected
+
+    def _get_insert_batches(self, rows, columns, batch_size):
+        while True:
+            batch = [self._get_insert_values(row, columns)
+                     for row in islice(rows, batch_size)]
+
+            if not batch:
+                return
+
+            yield batch
+
+    def _get_insert_values(self, row, columns):
+        if len(row) != len(columns):
+            raise ArgumentError('All the inserted rows must have '
+                                'the same columns')
+
+        try:
+            return [row[column] for column in columns]
+        except KeyError:
+            raise ArgumentError('All the inserted rows must have '
+                                'the same columns')
+
+    def copy_from(self, rows, columns=None, format='text'):
+        """
+        Load rows into the table with COPY (PostgreSQL only).
+
+        :param rows: The rows, as dicts or sequences, or a file-like object
+        :type rows: iterable or file
+
+        :param columns: The columns of the rows
+        :type columns: list or None
+
+        :param format: The format of a file-like object
+        :type format: str
+
+        :return: The number of rows loaded
+        :rtype: int
+        """
+        self._ensure_copy_is_supported()
+
+        return self._connection.copy_from(self.from__, rows, columns, format)
+
+    def copy_to(self, file, format='csv', header=False):
+        """
+        Export the results of the query with COPY (PostgreSQL only).
+
+        :param file: The file-like object receiving the data
+        :type file: file
+
+        :param format: The export format (csv, text or binary)
+        :type format: str
+
+        :param header: Whether to include a header line in csv format
+        :type header: bool
+
+        :return: The number of rows exported
+        :rtype: int
+        """
+        self._ensure_copy_is_supported()
+
+        return self._connection.copy_to(self, file, format, header)
+
+    def _ensure_copy_is_supported(self):
+        if not hasattr(self._connection, 'copy_to'):
+            raise ArgumentError('COPY is only supported by PostgreSQL '
+                                'connections')
+
     def insert_get_id(self, values, sequence=None):
         """
         Insert a new record and get the value of the primary key
@@ -1442,6 +2011,68 @@ class QueryBuilder:
 
         return self._connection.update(sql, self._clean_bindings(bindings))
 
+    def update_many(self, values, key='id', batch_size=None):
+        """
+        Update several records with different values
+        in a single statement per batch.
+
+        The records sharing the same updated columns are grouped,
+        and the values are always bound.
+
+        :param values: The values of each record, including its key
+        :type values: list of dict
+
+        :param key: The column identifying the records
+        :type key: str
+
+        :param batch_size: The number of records per statement
+        :type batch_size: int or None
+
+        :return: The number of records affected
+        :rtype: int
+        """
+        if self.joins:
+            raise ArgumentError('update_many() does not support joins')
+
+        groups = OrderedDict()
+
+        for row in values:
+            if key not in row:
+                raise ArgumentError('Every updated record must have '
+                                    'a value for the [%s] key' % key)
+
+            columns = tuple(sorted(c for c in row if c != key))
+            if not columns:
+                continue
+
+            groups.setdefault(columns, []).append(
+                [row[key]] + [row[column] for column in columns])
+
+        affected = 0
+
+        for columns, rows in groups.items():
+            size = self._grammar.get_insert_batch_size(
+                self._grammar.get_update_many_parameters(len(columns)),
+                batch_size, multi_row=True)
+
+            statements = {}
+            for i in range(0, len(rows), size):
+                batch = rows[i:i + size]
+
+                sql = statements.get(len(batch))
+                if sql is None:
+                    sql = self._grammar.compile_update_many(
+                        self, key, columns, len(batch))
+
+                    statements[len(batch)] = sql
+
+                bindings = self._grammar.get_update_many_bindings(batch)
+
+                affected += self._connection.update(
+                    sql, bindings + self.get_bindings())
+
+        return affected
+
     def increment(self, column, amount=1, extras=None):
         """
         Increment a column's value by a given amount
@@ -1695,3 +2326,8 @@ class QueryBuilder:
                                  if k != '_connection'))
 
         return new
+
+    def __deepcopy__(self, memo):
+        # Subqueries, like the ones of "exists" clauses,
+        # share the connection of the copied query.
+        return self.__copy__()
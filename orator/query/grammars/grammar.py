@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import re
+from collections import OrderedDict
 from ...support.grammar import Grammar
+from ...utils.lru_cache import LRUCache
 
 
 class QueryGrammar(Grammar):
@@ -21,12 +23,72 @@ class QueryGrammar(Grammar):
         'lock_'
     ]
 
+    # The maximum number of parameters a statement can bind
+    _max_parameters = 65535
+
+    # The number of rows inserted per statement by insert_many()
+    _insert_batch_size = 1000
+
+    # Whether the driver inserts several rows faster with executemany()
+    # than with a multi-row insert statement
+    _executemany_inserts = False
+
+    # Whether a list can be bound as a single array parameter
+    _array_bindings = False
+
+    def __init__(self, marker=None, compiled_cache_size=512):
+        """
+        :param marker: The parameter marker
+        :type marker: str
+
+        :param compiled_cache_size: The number of compiled select statements
+                                    to keep, 0 disables the cache
+        :type compiled_cache_size: int
+        """
+        super().__init__(marker)
+
+        self._compiled_cache = None
+        if compiled_cache_size:
+            self._compiled_cache = LRUCache(compiled_cache_size)
+
     def compile_select(self, query):
         if not query.columns:
             query.columns = ['*']
 
+        if self._compiled_cache is None:
+            return self._compile_select(query)
+
+        # Queries with the same structure compile to the same SQL,
+        # so we only compile the shapes we have not seen recently.
+        key = (self._table_prefix, self.marker, query.get_fingerprint())
+
+        try:
+            sql = self._compiled_cache.get(key)
+        except TypeError:
+            # Some part of the query cannot be hashed
+            return self._compile_select(query)
+
+        if sql is None:
+            sql = self._compile_select(query)
+
+            self._compiled_cache.put(key, sql)
+        elif query.joins:
+            # Compiling the joins sets the join bindings
+            self._set_join_bindings(query, query.joins)
+
+        return sql
+
+    def _compile_select(self, query):
         return self._concatenate(self._compile_components(query)).strip()
 
+    def get_compiled_cache(self):
+        """
+        Get the cache of the compiled select statements.
+
+        :rtype: orator.utils.lru_cache.LRUCache or None
+        """
+        return self._compiled_cache
+
     def _compile_components(self, query):
         sql = {}
 
@@ -74,7 +136,7 @@ class QueryGrammar(Grammar):
     def _compile_joins(self, query, joins):
         sql = []
 
-        query.set_bindings([], 'join')
+        self._set_join_bindings(query, joins)
 
         for join in joins:
             table = self.wrap_table(join.table)
@@ -89,9 +151,6 @@ class QueryGrammar(Grammar):
             for clause in join.clauses:
                 clauses.append(self._compile_join_constraints(clause))
 
-            for binding in join.bindings:
-                query.add_binding(binding, 'join')
-
             # Once we have constructed the clauses,
             # we'll need to take the boolean connector
             # off of the first clause as it obviously will not be required
@@ -114,6 +173,13 @@ class QueryGrammar(Grammar):
 
         return ' '.join(sql)
 
+    def _set_join_bindings(self, query, joins):
+        query.set_bindings([], 'join')
+
+        for join in joins:
+            for binding in join.bindings:
+                query.add_binding(binding, 'join')
+
     def _compile_join_constraints(self, clause):
         first = self.wrap(clause['first'])
 
@@ -364,6 +430,152 @@ class QueryGrammar(Grammar):
     def compile_insert_get_id(self, query, values, sequence):
         return self.compile_insert(query, values)
 
+    def compile_insert_many(self, query, columns, count=1):
+        """
+        Compile an insert statement of several rows
+        whose values are all bound.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param columns: The columns to insert
+        :type columns: list
+
+        :param count: The number of rows inserted by the statement
+        :type count: int
+
+        :return: The compiled statement
+        :rtype: str
+        """
+        return self.compile_insert(
+            query, [OrderedDict.fromkeys(columns)] * count)
+
+    def compile_insert_many_get_ids(self, query, columns, count,
+                                    sequence=None):
+        """
+        Compile an insert statement of several rows
+        returning their primary keys.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param columns: The columns to insert
+        :type columns: list
+
+        :param count: The number of rows inserted by the statement
+        :type count: int
+
+        :param sequence: The name of the primary key
+        :type sequence: str
+
+        :return: The compiled statement
+        :rtype: str
+        """
+        return self.compile_insert_many(query, columns, count)
+
+    def compile_upsert(self, query, columns, count, unique_by,
+                       update_columns, update_values=None):
+        """
+        Compile an insert statement of several rows updating
+        the existing records matching the unique columns.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param columns: The columns to insert
+        :type columns: list
+
+        :param count: The number of rows inserted by the statement
+        :type count: int
+
+        :param unique_by: The columns identifying existing records
+        :type unique_by: list
+
+        :param update_columns: The columns updated with the inserted values
+        :type update_columns: list
+
+        :param update_values: The columns updated with other values
+        :type update_values: OrderedDict or None
+
+        :return: The compiled statement
+        :rtype: str
+        """
+        sql = '%s ON CONFLICT (%s)' % (
+            self._compile_insert_values(query, columns, count),
+            self.columnize(unique_by)
+        )
+
+        update = self._compile_upsert_updates(
+            update_columns, update_values,
+            lambda column: 'excluded.%s' % self.wrap(column))
+
+        if not update:
+            return '%s DO NOTHING' % sql
+
+        return '%s DO UPDATE SET %s' % (sql, update)
+
+    def _compile_upsert_updates(self, update_columns, update_values,
+                                inserted_value):
+        columns = []
+        for column in update_columns:
+            columns.append('%s = %s'
+                           % (self.wrap(column), inserted_value(column)))
+
+        for column, value in (update_values or {}).items():
+            columns.append('%s = %s'
+                           % (self.wrap(column), self.parameter(value)))
+
+        return ', '.join(columns)
+
+    def _compile_insert_values(self, query, columns, count):
+        parameters = '(%s)' % ', '.join([self.get_marker()] * len(columns))
+
+        return 'INSERT INTO %s (%s) VALUES %s' % (
+            self.wrap_table(query.from__),
+            self.columnize(columns),
+            ', '.join([parameters] * count)
+        )
+
+    def get_insert_batch_size(self, columns_count, batch_size=None,
+                              multi_row=None):
+        """
+        Get the number of rows to insert per statement.
+
+        :param columns_count: The number of parameters of each row
+        :type columns_count: int
+
+        :param batch_size: The requested number of rows
+        :type batch_size: int or None
+
+        :param multi_row: Whether the rows are inserted by multi-row
+                          statements, defaults to the driver preference
+        :type multi_row: bool or None
+
+        :rtype: int
+        """
+        if batch_size is None:
+            batch_size = self._insert_batch_size
+
+        if multi_row is None:
+            multi_row = not self._executemany_inserts
+
+        # With executemany() each row is bound separately,
+        # so only multi-row statements are bound by the parameters limit.
+        if multi_row:
+            batch_size = min(batch_size,
+                             self._max_parameters // max(columns_count, 1))
+
+        return max(batch_size, 1)
+
+    def inserts_with_executemany(self):
+        return self._executemany_inserts
+
+    def get_max_parameters(self):
+        return self._max_parameters
+
+    def supports_array_bindings(self):
+        return self._array_bindings
+
     def compile_update(self, query, values):
         table = self.wrap_table(query.from__)
 
@@ -398,6 +610,84 @@ class QueryGrammar(Grammar):
         return ('UPDATE %s%s SET %s %s' %
                 (table, joins, columns, where)).strip()
 
+    def compile_update_many(self, query, key, columns, count):
+        """
+        Compile an update statement setting different values
+        on several records identified by their key.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param key: The key column
+        :type key: str
+
+        :param columns: The updated columns
+        :type columns: list
+
+        :param count: The number of records updated by the statement
+        :type count: int
+
+        :return: The compiled statement
+        :rtype: str
+        """
+        marker = self.get_marker()
+        key = self.wrap(key)
+
+        cases = ' '.join(['WHEN %s THEN %s' % (marker, marker)] * count)
+
+        sets = []
+        for column in columns:
+            column = self.wrap(column)
+
+            sets.append('%s = CASE %s %s ELSE %s END'
+                        % (column, key, cases, column))
+
+        where = '%s IN (%s)' % (key, ', '.join([marker] * count))
+
+        return 'UPDATE %s SET %s %s' % (
+            self.wrap_table(query.from__),
+            ', '.join(sets),
+            self._compile_update_many_wheres(query, where)
+        )
+
+    def _compile_update_many_wheres(self, query, where):
+        wheres = self._compile_wheres(query)
+        if wheres:
+            return 'WHERE %s AND (%s)' % (where, wheres[6:])
+
+        return 'WHERE %s' % where
+
+    def get_update_many_bindings(self, rows):
+        """
+        Get the bindings of an update_many statement.
+
+        :param rows: The key value followed by the column values of each row
+        :type rows: list
+
+        :rtype: list
+        """
+        bindings = []
+
+        for i in range(1, len(rows[0])):
+            for row in rows:
+                bindings.append(row[0])
+                bindings.append(row[i])
+
+        bindings += [row[0] for row in rows]
+
+        return bindings
+
+    def get_update_many_parameters(self, columns_count):
+        """
+        Get the number of parameters bound per updated record.
+
+        :param columns_count: The number of updated columns
+        :type columns_count: int
+
+        :rtype: int
+        """
+        return columns_count * 2 + 1
+
     def compile_delete(self, query):
         table = self.wrap_table(query.from__)
 
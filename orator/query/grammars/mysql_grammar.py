@@ -21,7 +21,53 @@ class MySQLQueryGrammar(QueryGrammar):
 
     marker = '%s'
 
-    def compile_select(self, query):
+    # The MySQL drivers rewrite executemany() inserts into multi-row
+    # statements sized to fit in the max_allowed_packet limit
+    _executemany_inserts = True
+
+    def compile_upsert(self, query, columns, count, unique_by,
+                       update_columns, update_values=None):
+        """
+        Compile an insert statement of several rows updating
+        the existing records.
+
+        MySQL matches the existing records on every unique index
+        of the table, so the unique columns are not part of the statement.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param columns: The columns to insert
+        :type columns: list
+
+        :param count: The number of rows inserted by the statement
+        :type count: int
+
+        :param unique_by: The columns identifying existing records
+        :type unique_by: list
+
+        :param update_columns: The columns updated with the inserted values
+        :type update_columns: list
+
+        :param update_values: The columns updated with other values
+        :type update_values: OrderedDict or None
+
+        :return: The compiled statement
+        :rtype: str
+        """
+        update = self._compile_upsert_updates(
+            update_columns, update_values,
+            lambda column: 'VALUES(%s)' % self.wrap(column))
+
+        if not update:
+            # Leave the existing records untouched
+            column = self.wrap(unique_by[0])
+            update = '%s = %s' % (column, column)
+
+        return '%s ON DUPLICATE KEY UPDATE %s' % (
+            self._compile_insert_values(query, columns, count), update)
+
+    def _compile_select(self, query):
         """
         Compile a select query into SQL
 
@@ -31,7 +77,7 @@ class MySQLQueryGrammar(QueryGrammar):
         :return: The compiled sql
         :rtype: str
         """
-        sql = super().compile_select(query)
+        sql = super()._compile_select(query)
 
         if query.unions:
             sql = '(%s) %s' % (sql, self._compile_unions(query))
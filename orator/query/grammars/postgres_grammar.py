@@ -13,6 +13,21 @@ class PostgresQueryGrammar(QueryGrammar):
 
     marker = '%s'
 
+    # psycopg2 runs executemany() as one query per row,
+    # so rows are inserted with multi-row statements instead.
+    # The protocol limits the number of parameters to 65535.
+    _max_parameters = 65535
+
+    # psycopg2 adapts lists to arrays
+    _array_bindings = True
+
+    def _where_any(self, query, where):
+        return '%s = ANY(%s)' % (self.wrap(where['column']), self.get_marker())
+
+    def _where_not_any(self, query, where):
+        return '%s <> ALL(%s)' % (
+            self.wrap(where['column']), self.get_marker())
+
     def _compile_lock(self, query, value):
         """
         Compile the lock into SQL
@@ -58,6 +73,64 @@ class PostgresQueryGrammar(QueryGrammar):
         return ('UPDATE %s SET %s%s %s' %
                 (table, columns, from_, where)).strip()
 
+    def compile_update_many(self, query, key, columns, count):
+        """
+        Compile an update statement setting different values
+        on several records identified by their key.
+
+        The values are joined as a VALUES list whose types
+        are given by an empty select of the table.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param key: The key column
+        :type key: str
+
+        :param columns: The updated columns
+        :type columns: list
+
+        :param count: The number of records updated by the statement
+        :type count: int
+
+        :return: The compiled statement
+        :rtype: str
+        """
+        table = self.wrap_table(query.from__)
+        values = self.wrap('orator_values')
+
+        # The values columns are aliased so that they cannot be
+        # mistaken for the table columns in the where clauses.
+        aliases = [self.wrap('orator_%d' % i)
+                   for i in range(len(columns) + 1)]
+
+        sets = []
+        for column, alias in zip(columns, aliases[1:]):
+            sets.append('%s = %s.%s' % (self.wrap(column), values, alias))
+
+        parameters = '(%s)' % ', '.join(
+            [self.get_marker()] * (len(columns) + 1))
+
+        from_ = '(SELECT %s FROM %s WHERE false UNION ALL VALUES %s) ' \
+                'AS %s (%s)' % (
+                    self.columnize([key] + list(columns)), table,
+                    ', '.join([parameters] * count),
+                    values, ', '.join(aliases)
+                )
+
+        where = '%s = %s.%s' % (
+            self.wrap('%s.%s' % (query.from__, key)), values, aliases[0])
+
+        return 'UPDATE %s SET %s FROM %s %s' % (
+            table, ', '.join(sets), from_,
+            self._compile_update_many_wheres(query, where))
+
+    def get_update_many_bindings(self, rows):
+        return [value for row in rows for value in row]
+
+    def get_update_many_parameters(self, columns_count):
+        return columns_count + 1
+
     def _compile_update_columns(self, values):
         """
         Compile the columns for the update statement
@@ -160,6 +233,34 @@ class PostgresQueryGrammar(QueryGrammar):
         return '%s RETURNING %s'\
                % (self.compile_insert(query, values), self.wrap(sequence))
 
+    def compile_insert_many_get_ids(self, query, columns, count,
+                                    sequence=None):
+        """
+        Compile an insert statement of several rows
+        returning their primary keys.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param columns: The columns to insert
+        :type columns: list
+
+        :param count: The number of rows inserted by the statement
+        :type count: int
+
+        :param sequence: The name of the primary key
+        :type sequence: str
+
+        :return: The compiled statement
+        :rtype: str
+        """
+        if sequence is None:
+            sequence = 'id'
+
+        return '%s RETURNING %s' % (
+            self.compile_insert_many(query, columns, count),
+            self.wrap(sequence))
+
     def compile_truncate(self, query):
         """
         Compile a truncate table statement into SQL.
@@ -11,6 +11,12 @@ class SQLiteQueryGrammar(QueryGrammar):
         '&', '|', '<<', '>>',
     ]
 
+    # The default SQLITE_MAX_VARIABLE_NUMBER of SQLite before 3.32
+    _max_parameters = 999
+
+    # The sqlite3 module reuses the compiled statement for every row
+    _executemany_inserts = True
+
     def compile_insert(self, query, values):
         """
         Compile insert statement into SQL
@@ -52,6 +52,51 @@ class MySQLQueryProcessor(QueryProcessor):
 
         return id
 
+    def process_insert_many_get_ids(self, query, sql, values, count,
+                                    sequence=None):
+        """
+        Process an "insert get IDs" query of several rows.
+
+        MySQL gives the id of the first inserted row. The ids of the rows
+        of a multi-row statement are assumed to follow each other,
+        separated by the auto_increment_increment setting: this is the case
+        unless the rows set their id, or, with innodb_autoinc_lock_mode 2,
+        if INSERT ... SELECT or LOAD DATA statements run concurrently.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param sql: The sql query to execute
+        :type sql: str
+
+        :param values: The value bindings
+        :type values: list
+
+        :param count: The number of inserted rows
+        :type count: int
+
+        :param sequence: The ids sequence
+        :type sequence: str
+
+        :return: The inserted rows ids
+        :rtype: list
+        """
+        connection = query.get_connection()
+
+        connection.insert(sql, values)
+
+        first = int(connection.get_cursor().lastrowid)
+
+        if count == 1:
+            return [first]
+
+        # Replicated setups, like Galera or multi-primary clusters,
+        # space the ids out by their number of servers.
+        step = connection.select(
+            'SELECT @@auto_increment_increment AS step', [], False)[0]['step']
+
+        return list(range(first, first + count * int(step), int(step)))
+
     def process_column_listing(self, results):
         """
         Process the results of a column listing query
@@ -37,6 +37,34 @@ class PostgresQueryProcessor(QueryProcessor):
 
         return id
 
+    def process_insert_many_get_ids(self, query, sql, values, count,
+                                    sequence=None):
+        """
+        Process an "insert get IDs" query of several rows.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param sql: The sql query to execute
+        :type sql: str
+
+        :param values: The value bindings
+        :type values: list
+
+        :param count: The number of inserted rows
+        :type count: int
+
+        :param sequence: The ids sequence
+        :type sequence: str
+
+        :return: The inserted rows ids
+        :rtype: list
+        """
+        results = query.get_connection().\
+            select_from_write_connection(sql, values)
+
+        return [result[0] for result in results]
+
     def process_column_listing(self, results):
         """
         Process the results of a column listing query
@@ -49,6 +49,40 @@ class QueryProcessor:
 
         return id
 
+    def process_insert_many_get_ids(self, query, sql, values, count,
+                                    sequence=None):
+        """
+        Process an "insert get IDs" query of several rows.
+
+        The last inserted row id is the one of the last row.
+        The rows of a statement are assumed to get consecutive ids,
+        as SQLite does for rows not setting their id,
+        since a single statement writes to the database at a time.
+
+        :param query: A QueryBuilder instance
+        :type query: QueryBuilder
+
+        :param sql: The sql query to execute
+        :type sql: str
+
+        :param values: The value bindings
+        :type values: list
+
+        :param count: The number of inserted rows
+        :type count: int
+
+        :param sequence: The ids sequence
+        :type sequence: str
+
+        :return: The inserted rows ids
+        :rtype: list
+        """
+        query.get_connection().insert(sql, values)
+
+        last = int(query.get_connection().get_cursor().lastrowid)
+
+        return list(range(last - count + 1, last + 1))
+
     def process_column_listing(self, results):
         """
         Process the results of a column listing query
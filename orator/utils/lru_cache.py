@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A thread-safe, bounded cache discarding
+    the least recently used entries first.
+    """
+
+    def __init__(self, max_size=512, on_evict=None):
+        """
+        :param max_size: The maximum number of entries
+        :type max_size: int
+
+        :param on_evict: A callable receiving the key and the value
+                         of the entries discarded to make room
+        :type on_evict: callable or None
+        """
+        self._max_size = max_size
+        self._on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """
+        Get an entry and mark it as recently used.
+
+        :param key: The entry key
+        :type key: hashable
+
+        :param default: The value returned for a missing entry
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return value
+
+    def put(self, key, value):
+        """
+        Add an entry, discarding the least recently used one if full.
+
+        :param key: The entry key
+        :type key: hashable
+
+        :param value: The entry value
+        """
+        evicted = []
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._max_size:
+                evicted.append(self._entries.popitem(last=False))
+
+        if self._on_evict is not None:
+            for key, value in evicted:
+                self._on_evict(key, value)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get the cache statistics.
+
+        :rtype: dict
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'max_size': self._max_size
+        }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __deepcopy__(self, memo):
+        # Objects holding a cache, like grammars, are copied along
+        # with query builders. The copies share the same cache.
+        return self
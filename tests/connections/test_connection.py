@@ -65,6 +65,55 @@ class ConnectionTestCase(OratorTestCase):
 
         connection.select('SELECT * FROM "users"')
 
+    def test_select_many_uses_server_side_cursors(self):
+        connector = flexmock()
+        cursor = flexmock()
+        connection = Connection(connector, 'database', '',
+                                {'server_side_cursors': {'itersize': 100}})
+
+        connector.should_receive('server_side_cursor').with_args(100)\
+            .once().and_return(cursor)
+        cursor.should_receive('execute').with_args('SELECT * FROM "users"', [])
+        cursor.should_receive('fetchmany').with_args(2)\
+            .and_return([1, 2]).and_return([3]).and_return([])
+        cursor.should_receive('close').once()
+
+        chunks = list(connection.select_many(2, 'SELECT * FROM "users"'))
+
+        self.assertEqual([[1, 2], [3]], chunks)
+
+    def test_select_many_server_side_cursors_can_be_disabled(self):
+        connector = flexmock()
+        cursor = flexmock()
+        connection = Connection(connector, 'database', '',
+                                {'server_side_cursors': True})
+
+        connector.should_receive('server_side_cursor').never()
+        connector.should_receive('cursor').once().and_return(cursor)
+        cursor.should_receive('execute')
+        cursor.should_receive('fetchmany').and_return([1]).and_return([])
+
+        chunks = list(connection.select_many(2, 'SELECT * FROM "users"',
+                                             server_side=False))
+
+        self.assertEqual([[1]], chunks)
+
+    def test_server_side_cursors_are_closed_when_iteration_stops(self):
+        connector = flexmock()
+        cursor = flexmock()
+        connection = Connection(connector, 'database')
+
+        connector.should_receive('cursor').never()
+        connector.should_receive('server_side_cursor').and_return(cursor)
+        cursor.should_receive('execute')
+        cursor.should_receive('fetchmany').and_return([1])
+        cursor.should_receive('close').once()
+
+        chunks = connection.select_many(1, 'SELECT * FROM "users"',
+                                        server_side=True)
+        next(chunks)
+        chunks.close()
+
     def test_prefix_set_to_none(self):
         connection = Connection(None, 'database', None)
         self.assertIsNotNone(connection.get_table_prefix())
@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 
+import itertools
+
+from flexmock import flexmock
+
 from .. import OratorTestCase
 
-from orator.connections.postgres_connection import PostgresConnection
+from orator.connections.postgres_connection import (
+    PostgresConnection, CopyStream
+)
 
 
 class PostgresConnectionTestCase(OratorTestCase):
@@ -21,3 +27,112 @@ class PostgresConnectionTestCase(OratorTestCase):
         connection = PostgresConnection(None, 'database', '', {'use_qmark': False})
 
         self.assertIsNone(connection.get_marker())
+
+    def test_prepared_statements(self):
+        connection = PostgresConnection(None, 'database', '', {'prepared_statements': True})
+        dbapi_connection = flexmock(prepared_statements=None)
+        plain_cursor = flexmock()
+        cursor = flexmock(connection=dbapi_connection)
+
+        dbapi_connection.should_receive('plain_cursor').and_return(plain_cursor)
+        plain_cursor.should_receive('execute')\
+            .with_args('PREPARE orator_1 AS SELECT * FROM "users" WHERE "id" = $1 AND "name" LIKE \'a%\'')\
+            .once()
+        cursor.should_receive('execute').with_args('EXECUTE orator_1 (%s)', [1]).once()
+        cursor.should_receive('execute').with_args('EXECUTE orator_1 (%s)', [2]).once()
+
+        PostgresConnection._statement_ids = itertools.count(1)
+        query = 'SELECT * FROM "users" WHERE "id" = %s AND "name" LIKE \'a%%\''
+        connection._execute(cursor, query, [1])
+        connection._execute(cursor, query, [2])
+
+        self.assertEqual(1, dbapi_connection.prepared_statements.hits)
+
+    def test_least_recently_used_prepared_statements_are_deallocated(self):
+        connection = PostgresConnection(None, 'database', '', {
+            'prepared_statements': {'max_size': 1}, 'use_qmark': True
+        })
+        dbapi_connection = flexmock(prepared_statements=None)
+        plain_cursor = flexmock()
+        cursor = flexmock(connection=dbapi_connection)
+
+        dbapi_connection.should_receive('plain_cursor').and_return(plain_cursor)
+        plain_cursor.should_receive('execute').with_args('PREPARE orator_1 AS DELETE FROM "users" WHERE "id" = $1').once()
+        plain_cursor.should_receive('execute').with_args('PREPARE orator_2 AS DELETE FROM "posts"').once()
+        plain_cursor.should_receive('execute').with_args('DEALLOCATE orator_1').once()
+        cursor.should_receive('execute').with_args('EXECUTE orator_1 (?)', [1]).once()
+        cursor.should_receive('execute').with_args('EXECUTE orator_2').once()
+
+        PostgresConnection._statement_ids = itertools.count(1)
+        connection._execute(cursor, 'DELETE FROM "users" WHERE "id" = ?', [1])
+        connection._execute(cursor, 'DELETE FROM "posts"', [])
+
+    def test_schema_statements_are_not_prepared(self):
+        connection = PostgresConnection(None, 'database', '', {'prepared_statements': True})
+        cursor = flexmock()
+        cursor.should_receive('execute').with_args('CREATE TABLE "users" ()', []).once()
+
+        connection._execute(cursor, 'CREATE TABLE "users" ()', [])
+
+    def test_prepared_statements_are_forgotten_on_lost_connection(self):
+        dbapi_connection = flexmock(prepared_statements=flexmock())
+        connection = flexmock(PostgresConnection(dbapi_connection, 'database', '', {'prepared_statements': True}))
+
+        dbapi_connection.prepared_statements.should_receive('clear').once()
+        connection.should_receive('reconnect').once()
+
+        callback = flexmock(call=lambda *args: True)
+        connection._try_again_if_caused_by_lost_connection(
+            Exception('server closed the connection unexpectedly'), 'SELECT 1', [], callback.call)
+
+    def test_copy_from_streams_rows(self):
+        dbapi_connection = flexmock()
+        cursor = flexmock(rowcount=2)
+        dbapi_connection.should_receive('cursor').and_return(cursor)
+        connection = PostgresConnection(dbapi_connection, 'database', '', {})
+
+        copied = {}
+
+        def copy_expert(query, file):
+            copied['query'] = query
+            copied['data'] = ''.join(iter(lambda: file.read(8), ''))
+
+        cursor.copy_expert = copy_expert
+
+        rows = ({'id': i, 'name': name}
+                for i, name in enumerate(['john', None]))
+
+        self.assertEqual(2, connection.copy_from('users', rows))
+        self.assertEqual(
+            'COPY "users" ("id", "name") FROM STDIN WITH (FORMAT text)',
+            copied['query']
+        )
+        self.assertEqual('0\tjohn\n1\t\\N\n', copied['data'])
+
+    def test_copy_stream_encoding(self):
+        encode = CopyStream.encode_value
+
+        self.assertEqual('\\N', encode(None))
+        self.assertEqual('t', encode(True))
+        self.assertEqual('1.5', encode(1.5))
+        self.assertEqual('a\\tb\\nc\\\\d', encode('a\tb\nc\\d'))
+        self.assertEqual('\\\\x0aff', encode(b'\n\xff'))
+        self.assertEqual('{"a": 1}', encode({'a': 1}))
+
+    def test_copy_to_exports_a_query(self):
+        dbapi_connection = flexmock()
+        cursor = flexmock(rowcount=3)
+        dbapi_connection.should_receive('cursor').and_return(cursor)
+        connection = PostgresConnection(dbapi_connection, 'database', '', {'use_qmark': True})
+        query = connection.table('users').where('votes', '>', 100)
+        output = flexmock()
+
+        cursor.should_receive('mogrify')\
+            .with_args('SELECT * FROM "users" WHERE "votes" > %s', [100])\
+            .and_return(b'SELECT * FROM "users" WHERE "votes" > 100')
+        cursor.should_receive('copy_expert')\
+            .with_args('COPY (SELECT * FROM "users" WHERE "votes" > 100) '
+                       'TO STDOUT WITH (FORMAT csv, HEADER true)', output)\
+            .once()
+
+        self.assertEqual(3, query.copy_to(output, header=True))
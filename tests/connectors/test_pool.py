@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+import time
+import threading
+
+from flexmock import flexmock
+
+from .. import OratorTestCase
+
+from orator.connectors import ConnectionPool
+from orator.exceptions.connectors import PoolTimeout
+
+
+class ConnectionPoolTestCase(OratorTestCase):
+
+    def test_checkout_creates_connections_lazily(self):
+        pool = ConnectionPool(self.creator, pre_ping=False)
+
+        self.assertEqual(0, pool.size)
+
+        connector = pool.checkout()
+
+        self.assertEqual(1, pool.size)
+        self.assertEqual(1, pool.checked_out)
+
+        pool.checkin(connector)
+
+        self.assertEqual(0, pool.checked_out)
+        self.assertEqual(1, pool.idle)
+        self.assertIs(connector, pool.checkout())
+        self.assertEqual(1, pool.size)
+
+    def test_min_size_opens_connections(self):
+        pool = ConnectionPool(self.creator, min_size=2, pre_ping=False)
+
+        self.assertEqual(2, pool.size)
+        self.assertEqual(2, pool.idle)
+
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        pool = ConnectionPool(self.creator, max_size=1, timeout=0.05,
+                              pre_ping=False)
+
+        pool.checkout()
+
+        self.assertRaises(PoolTimeout, pool.checkout)
+
+    def test_checkout_waits_for_a_connection_to_be_checked_in(self):
+        pool = ConnectionPool(self.creator, max_size=1, timeout=5,
+                              pre_ping=False)
+
+        connector = pool.checkout()
+
+        def give_back():
+            time.sleep(0.05)
+            pool.checkin(connector)
+
+        thread = threading.Thread(target=give_back)
+        thread.start()
+
+        self.assertIs(connector, pool.checkout())
+
+        thread.join()
+
+    def test_dead_connections_are_replaced_on_checkout(self):
+        pool = ConnectionPool(self.creator, pre_ping=True)
+
+        connector = pool.checkout()
+        pool.checkin(connector)
+
+        connector.should_receive('ping').and_return(False).once()
+        connector.should_receive('close').once()
+
+        new_connector = pool.checkout()
+
+        self.assertIsNot(connector, new_connector)
+        self.assertEqual(1, pool.size)
+
+    def test_connections_are_recycled_after_max_lifetime(self):
+        pool = ConnectionPool(self.creator, max_lifetime=0, pre_ping=False)
+
+        connector = pool.checkout()
+        connector.should_receive('close').once()
+
+        time.sleep(0.01)
+        pool.checkin(connector)
+
+        self.assertEqual(0, pool.size)
+        self.assertEqual(0, pool.idle)
+
+    def test_idle_connections_are_reaped(self):
+        pool = ConnectionPool(self.creator, min_size=1, max_idle=0,
+                              pre_ping=False)
+
+        first = pool.checkout()
+        second = pool.checkout()
+        pool.checkin(first)
+
+        time.sleep(0.01)
+        pool.checkin(second)
+
+        self.assertEqual(1, pool.size)
+        self.assertEqual(1, pool.idle)
+
+    def test_discarded_connections_are_closed(self):
+        pool = ConnectionPool(self.creator, pre_ping=False)
+
+        connector = pool.checkout()
+        connector.should_receive('close').once()
+
+        pool.checkin(connector, discard=True)
+
+        self.assertEqual(0, pool.size)
+
+    def test_from_config(self):
+        pool = ConnectionPool.from_config(self.creator, {
+            'min_size': 1, 'max_size': 3, 'pre_ping': False
+        })
+
+        self.assertEqual(1, pool.size)
+
+        pool = ConnectionPool.from_config(self.creator, True)
+
+        self.assertEqual(0, pool.size)
+
+    def creator(self):
+        connector = flexmock(close=lambda: None, ping=lambda: True)
+
+        return connector
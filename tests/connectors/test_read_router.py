@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+import os
+import sqlite3
+
+from flexmock import flexmock
+
+from .. import OratorTestCase
+
+from orator.connectors import ReadRouter, Replica
+from orator.connectors.connection_factory import ConnectionFactory
+from orator.exceptions import ArgumentError
+
+
+class ReadRouterTestCase(OratorTestCase):
+
+    def test_round_robin_cycles_through_replicas(self):
+        replicas = self.replicas(3)
+        router = ReadRouter(replicas)
+
+        chosen = [router.choose() for _ in range(6)]
+
+        self.assertEqual(replicas + replicas, chosen)
+
+    def test_least_outstanding_chooses_the_least_busy_replica(self):
+        replicas = self.replicas(3)
+        router = ReadRouter(replicas, policy='least_outstanding')
+
+        router.begin(replicas[0])
+        router.begin(replicas[1])
+
+        self.assertIs(replicas[2], router.choose())
+
+        router.begin(replicas[2])
+        router.begin(replicas[2])
+        router.end(replicas[0], 1.0)
+
+        self.assertIs(replicas[0], router.choose())
+
+    def test_latency_weighted_favors_fast_replicas(self):
+        replicas = self.replicas(2)
+        router = ReadRouter(replicas, policy='latency_weighted')
+
+        router.begin(replicas[0])
+        router.end(replicas[0], 1.0)
+        router.begin(replicas[1])
+        router.end(replicas[1], 1000.0)
+
+        chosen = [router.choose() for _ in range(200)]
+
+        self.assertGreater(chosen.count(replicas[0]), 180)
+
+    def test_failing_replicas_are_taken_out_of_rotation(self):
+        replicas = self.replicas(2)
+        router = ReadRouter(replicas, cooldown=30)
+
+        router.mark_down(replicas[0])
+
+        self.assertEqual([replicas[1]] * 3,
+                         [router.choose() for _ in range(3)])
+
+        replicas[0].down_until = 0
+
+        self.assertIn(replicas[0], [router.choose() for _ in range(2)])
+
+    def test_the_first_replica_back_is_chosen_when_all_are_down(self):
+        replicas = self.replicas(2)
+        router = ReadRouter(replicas)
+
+        router.mark_down(replicas[1])
+        router.mark_down(replicas[0])
+
+        self.assertIs(replicas[1], router.choose())
+        self.assertIsNone(router.choose(replicas))
+
+    def test_counters(self):
+        replicas = self.replicas(1)
+        router = ReadRouter(replicas)
+
+        router.begin(replicas[0])
+        self.assertEqual(1, router.get_stats()[0]['outstanding'])
+
+        router.end(replicas[0], 10.0)
+        router.begin(replicas[0])
+        router.end(replicas[0], 20.0, failed=True)
+
+        stats = router.get_stats()[0]
+        self.assertEqual('replica0', stats['name'])
+        self.assertEqual(2, stats['queries'])
+        self.assertEqual(1, stats['failures'])
+        self.assertEqual(0, stats['outstanding'])
+        self.assertEqual(12.0, stats['latency'])
+        self.assertFalse(stats['up'])
+
+    def test_invalid_configuration(self):
+        self.assertRaises(ArgumentError, ReadRouter, [])
+        self.assertRaises(ArgumentError, ReadRouter,
+                          self.replicas(1), policy='random')
+
+    def replicas(self, count):
+        return [Replica('replica%d' % i, lambda: flexmock())
+                for i in range(count)]
+
+
+class ReadRouterConnectionTestCase(OratorTestCase):
+
+    databases = ['/tmp/orator_primary.db',
+                 '/tmp/orator_replica1.db',
+                 '/tmp/orator_replica2.db']
+
+    def setUp(self):
+        for database in self.databases:
+            connection = sqlite3.connect(database)
+            connection.execute('DROP TABLE IF EXISTS servers')
+            connection.execute('CREATE TABLE servers (name VARCHAR)')
+            connection.execute('INSERT INTO servers VALUES (?)',
+                               (os.path.basename(database),))
+            connection.commit()
+            connection.close()
+
+    def tearDown(self):
+        for database in self.databases:
+            os.remove(database)
+
+    def test_reads_are_spread_over_replicas(self):
+        connection = ConnectionFactory().make(self.config())
+
+        names = [self.server(connection) for _ in range(4)]
+
+        self.assertEqual(['orator_replica1.db', 'orator_replica2.db'] * 2,
+                         names)
+
+        stats = connection.get_read_router().get_stats()
+        self.assertEqual([2, 2], [s['queries'] for s in stats])
+
+        # Writes and reads within transactions use the write connection
+        with connection.transaction():
+            self.assertEqual('orator_primary.db', self.server(connection))
+
+        self.assertEqual('orator_primary.db',
+                         connection.table('servers').use_write_connection()
+                         .pluck('name'))
+
+    def test_unreachable_replicas_are_skipped(self):
+        config = self.config()
+        config['read'][0]['database'] = '/tmp/missing/orator_replica.db'
+        connection = ConnectionFactory().make(config)
+
+        names = [self.server(connection) for _ in range(3)]
+
+        self.assertEqual(['orator_replica2.db'] * 3, names)
+
+        stats = connection.get_read_router().get_stats()
+        self.assertEqual(1, stats[0]['failures'])
+        self.assertFalse(stats[0]['up'])
+
+    def test_router_is_shared_by_connections_of_a_configuration(self):
+        config = self.config()
+        factory = ConnectionFactory()
+
+        self.assertIs(factory.make(config).get_read_router(),
+                      factory.make(config).get_read_router())
+
+    def test_pooled_replica_connections_are_released(self):
+        config = self.config()
+        config['pool'] = {'max_size': 1}
+        factory = ConnectionFactory()
+        connection = factory.make(config)
+
+        pools = [r.pool for r in connection.get_read_router().get_replicas()]
+
+        with connection.scope():
+            self.server(connection)
+            self.server(connection)
+
+            self.assertEqual([1, 1], [p.checked_out for p in pools])
+
+        self.assertEqual([0, 0], [p.checked_out for p in pools])
+
+        # Outside of a scope, they are given back after each query
+        self.server(connection)
+
+        self.assertEqual([0, 0], [p.checked_out for p in pools])
+        self.assertEqual(3, len(factory.get_pools()))
+
+    def test_a_single_replica_connection_is_kept_open_without_pool(self):
+        connection = ConnectionFactory().make(self.config())
+
+        self.server(connection)
+        self.server(connection)
+
+        self.assertEqual(1, len(connection._replica_connections))
+
+        connection.release()
+
+        self.assertEqual({}, connection._replica_connections)
+        self.assertEqual('orator_replica1.db', self.server(connection))
+
+    def test_sticky_reads_use_the_write_connection_after_a_write(self):
+        config = self.config()
+        config['sticky'] = True
+        connection = ConnectionFactory().make(config)
+
+        self.assertEqual('orator_replica1.db', self.server(connection))
+
+        connection.table('servers').where('name', 'foo').delete()
+
+        self.assertEqual('orator_primary.db', self.server(connection))
+        self.assertEqual('orator_primary.db', self.server(connection))
+
+        connection.release()
+
+        self.assertEqual('orator_replica2.db', self.server(connection))
+
+    def test_stickiness_ends_with_the_scope(self):
+        config = self.config()
+        config['sticky'] = True
+        connection = ConnectionFactory().make(config)
+
+        with connection.scope():
+            with connection.transaction():
+                connection.table('servers').insert(name='foo')
+
+            self.assertEqual('orator_primary.db', self.server(connection))
+
+        self.assertEqual('orator_replica1.db', self.server(connection))
+
+    def test_stickiness_lasts_for_the_configured_window(self):
+        config = self.config()
+        config['sticky'] = 10
+        connection = ConnectionFactory().make(config)
+
+        connection.table('servers').insert(name='foo')
+
+        self.assertEqual('orator_primary.db', self.server(connection))
+
+        connection._records_modified_at -= 10
+
+        self.assertEqual('orator_replica1.db', self.server(connection))
+
+    def test_reads_are_not_sticky_by_default(self):
+        connection = ConnectionFactory().make(self.config())
+
+        connection.table('servers').insert(name='foo')
+
+        self.assertEqual('orator_replica1.db', self.server(connection))
+
+    def config(self):
+        return {
+            'driver': 'sqlite',
+            'database': self.databases[0],
+            'read_router': {'policy': 'round_robin'},
+            'read': [
+                {'database': self.databases[1]},
+                {'database': self.databases[2]}
+            ],
+            'write': [{}]
+        }
+
+    def server(self, connection):
+        return connection.table('servers').pluck('name')
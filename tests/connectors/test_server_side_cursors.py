@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+from flexmock import flexmock
+
+from .. import OratorTestCase
+
+from orator.connectors.postgres_connector import PostgresConnector
+from orator.connectors.mysql_connector import (
+    MySQLConnector, BaseSSDictCursor, SSDictCursor
+)
+
+
+class ServerSideCursorsTestCase(OratorTestCase):
+
+    def test_postgres_uses_named_cursors(self):
+        connector = PostgresConnector()
+        connector._connection = flexmock(autocommit=True)
+        cursor = flexmock(itersize=2000)
+
+        connector._connection.should_receive('cursor')\
+            .with_args(str, withhold=True).once().and_return(cursor)
+
+        self.assertIs(cursor, connector.server_side_cursor(500))
+        self.assertEqual(500, cursor.itersize)
+
+    def test_postgres_named_cursors_are_not_held_within_transactions(self):
+        connector = PostgresConnector()
+        connector._connection = flexmock(autocommit=False)
+
+        connector._connection.should_receive('cursor')\
+            .with_args(str, withhold=False).once().and_return(flexmock())
+
+        connector.server_side_cursor()
+
+    def test_mysql_uses_unbuffered_cursors(self):
+        connector = MySQLConnector()
+
+        self.assertIs(BaseSSDictCursor,
+                      connector.get_cursor_class({}, server_side=True))
+        self.assertIs(SSDictCursor,
+                      connector.get_cursor_class({'use_qmark': True}, True))
+
+        connector._connection = flexmock()
+        connector._server_side_cursor_class = BaseSSDictCursor
+        connector._connection.should_receive('cursor')\
+            .with_args(BaseSSDictCursor).once()
+
+        connector.server_side_cursor()
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import os
+import types
 import json
 import logging
 import pendulum
@@ -78,6 +79,7 @@ class IntegrationTestCase:
         self.migrate()
         self.migrate('test')
 
+        Model.get_connection_resolver().connection().enable_query_log()
         formatter.reset()
 
     def tearDown(self):
@@ -541,6 +543,172 @@ class IntegrationTestCase:
 
         self.assertEqual(count, 20)
 
+    def test_insert_many(self):
+        rows = ({'id': i + 1, 'email': 'john{}@doe.com'.format(i)}
+                for i in range(25))
+
+        inserted = self.connection().table('test_users').insert_many(
+            rows, batch_size=10)
+
+        self.assertEqual(25, inserted)
+        self.assertEqual(25, self.connection().table('test_users').count())
+        self.assertEqual('john24@doe.com',
+                         self.connection().table('test_users')
+                         .where('id', 25).pluck('email'))
+
+    def test_upsert(self):
+        OratorTestUser.create(id=1, email='john@doe.com')
+
+        OratorTestUser.query().upsert([
+            {'id': 1, 'email': 'john@doe.com'},
+            {'id': 2, 'email': 'jane@doe.com'}
+        ], 'id', {'email': 'john@doe.net'})
+
+        self.assertEqual(
+            ['john@doe.net', 'jane@doe.com'],
+            OratorTestUser.order_by('id').lists('email')
+        )
+
+    def test_collection_save_updates_models_in_batch(self):
+        for i in range(3):
+            OratorTestUser.create(id=i + 1, email='john{}@doe.com'.format(i))
+
+        users = OratorTestUser.order_by('id').get()
+        users[0].email = 'jane0@doe.com'
+        users[2].email = 'jane2@doe.com'
+        users.append(OratorTestUser(id=4, email='john3@doe.com'))
+
+        self.assertTrue(users.save())
+        self.assertFalse(users[0].is_dirty())
+        self.assertTrue(users[3].exists)
+        self.assertEqual(
+            ['jane0@doe.com', 'john1@doe.com', 'jane2@doe.com', 'john3@doe.com'],
+            OratorTestUser.order_by('id').lists('email')
+        )
+
+    def test_relation_aggregates(self):
+        john = OratorTestUser.create(id=1, email='john@doe.com')
+        OratorTestUser.create(id=2, email='jane@doe.com')
+        post = john.posts().create(name='First Post')
+        john.posts().create(name='Second Post')
+        post.comments().create(body='Text')
+        post.comments().create(body='Text 2')
+
+        formatter.reset()
+
+        users = OratorTestUser.with_count('posts', {
+            'posts as first_posts': lambda q: q.where('name', 'First Post')
+        }).with_exists('posts').with_max('posts', 'id').order_by('id').get()
+
+        self.assertEqual(1, len(formatter.logged_queries))
+        self.assertEqual([2, 0], [u.posts_count for u in users])
+        self.assertEqual([1, 0], [u.first_posts for u in users])
+        self.assertEqual([1, 0], [u.posts_exists for u in users])
+        self.assertEqual([2, None], [u.posts_max_id for u in users])
+        self.assertEqual('john@doe.com', users[0].email)
+        self.assertFalse(users[0].relation_loaded('posts'))
+
+        posts = OratorTestPost.select('id').with_count('comments')\
+            .with_sum('comments', 'id').order_by('id').get()
+
+        self.assertEqual([2, 0], [p.comments_count for p in posts])
+        self.assertEqual([3, None], [p.comments_sum_id for p in posts])
+
+        john.photos().create(name='Photo')
+
+        users = OratorTestUser.with_max(['posts', 'photos'], 'id')\
+            .order_by('id').get()
+
+        self.assertEqual([2, None], [u.posts_max_id for u in users])
+        self.assertEqual([1, None], [u.photos_max_id for u in users])
+
+    def test_eager_loading_reuses_loaded_relations(self):
+        user = OratorTestUser.create(id=1, email='john@doe.com')
+        post = user.posts().create(name='First Post')
+        post.comments().create(body='Text')
+        post.comments().create(body='Text 2')
+
+        users = OratorTestUser.all().load('posts')
+
+        formatter.reset()
+
+        users.load('posts.comments.parent')
+
+        queries = [q[0] for q in formatter.logged_queries]
+        self.assertEqual(1, len(queries))
+        self.assertIn('"test_comments"."post_id" IN', queries[0])
+        self.assertEqual(['Text', 'Text 2'], [c.body for c in users[0].posts[0].comments])
+        self.assertTrue(users[0].posts[0].comments[0].relation_loaded('parent'))
+
+        formatter.reset()
+
+        users.load({'posts': lambda q: q.where('name', 'Other')})
+
+        self.assertEqual(1, len(formatter.logged_queries))
+        self.assertEqual(0, len(users[0].posts))
+
+    def test_eager_loading_by_batches(self):
+        for i in range(5):
+            user = OratorTestUser.create(id=i + 1, email='john{}@doe.com'.format(i))
+            user.posts().create(name='Post {}'.format(i))
+            user.posts().create(name='Other post {}'.format(i))
+
+        OratorTestUser.__eager_batch_size__ = 2
+        try:
+            formatter.reset()
+
+            users = OratorTestUser.with_({
+                'posts': lambda q: q.where('name', 'like', 'Post%')
+            }).order_by('id').get()
+
+            queries = [q for q in formatter.logged_queries if 'test_posts' in q[0]]
+            self.assertEqual(3, len(queries))
+            self.assertEqual(['Post {}'.format(i) for i in range(5)],
+                             [u.posts[0].name for u in users])
+            self.assertTrue(all(len(u.posts) == 1 for u in users))
+        finally:
+            del OratorTestUser.__eager_batch_size__
+
+    def test_lazy(self):
+        for i in range(5):
+            user = OratorTestUser.create(id=i + 1, email='john{}@doe.com'.format(i))
+            user.posts().create(name='Post {}'.format(i))
+
+        users = OratorTestUser.order_by('id').lazy(2)
+        self.assertIsInstance(users, types.GeneratorType)
+
+        users = list(users)
+        self.assertEqual([1, 2, 3, 4, 5], [u.id for u in users])
+        self.assertTrue(users[0].exists)
+
+        formatter.reset()
+
+        users = list(OratorTestUser.with_('posts').order_by('id').lazy(2))
+        self.assertEqual('Post 4', users[4].posts[0].name)
+        queries = formatter.logged_queries
+        self.assertEqual(3, len([q for q in queries if 'test_posts' in q[0]]))
+
+        self.assertEqual(5, len(list(OratorTestUser.cursor())))
+
+    def test_get_rows(self):
+        OratorTestUser.create(id=1, email='john@doe.com')
+        user = OratorTestUser.create(id=2, email='jane@doe.com')
+        user.photos().create(name='Photo', metadata={'width': 10})
+        user.photos().create(name='Other photo')
+
+        self.assertEqual(
+            [{'id': 1, 'email': 'john@doe.com'}, {'id': 2, 'email': 'jane@doe.com'}],
+            OratorTestUser.order_by('id').as_dicts(['id', 'email'])
+        )
+
+        users = OratorTestUser.where('id', 2).as_tuples(['id', 'email'])
+        self.assertEqual((2, 'jane@doe.com'), tuple(users[0]))
+        self.assertEqual('jane@doe.com', users[0].email)
+
+        photos = list(OratorTestPhoto.order_by('id').iter_rows(1, ['name', 'metadata']))
+        self.assertEqual([{'name': 'Photo', 'metadata': {'width': 10}},
+                          {'name': 'Other photo', 'metadata': None}], photos)
+
     def test_chunk_update_model(self):
         for i in range(20):
             OratorTestUser.create(id=i + 1, email='john{}@doe.com'.format(i))
@@ -4,14 +4,16 @@ from flexmock import flexmock, flexmock_teardown
 from .. import OratorTestCase, mock
 from ..utils import MockModel, MockQueryBuilder, MockConnection, MockProcessor
 from orator.query.grammars.grammar import QueryGrammar
+from orator.query.grammars import SQLiteQueryGrammar, PostgresQueryGrammar
 from orator.query.builder import QueryBuilder
 from orator.orm.builder import Builder
 from orator.orm.model import Model
 from orator.orm import belongs_to, has_many, scope
 from orator.exceptions.orm import ModelNotFound
 from orator.orm.collection import Collection
-from orator.connections import Connection
+from orator.connections import Connection, PostgresConnection
 from orator.query.processors import QueryProcessor
+from orator.pagination import Cursor
 
 
 class BuilderTestCase(OratorTestCase):
@@ -285,6 +287,120 @@ class BuilderTestCase(OratorTestCase):
             mock.call([])
         ])
 
+    def test_rows_are_streamed_while_eager_loading(self):
+        connector = flexmock()
+        cursor = flexmock()
+        connection = PostgresConnection(connector, 'database', '',
+                                        {'server_side_cursors': True})
+        query_builder = QueryBuilder(
+            connection, PostgresQueryGrammar(), QueryProcessor())
+
+        # Named cursors, like the PostgreSQL ones,
+        # allow other queries on their connection
+        connector.should_receive('server_side_cursor').once()\
+            .and_return(cursor)
+        connector.should_receive('cursor').never()
+        cursor.should_receive('execute')
+        cursor.should_receive('fetchmany').and_return([])
+        cursor.should_receive('close')
+
+        builder = Builder(query_builder)
+        builder.set_model(self.get_mock_model())
+
+        self.assertEqual([], list(builder.with_('foo').lazy(2)))
+
+    def test_rows_are_not_streamed_while_eager_loading(self):
+        query_builder = self.get_mock_query_builder()
+        query_builder.chunk = mock.MagicMock(return_value=[])
+        connection = query_builder.get_connection()
+        connection.streaming_blocks_connection = mock.MagicMock(
+            return_value=True)
+
+        builder = Builder(query_builder)
+        builder.set_model(self.get_mock_model())
+
+        list(builder.lazy(2))
+        query_builder.chunk.assert_called_once_with(2)
+
+        # Unbuffered server-side cursors, like the MySQL ones,
+        # do not allow other queries on their connection
+        list(builder.with_('foo').lazy(2))
+        list(builder.chunk(3))
+        query_builder.chunk.assert_has_calls([
+            mock.call(2, server_side=False),
+            mock.call(3, server_side=False)
+        ])
+
+    def test_eager_batches_bind_arrays_only_when_supported(self):
+        models = list(range(1200))
+
+        for grammar, count in [(SQLiteQueryGrammar(), 3),
+                               (PostgresQueryGrammar(), 1)]:
+            builder = Builder(QueryBuilder(None, grammar, None))
+            builder.set_model(OrmBuilderTestModelWhereAnyStub())
+
+            self.assertEqual(count, len(builder._get_eager_batches(models)))
+
+    def test_chunk_by_id(self):
+        query_builder = self.get_mock_query_builder()
+        query_builder.chunk_by_id = mock.MagicMock(return_value=[['foo1', 'foo2'], ['foo3']])
+
+        builder = Builder(query_builder)
+        model = self.get_mock_model()
+        builder.set_model(model)
+
+        model.hydrate = mock.MagicMock(return_value=[])
+        model.new_collection = mock.MagicMock(side_effect=lambda models: Collection(models))
+        model.get_connection_name = mock.MagicMock(return_value='foo')
+
+        self.assertEqual(2, len(list(builder.chunk_by_id(2))))
+
+        query_builder.chunk_by_id.assert_called_once_with(2, 'foo_table.foo', 'foo')
+        model.hydrate.assert_has_calls([
+            mock.call(['foo1', 'foo2'], 'foo'),
+            mock.call(['foo3'], 'foo')
+        ])
+
+    def test_upsert_sets_timestamps(self):
+        builder = self.get_builder()
+        model = self.get_mock_model()
+        model.uses_timestamps = mock.MagicMock(return_value=True)
+        model.fresh_timestamp_string = mock.MagicMock(return_value='now')
+        model.get_created_at_column = mock.MagicMock(return_value='created_at')
+        model.get_updated_at_column = mock.MagicMock(return_value='updated_at')
+        builder.set_model(model)
+        builder.get_query().upsert = mock.MagicMock(return_value=1)
+
+        self.assertEqual(1, builder.upsert({'email': 'foo', 'name': 'bar'}, 'email'))
+
+        rows, unique_by, update, batch_size = builder.get_query().upsert.call_args[0]
+        self.assertEqual(
+            [{'email': 'foo', 'name': 'bar', 'created_at': 'now', 'updated_at': 'now'}],
+            list(rows)
+        )
+        self.assertEqual(['name', 'updated_at'], update)
+
+        builder.upsert([{'email': 'foo', 'name': 'bar'}], ['email'], ['name'])
+
+        self.assertEqual(['name', 'updated_at'],
+                         builder.get_query().upsert.call_args[0][2])
+
+    def test_cursor_paginate_orders_by_key(self):
+        builder = self.get_builder()
+        builder.set_model(self.get_mock_model())
+        builder.get_query().get = mock.MagicMock(return_value=Collection([{'foo': 2}, {'foo': 3}]))
+        builder.get_model().get_connection_name = mock.MagicMock(return_value='foo')
+
+        paginator = builder.cursor_paginate(1, Cursor({'foo': 1}))
+
+        self.assertEqual(
+            'SELECT * FROM "foo_table" WHERE "foo_table"."foo" > ? '
+            'ORDER BY "foo_table"."foo" ASC LIMIT 2',
+            builder.to_sql()
+        )
+        self.assertEqual(1, len(paginator))
+        self.assertEqual(Cursor({'foo': 2}), paginator.next_cursor)
+
     # TODO: lists with get mutators
 
     def test_lists_without_model_getters(self):
@@ -408,6 +524,17 @@ class BuilderTestCase(OratorTestCase):
 
         relation = builder.get_relation('orders')
 
+    def test_with_accepts_several_constrained_relations(self):
+        builder = Builder(QueryBuilder(None, None, None))
+        nop1 = lambda q: None
+        nop2 = lambda q: None
+        builder.with_({'orders': nop1, 'orders.lines.details': nop2})
+
+        eagers = builder.get_eager_loads()
+        self.assertEqual(['orders', 'orders.lines', 'orders.lines.details'], list(eagers.keys()))
+        self.assertIs(nop1, eagers['orders'])
+        self.assertIs(nop2, eagers['orders.lines.details'])
+
     def test_query_passthru(self):
         builder = self.get_builder()
         builder.get_query().foobar = mock.MagicMock(return_value='foo')
@@ -480,6 +607,48 @@ class BuilderTestCase(OratorTestCase):
 
         self.assertEqual(builder, result)
 
+    def test_has_uses_exists(self):
+        model = OrmBuilderTestModelParentStub
+        subquery = (
+            'SELECT 1 FROM "orm_builder_test_model_close_relateds" '
+            'WHERE "orm_builder_test_model_parent_stubs"."foo_id" = "orm_builder_test_model_close_relateds"."id"'
+        )
+
+        builder = model.where('bar', 'baz').has('foo')
+        self.assertEqual(
+            'SELECT * FROM "orm_builder_test_model_parent_stubs" '
+            'WHERE "bar" = ? AND EXISTS (%s)' % subquery,
+            builder.to_sql()
+        )
+        self.assertEqual(['baz'], builder.get_bindings())
+
+        builder = model.doesnt_have('foo')
+        self.assertEqual(
+            'SELECT * FROM "orm_builder_test_model_parent_stubs" WHERE NOT EXISTS (%s)' % subquery,
+            builder.to_sql()
+        )
+
+        builder = model.where_has('foo.bar', lambda q: q.where('baz', 'bam'))
+        self.assertEqual(
+            'SELECT * FROM "orm_builder_test_model_parent_stubs" WHERE EXISTS (%s AND EXISTS ('
+            'SELECT 1 FROM "orm_builder_test_model_far_related_stubs" '
+            'WHERE "orm_builder_test_model_far_related_stubs"."orm_builder_test_model_close_related_id" '
+            '= "orm_builder_test_model_close_relateds"."id" AND "baz" = ?))' % subquery,
+            builder.to_sql()
+        )
+        self.assertEqual(['bam'], builder.get_bindings())
+
+    def test_has_with_count_uses_count_subquery(self):
+        builder = OrmBuilderTestModelParentStub.has('foo', '>', 2)
+
+        self.assertEqual(
+            'SELECT * FROM "orm_builder_test_model_parent_stubs" '
+            'WHERE (SELECT COUNT(*) FROM "orm_builder_test_model_close_relateds" '
+            'WHERE "orm_builder_test_model_parent_stubs"."foo_id" = "orm_builder_test_model_close_relateds"."id") > ?',
+            builder.to_sql()
+        )
+        self.assertEqual([2], builder.get_bindings())
+
     def test_where_exists_accepts_builder_instance(self):
         model = OrmBuilderTestModelCloseRelated
 
@@ -547,3 +716,8 @@ class OrmBuilderTestModelParentStub(OratorTestModel):
     @belongs_to
     def foo(self):
         return OrmBuilderTestModelCloseRelated
+
+
+class OrmBuilderTestModelWhereAnyStub(OratorTestModel):
+
+    __eager_where_any__ = True
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+from .. import OratorTestCase
+from orator import DatabaseManager, Model, IdentityMap
+from orator.orm import belongs_to, has_many
+
+
+class IdentityMapTestCase(OratorTestCase):
+
+    databases = {
+        'test': {
+            'driver': 'sqlite',
+            'database': ':memory:'
+        }
+    }
+
+    def setUp(self):
+        self.db = DatabaseManager(self.databases)
+
+        Model.set_connection_resolver(self.db)
+
+        with self.schema().create('users') as table:
+            table.increments('id')
+            table.string('email').unique()
+            table.timestamps()
+
+        with self.schema().create('posts') as table:
+            table.increments('id')
+            table.string('title')
+            table.integer('user_id')
+            table.timestamps()
+
+        IdentityMapTestUser.create(id=1, email='john@doe.com')
+        IdentityMapTestUser.create(id=2, email='jane@doe.com')
+        IdentityMapTestPost.create(id=1, title='First', user_id=1)
+        IdentityMapTestPost.create(id=2, title='Second', user_id=1)
+        IdentityMapTestPost.create(id=3, title='Third', user_id=2)
+
+        self.queries = []
+        self.connection().log_query = \
+            lambda query, bindings, time_=None: self.queries.append(query)
+
+    def tearDown(self):
+        self.schema().drop('users')
+        self.schema().drop('posts')
+
+        Model.unset_connection_resolver()
+
+    def test_loaded_models_are_reused(self):
+        with IdentityMap() as identity_map:
+            user = IdentityMapTestUser.find(1)
+            users = IdentityMapTestUser.order_by('id').get()
+
+            self.assertIs(user, users[0])
+            self.assertEqual(1, identity_map.hits)
+
+        self.assertIsNot(IdentityMapTestUser.find(1), IdentityMapTestUser.find(1))
+
+    def test_find_does_not_query_loaded_models(self):
+        with IdentityMap():
+            users = IdentityMapTestUser.all()
+            self.queries[:] = []
+
+            self.assertIs(users[1], IdentityMapTestUser.find(2))
+            self.assertEqual(2, len(IdentityMapTestUser.find([1, 2])))
+            self.assertEqual(0, len(self.queries))
+
+            IdentityMapTestUser.find([1, 3])
+            IdentityMapTestUser.where('email', 'john@doe.com').find(1)
+            self.assertEqual(2, len(self.queries))
+
+    def test_partial_records_are_not_registered(self):
+        with IdentityMap() as identity_map:
+            user = IdentityMapTestUser.select('id').find(1)
+
+            self.assertEqual(0, len(identity_map))
+            self.assertIsNot(user, IdentityMapTestUser.find(1))
+
+    def test_rows_with_other_columns_get_their_own_instances(self):
+        with IdentityMap() as identity_map:
+            user = IdentityMapTestUser.find(1)
+            users = IdentityMapTestUser.with_count('posts').order_by('id').get()
+
+            self.assertIsNot(user, users[0])
+            self.assertEqual([2, 1], [u.posts_count for u in users])
+            self.assertFalse(hasattr(user, 'posts_count'))
+            self.assertIs(user, IdentityMapTestUser.get(['*'])[0])
+
+            partial = IdentityMapTestUser.order_by('id').get(['id'])
+            self.assertIsNot(user, partial[0])
+            self.assertEqual(2, len(identity_map))
+
+    def test_belongs_to_uses_loaded_models(self):
+        with IdentityMap():
+            users = IdentityMapTestUser.all()
+            self.queries[:] = []
+
+            posts = IdentityMapTestPost.with_('user').order_by('id').get()
+
+            self.assertEqual(1, len(self.queries))
+            self.assertIs(users[0], posts[0].user.__wrapped__)
+            self.assertIs(users[0], posts[1].user.__wrapped__)
+            self.assertIs(users[1], posts[2].user.__wrapped__)
+
+            self.assertIs(users[0], IdentityMapTestPost.find(1).user.__wrapped__)
+            self.assertEqual(1, len(self.queries))
+
+    def test_deleted_models_are_removed(self):
+        with IdentityMap() as identity_map:
+            user = IdentityMapTestUser.find(2)
+            user.delete()
+
+            self.assertNotIn(user, identity_map)
+            self.assertIsNone(IdentityMapTestUser.find(2))
+
+    def connection(self):
+        return self.db.connection()
+
+    def schema(self):
+        return self.connection().get_schema_builder()
+
+
+class IdentityMapTestUser(Model):
+
+    __table__ = 'users'
+    __guarded__ = []
+
+    @has_many('user_id')
+    def posts(self):
+        return IdentityMapTestPost
+
+
+class IdentityMapTestPost(Model):
+
+    __table__ = 'posts'
+    __guarded__ = []
+
+    @belongs_to('user_id')
+    def user(self):
+        return IdentityMapTestUser
@@ -16,6 +16,7 @@ from orator.query.processors import QueryProcessor
 from orator.orm.builder import Builder
 from orator.orm.model import Model
 from orator.orm.utils import mutator, accessor
+from orator.orm.attributes import AttributeDescriptor
 from orator.exceptions.orm import MassAssignmentError
 from orator.orm.collection import Collection
 from orator.connections import Connection
@@ -52,6 +53,30 @@ class OrmModelTestCase(OratorTestCase):
         self.assertTrue(model.is_dirty('baz'))
         self.assertTrue(model.is_dirty('foo', 'bar', 'baz'))
 
+    def test_original_attributes_are_kept_for_modified_attributes(self):
+        model = OrmModelStub(foo='1', bar=2)
+        model.sync_original()
+
+        model.foo = 'changed'
+        model.baz = 3
+        del model.bar
+
+        self.assertEqual({'foo': 'changed', 'baz': 3}, model.get_dirty())
+        self.assertEqual({'foo': '1', 'bar': 2}, model.get_original())
+        self.assertEqual('1', model.get_original('foo'))
+        self.assertIsNone(model.get_original('baz'))
+
+        model.foo = '1'
+        self.assertFalse(model.is_dirty('foo'))
+        self.assertTrue(model.is_dirty('baz'))
+
+        model.set_raw_attributes({'foo': '2', 'baz': 3})
+        self.assertEqual({'foo': '2', 'baz': 3}, model.get_dirty())
+
+        model.sync_original()
+        self.assertFalse(model.is_dirty())
+        self.assertEqual({'foo': '2', 'baz': 3}, model.get_original())
+
     def test_calculated_attributes(self):
         model = OrmModelStub()
         model.password = 'secret'
@@ -86,6 +111,32 @@ class OrmModelTestCase(OratorTestCase):
         self.assertEqual('foo_connection', collection[0].get_connection_name())
         self.assertEqual('foo_connection', collection[1].get_connection_name())
 
+    def test_hydrate_bypasses_mass_assignment_and_mutators(self):
+        collection = OrmModelHydrateGuardedStub.hydrate(
+            [{'id': 1, 'password': 'secret'}], 'foo_connection')
+
+        model = collection[0]
+        self.assertTrue(model.exists)
+        self.assertEqual({'id': 1, 'password': 'secret'}, model.get_attributes())
+        self.assertEqual(model.get_attributes(), model.get_original())
+        self.assertIsNot(model.get_attributes(), model.get_original())
+        self.assertFalse(model.is_dirty())
+        self.assertEqual('foo_connection', model.get_connection_name())
+
+    def test_hydrate_uses_custom_constructors(self):
+        collection = OrmModelHydrateConstructorStub.hydrate([{'name': 'john'}])
+
+        self.assertTrue(collection[0].constructed)
+        self.assertTrue(collection[0].exists)
+        self.assertEqual('john', collection[0].name)
+
+    def test_hydrate_uses_custom_builders(self):
+        collection = OrmModelHydrateBuilderStub.hydrate([{'name': 'john'}])
+
+        self.assertTrue(collection[0].built)
+        self.assertTrue(collection[0].exists)
+        self.assertEqual('john', collection[0].name)
+
     def test_hydrate_raw_makes_raw_query(self):
         model = OrmModelHydrateRawStub()
         connection = MockConnection().prepare_mock()
@@ -647,6 +698,31 @@ class OrmModelTestCase(OratorTestCase):
         d = model.to_dict()
         self.assertEqual('appended', d['appendable'])
 
+    def test_collection_serialize_uses_compiled_serializer(self):
+        models = OrmModelSerializeStub.hydrate([
+            {'id': 1, 'name': 'john', 'password': 'secret', 'options': '{"foo": "bar"}',
+             'list_items': '[1, 2]', 'created_at': '2015-03-24', '_private': True},
+            {'id': 2, 'name': 'jane', 'password': 'secret', 'options': None,
+             'list_items': '[]', 'created_at': None, '_private': True},
+        ])
+        models[0].set_relation('partner', OrmModelStub(name='jane'))
+
+        expected = [
+            dict(m.attributes_to_dict(), **m.relations_to_dict()) for m in models
+        ]
+
+        self.assertEqual(expected, models.serialize())
+        self.assertEqual({
+            'id': 1, 'name': 'john', 'options': {'foo': 'bar'}, 'list_items': [1, 2],
+            'created_at': '2015-03-24T00:00:00+00:00', 'appendable': 'appended',
+            'partner': {'name': 'jane'}
+        }, models[0].serialize())
+        self.assertIsNotNone(models[0]._get_serializer())
+
+        models[1].set_hidden(['name'])
+        self.assertIsNone(models[1]._get_serializer())
+        self.assertNotIn('name', models.serialize()[1])
+
     def test_to_dict_includes_default_formatted_timestamps(self):
         model = Model()
         model.set_raw_attributes({
@@ -921,6 +997,27 @@ class OrmModelTestCase(OratorTestCase):
         self.assertEqual({'foo': 'bar'}, d['eighth'])
         self.assertEqual(['foo', 'bar'], d['seventh'])
 
+    def test_converted_values_are_remembered(self):
+        model = OrmModelCastingStub.hydrate([{
+            'sixth': '{"foo": "bar"}', 'created_at': '2016-01-01 12:00:00'
+        }])[0]
+
+        self.assertIs(model.created_at, model.created_at)
+        self.assertEqual('2016-01-01T12:00:00+00:00', model.to_dict()['created_at'])
+
+        # Mutable values are converted on each read
+        model.sixth['foo'] = 'baz'
+        model.to_dict()['sixth']['foo'] = 'baz'
+        self.assertEqual({'foo': 'bar'}, model.sixth)
+        self.assertEqual({'foo': 'bar'}, model.to_dict()['sixth'])
+        self.assertFalse(model.is_dirty())
+
+        model.sixth = {'foo': 'baz'}
+        self.assertEqual({'foo': 'baz'}, model.sixth)
+
+        model.set_raw_attribute('created_at', '2016-01-02 12:00:00')
+        self.assertEqual(2, model.created_at.day)
+
     def test_casts_preserve_null(self):
         model = OrmModelCastingStub()
         model.first = None
@@ -952,6 +1049,37 @@ class OrmModelTestCase(OratorTestCase):
         self.assertIsNone(d['seventh'])
         self.assertIsNone(d['eighth'])
 
+    def test_attribute_descriptors_are_generated_at_boot(self):
+        model = OrmModelCastingStub()
+        model.first = '3'
+        model.sixth = {'foo': 'bar'}
+
+        self.assertIsInstance(vars(OrmModelCastingStub)['first'], AttributeDescriptor)
+        self.assertEqual(3, model.first)
+        self.assertEqual('{"foo": "bar"}', model.get_raw_attribute('sixth'))
+        self.assertEqual({'foo': 'bar'}, model.sixth)
+        self.assertTrue(model.is_dirty('first'))
+        self.assertRaises(AttributeError, getattr, model, 'second')
+
+        del model.first
+        self.assertFalse(hasattr(model, 'first'))
+
+    def test_attribute_descriptors_are_generated_for_hydrated_columns(self):
+        models = OrmModelStub.hydrate([{'name': 'john', 'list_items': '[]'}])
+
+        self.assertIsInstance(vars(OrmModelStub)['name'], AttributeDescriptor)
+        self.assertNotIsInstance(vars(OrmModelStub)['list_items'], AttributeDescriptor)
+        self.assertEqual('john', models[0].name)
+        self.assertEqual([], models[0].list_items)
+
+    def test_attribute_descriptors_are_resolved_per_class(self):
+        OrmModelCastingStub()
+        model = OrmModelCastingSubclassStub()
+        model.first = '3'
+
+        self.assertEqual('3', model.first)
+        self.assertFalse(OrmModelCustomAttributeStub._can_use_attribute_descriptors())
+
     def test_get_foreign_key(self):
         model = OrmModelStub()
         model.set_table('stub')
@@ -1002,6 +1130,21 @@ class OrmModelStub(Model):
         return []
 
 
+class OrmModelSerializeStub(Model):
+
+    __hidden__ = ['password']
+    __appends__ = ['appendable']
+    __casts__ = {'options': 'dict'}
+
+    @accessor
+    def list_items(self):
+        return json.loads(self.get_raw_attribute('list_items'))
+
+    @accessor
+    def appendable(self):
+        return 'appended'
+
+
 class OrmModelHydrateRawStub(Model):
 
     @classmethod
@@ -1009,6 +1152,33 @@ class OrmModelHydrateRawStub(Model):
         return 'hydrated'
 
 
+class OrmModelHydrateGuardedStub(Model):
+
+    __guarded__ = ['*']
+
+    @mutator
+    def password(self, value):
+        self.set_raw_attribute('password', hashlib.md5(value.encode()).hexdigest())
+
+
+class OrmModelHydrateConstructorStub(Model):
+
+    def __init__(self, _attributes=None, **attributes):
+        super().__init__(_attributes, **attributes)
+
+        object.__setattr__(self, 'constructed', True)
+
+
+class OrmModelHydrateBuilderStub(Model):
+
+    def new_from_builder(self, attributes=None, connection=None):
+        model = super().new_from_builder(attributes, connection)
+
+        object.__setattr__(model, 'built', True)
+
+        return model
+
+
 class OrmModelWithStub(Model):
 
     def new_query(self):
@@ -1093,6 +1263,17 @@ class OrmModelCastingStub(Model):
         'eighth': 'json'
     }
 
+class OrmModelCastingSubclassStub(OrmModelCastingStub):
+
+    __casts__ = {}
+
+
+class OrmModelCustomAttributeStub(Model):
+
+    def get_attribute(self, key, original=None):
+        return super().get_attribute(key, original)
+
+
 class OrmModelCreatedAt(Model):
 
     __timestamps__ = ['created_at']
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+
+import os
+import logging
+import tempfile
+import threading
+
+from .. import OratorTestCase
+from orator import DatabaseManager, Model
+from orator.orm import has_many, belongs_to
+
+
+class QueryThreadsHandler(logging.Handler):
+
+    def __init__(self):
+        super(QueryThreadsHandler, self).__init__()
+
+        self.queries = []
+
+    def emit(self, record):
+        self.queries.append((record.threadName, record.query[0]))
+
+    def threads_of(self, table):
+        return set(thread for thread, query in self.queries if table in query)
+
+
+class ParallelEagerLoadingTestCase(OratorTestCase):
+
+    def setUp(self):
+        fd, self.database = tempfile.mkstemp(suffix='.db')
+        os.close(fd)
+
+        self.db = DatabaseManager({
+            'sqlite': {
+                'driver': 'sqlite',
+                'database': self.database,
+                'check_same_thread': False,
+                'log_queries': True,
+                'pool': {'max_size': 4, 'pre_ping': False}
+            }
+        })
+
+        Model.set_connection_resolver(self.db)
+
+        with self.schema().create('users') as table:
+            table.increments('id')
+            table.string('email')
+
+        with self.schema().create('posts') as table:
+            table.increments('id')
+            table.string('title')
+            table.integer('user_id')
+
+        with self.schema().create('comments') as table:
+            table.increments('id')
+            table.string('body')
+            table.integer('user_id')
+            table.integer('post_id')
+
+        for i in range(1, 4):
+            user = ParallelTestUser.create(id=i, email='john{}@doe.com'.format(i))
+            post = user.posts().create(title='Post {}'.format(i))
+            user.comments().create(body='Comment {}'.format(i), post_id=post.id)
+
+        self.db.release()
+
+        self.handler = QueryThreadsHandler()
+        self.logger = logging.getLogger('orator.connection.queries')
+        self.logger.addHandler(self.handler)
+
+        self.level = self.logger.level
+        self.logger.setLevel(logging.DEBUG)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        self.logger.setLevel(self.level)
+
+        self.db.release()
+        Model.unset_connection_resolver()
+
+        os.remove(self.database)
+
+    def test_relations_are_loaded_by_other_threads(self):
+        users = ParallelTestUser.with_('posts.comments', 'comments')\
+            .load_in_parallel().order_by('id').get()
+
+        self.assertEqual(['Post 1', 'Post 2', 'Post 3'],
+                         [u.posts[0].title for u in users])
+        self.assertEqual(['Comment 1', 'Comment 2', 'Comment 3'],
+                         [u.comments[0].body for u in users])
+        self.assertEqual('Comment 2', users[1].posts[0].comments[0].body)
+
+        main = threading.current_thread().name
+        self.assertEqual({main}, self.handler.threads_of('"users"'))
+        self.assertNotIn(main, self.handler.threads_of('"posts"'))
+        self.assertNotIn(main, self.handler.threads_of('"comments"'))
+
+        self.db.release()
+        self.assertEqual(0, self.connection().get_pool().checked_out)
+
+    def test_threads_are_shared_by_the_queries(self):
+        for _ in range(5):
+            ParallelTestUser.with_('posts', 'comments')\
+                .load_in_parallel().get()
+
+        threads = self.handler.threads_of('"posts"')\
+            | self.handler.threads_of('"comments"')
+
+        self.assertLessEqual(len(threads), 4)
+
+    def test_relations_are_loaded_by_the_current_thread_without_pool(self):
+        db = DatabaseManager({
+            'sqlite': {
+                'driver': 'sqlite',
+                'database': self.database,
+                'log_queries': True
+            }
+        })
+        Model.set_connection_resolver(db)
+
+        users = ParallelTestUser.with_('posts', 'comments')\
+            .load_in_parallel().get()
+
+        self.assertEqual('Post 1', users[0].posts[0].title)
+
+        main = threading.current_thread().name
+        self.assertEqual({main}, self.handler.threads_of('"posts"'))
+        self.assertEqual({main}, self.handler.threads_of('"comments"'))
+
+        db.release()
+
+    def test_relations_are_loaded_by_the_current_thread_in_transactions(self):
+        with self.db.transaction():
+            ParallelTestUser.create(id=4, email='jane@doe.com').posts()\
+                .create(title='Post 4')
+
+            users = ParallelTestUser.with_('posts').load_in_parallel()\
+                .order_by('id').get()
+
+        self.assertEqual('Post 4', users[3].posts[0].title)
+
+        main = threading.current_thread().name
+        self.assertEqual({main}, self.handler.threads_of('"posts"'))
+
+    def test_relations_are_loaded_by_the_current_thread_in_memory(self):
+        db = DatabaseManager({
+            'sqlite': {
+                'driver': 'sqlite',
+                'database': ':memory:',
+                'log_queries': True,
+                'pool': {'max_size': 4, 'pre_ping': False}
+            }
+        })
+        Model.set_connection_resolver(db)
+
+        with self.schema().create('users') as table:
+            table.increments('id')
+            table.string('email')
+
+        with self.schema().create('posts') as table:
+            table.increments('id')
+            table.string('title')
+            table.integer('user_id')
+
+        ParallelTestUser.create(id=1, email='john@doe.com').posts()\
+            .create(title='Post 1')
+
+        users = ParallelTestUser.with_('posts').load_in_parallel().get()
+
+        self.assertEqual('Post 1', users[0].posts[0].title)
+
+        main = threading.current_thread().name
+        self.assertEqual({main}, self.handler.threads_of('"posts"'))
+
+    def connection(self):
+        return Model.get_connection_resolver().connection()
+
+    def schema(self):
+        return self.connection().get_schema_builder()
+
+
+class ParallelTestUser(Model):
+
+    __table__ = 'users'
+    __guarded__ = []
+    __timestamps__ = False
+
+    @has_many('user_id')
+    def posts(self):
+        return ParallelTestPost
+
+    @has_many('user_id')
+    def comments(self):
+        return ParallelTestComment
+
+
+class ParallelTestPost(Model):
+
+    __table__ = 'posts'
+    __guarded__ = []
+    __timestamps__ = False
+
+    @belongs_to('user_id')
+    def user(self):
+        return ParallelTestUser
+
+    @has_many('post_id')
+    def comments(self):
+        return ParallelTestComment
+
+
+class ParallelTestComment(Model):
+
+    __table__ = 'comments'
+    __guarded__ = []
+    __timestamps__ = False
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+from .. import OratorTestCase
+from orator import DatabaseManager, Model, Session
+from orator.orm import belongs_to, has_many
+
+
+class SessionTestCase(OratorTestCase):
+
+    databases = {
+        'test': {
+            'driver': 'sqlite',
+            'database': ':memory:'
+        }
+    }
+
+    def setUp(self):
+        self.db = DatabaseManager(self.databases)
+
+        Model.set_connection_resolver(self.db)
+
+        with self.schema().create('users') as table:
+            table.increments('id')
+            table.string('email').unique()
+            table.timestamps()
+
+        with self.schema().create('posts') as table:
+            table.increments('id')
+            table.string('title')
+            table.integer('user_id')
+            table.timestamps()
+
+    def tearDown(self):
+        self.schema().drop('users')
+        self.schema().drop('posts')
+
+        Model.unset_connection_resolver()
+
+    def test_saves_are_flushed_in_batches(self):
+        users = [SessionTestUser.create(id=i, email='john%d@doe.com' % i)
+                 for i in range(1, 4)]
+
+        with Session():
+            for user in users:
+                user.email = user.email.replace('john', 'jane')
+                user.save()
+
+            SessionTestUser(id=4, email='jane4@doe.com').save()
+            SessionTestUser(id=5, email='jane5@doe.com').save()
+
+            self.assertEqual(0, SessionTestUser.where('email', 'like', 'jane%').count())
+
+        self.assertEqual(5, SessionTestUser.where('email', 'like', 'jane%').count())
+
+    def test_parents_are_inserted_before_children(self):
+        with Session() as session:
+            post = SessionTestPost(id=1, title='Post', user_id=1)
+            post.save()
+            user = SessionTestUser(id=1, email='john@doe.com')
+            user.save()
+
+            self.assertTrue(session.is_pending(post))
+
+        self.assertEqual([SessionTestUser, SessionTestPost],
+                         [m.__class__ for m in session._sort([post, user])])
+        self.assertEqual('john@doe.com', SessionTestPost.find(1).user.email)
+
+    def test_generated_keys_are_read_back_from_batched_inserts(self):
+        queries = []
+        self.db.connection().log_query = \
+            lambda query, bindings, time_=None: queries.append(query)
+
+        with Session() as session:
+            users = [SessionTestUser(email='john%d@doe.com' % i)
+                     for i in range(3)]
+            for user in users:
+                user.save()
+
+            users[0].posts().save(SessionTestPost(title='Post 1'))
+            users[1].posts().create(title='Post 2')
+            post = SessionTestPost(title='Post 3')
+            post.user().associate(users[2])
+            post.save()
+
+            self.assertTrue(session.is_pending(users[0]))
+            self.assertEqual(0, SessionTestUser.count())
+
+        self.assertEqual([1, 2, 3], [u.id for u in users])
+        self.assertEqual(3, post.id)
+        self.assertEqual(1, len([q for q in queries if q.startswith('INSERT INTO "users"')]))
+        self.assertEqual(1, len([q for q in queries if q.startswith('INSERT INTO "posts"')]))
+        self.assertEqual(
+            ['john0@doe.com', 'john1@doe.com', 'john2@doe.com'],
+            [p.user.email for p in SessionTestPost.order_by('id').get()]
+        )
+
+    def test_deletes_are_flushed(self):
+        user = SessionTestUser.create(id=1, email='john@doe.com')
+        post = SessionTestPost.create(id=1, title='Post', user_id=1)
+
+        with Session():
+            post.delete()
+            user.delete()
+
+            self.assertEqual(1, SessionTestPost.count())
+
+        self.assertEqual(0, SessionTestPost.count())
+        self.assertEqual(0, SessionTestUser.count())
+        self.assertFalse(user.exists)
+
+    def test_owners_are_touched_once(self):
+        user = SessionTestUser.create(id=1, email='john@doe.com')
+        posts = [SessionTestPost.create(id=i, title='Post', user_id=1)
+                 for i in range(1, 4)]
+
+        queries = []
+        self.db.connection().log_query = \
+            lambda query, bindings, time_=None: queries.append(query)
+
+        with Session():
+            for post in posts:
+                post.title = 'Updated'
+                post.save()
+
+        self.assertEqual(1, len([q for q in queries if q.startswith('UPDATE "users"')]))
+        self.assertEqual(1, len([q for q in queries if q.startswith('UPDATE "posts"')]))
+        self.assertEqual(3, SessionTestPost.where('title', 'Updated').count())
+
+    def test_models_are_discarded_on_error(self):
+        user = SessionTestUser.create(id=1, email='john@doe.com')
+
+        try:
+            with Session():
+                user.email = 'jane@doe.com'
+                user.save()
+
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        self.assertEqual('john@doe.com', SessionTestUser.find(1).email)
+
+    def test_flushed_models_are_rolled_back_on_error(self):
+        try:
+            with Session() as session:
+                SessionTestUser(email='john@doe.com').save()
+                session.flush()
+
+                self.assertEqual(1, SessionTestUser.count())
+
+                SessionTestUser(email='jane@doe.com').save()
+
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+        self.assertEqual(0, SessionTestUser.count())
+        self.assertEqual(0, self.connection().transaction_level())
+
+    def connection(self):
+        return self.db.connection()
+
+    def schema(self):
+        return self.connection().get_schema_builder()
+
+
+class SessionTestUser(Model):
+
+    __table__ = 'users'
+    __guarded__ = []
+
+    @has_many('user_id')
+    def posts(self):
+        return SessionTestPost
+
+
+class SessionTestPost(Model):
+
+    __table__ = 'posts'
+    __guarded__ = []
+    __touches__ = ['user']
+
+    @belongs_to('user_id')
+    def user(self):
+        return SessionTestUser
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from orator.pagination import CursorPaginator, Cursor
+from .. import OratorTestCase
+
+
+class CursorPaginatorTestCase(OratorTestCase):
+
+    def test_returns_relevant_context(self):
+        items = [{'id': 3}, {'id': 4}, {'id': 5}]
+        p = CursorPaginator(items, 2, Cursor({'id': 2}))
+
+        self.assertTrue(p.has_pages())
+        self.assertTrue(p.has_more_pages())
+        self.assertEqual([{'id': 3}, {'id': 4}], p.items)
+        self.assertEqual(Cursor({'id': 4}), p.next_cursor)
+        self.assertEqual(Cursor({'id': 3}, False), p.previous_cursor)
+        self.assertEqual(Cursor({'id': 4}), Cursor.decode(p.next_page))
+
+    def test_first_and_last_pages(self):
+        p = CursorPaginator([{'id': 1}, {'id': 2}], 2)
+
+        self.assertFalse(p.has_pages())
+        self.assertIsNone(p.next_page)
+        self.assertIsNone(p.previous_page)
+
+        p = CursorPaginator([{'id': 5}], 2, Cursor({'id': 4}))
+
+        self.assertFalse(p.has_more_pages())
+        self.assertEqual(Cursor({'id': 5}, False), p.previous_cursor)
+
+    def test_previous_items_are_put_back_in_order(self):
+        items = [{'id': 3}, {'id': 2}, {'id': 1}]
+        p = CursorPaginator(items, 2, Cursor({'id': 4}, False))
+
+        self.assertEqual([{'id': 2}, {'id': 3}], p.items)
+        self.assertEqual(Cursor({'id': 3}), p.next_cursor)
+        self.assertEqual(Cursor({'id': 2}, False), p.previous_cursor)
+
+        p = CursorPaginator([{'id': 1}], 2, Cursor({'id': 2}, False))
+
+        self.assertIsNone(p.previous_cursor)
+        self.assertEqual(Cursor({'id': 1}), p.next_cursor)
+
+    def test_cursor_encoding(self):
+        cursor = Cursor({'id': 3, 'name': 'foo'}, False)
+        decoded = Cursor.decode(cursor.encode())
+
+        self.assertEqual(cursor, decoded)
+        self.assertEqual('foo', decoded.parameter('name'))
+        self.assertTrue(decoded.points_to_previous_items())
+        self.assertIsNone(Cursor.decode('invalid'))
+        self.assertRaises(KeyError, decoded.parameter, 'email')
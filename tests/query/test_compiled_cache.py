@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+from .. import OratorTestCase
+
+from ..utils import MockConnection, MockProcessor
+
+from orator.query.grammars import QueryGrammar, MySQLQueryGrammar
+from orator.query.builder import QueryBuilder
+from orator.query.expression import QueryExpression
+from orator.utils.lru_cache import LRUCache
+
+
+class CompiledCacheTestCase(OratorTestCase):
+
+    def setUp(self):
+        self.grammar = QueryGrammar()
+
+    def test_same_structure_is_compiled_once(self):
+        first = self.get_builder().from_('users').where('id', 1).to_sql()
+        second = self.get_builder().from_('users').where('id', 2).to_sql()
+
+        self.assertEqual('SELECT * FROM "users" WHERE "id" = ?', first)
+        self.assertEqual(first, second)
+        self.assertEqual(
+            {'hits': 1, 'misses': 1, 'size': 1, 'max_size': 512},
+            self.grammar.get_compiled_cache().stats()
+        )
+
+    def test_fingerprint_ignores_bound_values_only(self):
+        def fingerprint(callback):
+            return callback(self.get_builder().from_('users')).get_fingerprint()
+
+        self.assertEqual(fingerprint(lambda q: q.where('id', 1)),
+                         fingerprint(lambda q: q.where('id', 2)))
+        self.assertEqual(fingerprint(lambda q: q.where_in('id', [1, 2])),
+                         fingerprint(lambda q: q.where_in('id', [3, 4])))
+        self.assertNotEqual(fingerprint(lambda q: q.where_in('id', [1, 2])),
+                            fingerprint(lambda q: q.where_in('id', [1, 2, 3])))
+        self.assertNotEqual(fingerprint(lambda q: q.where('id', 1)),
+                            fingerprint(lambda q: q.where('id', QueryExpression('1'))))
+        self.assertNotEqual(fingerprint(lambda q: q.limit(10)),
+                            fingerprint(lambda q: q.limit(20)))
+        self.assertNotEqual(fingerprint(lambda q: q.where('id', 1)),
+                            fingerprint(lambda q: q.where('id', '>', 1)))
+
+    def test_nested_queries_are_part_of_the_fingerprint(self):
+        def query(column):
+            return self.get_builder().from_('users').where_in(
+                'id', self.get_builder().from_('posts').select(column))
+
+        self.assertEqual('SELECT * FROM "users" WHERE "id" IN (SELECT "user_id" FROM "posts")',
+                         query('user_id').to_sql())
+        self.assertEqual('SELECT * FROM "users" WHERE "id" IN (SELECT "author_id" FROM "posts")',
+                         query('author_id').to_sql())
+
+    def test_join_bindings_are_set_on_cache_hits(self):
+        def query(value):
+            return self.get_builder().from_('users')\
+                .join_where('contacts', 'users.id', '=', value)\
+                .where('name', 'foo')
+
+        query(1).to_sql()
+        builder = query(2)
+
+        self.assertEqual(
+            'SELECT * FROM "users" INNER JOIN "contacts" ON "users"."id" = ? WHERE "name" = ?',
+            builder.to_sql()
+        )
+        self.assertEqual(1, self.grammar.get_compiled_cache().hits)
+        self.assertEqual([2, 'foo'], builder.get_bindings())
+
+    def test_table_prefix_is_part_of_the_key(self):
+        self.get_builder().from_('users').to_sql()
+        self.grammar.set_table_prefix('prefix_')
+
+        self.assertEqual('SELECT * FROM "prefix_users"',
+                         self.get_builder().from_('users').to_sql())
+
+    def test_mysql_unions_are_cached(self):
+        self.grammar = MySQLQueryGrammar()
+
+        def query():
+            return self.get_builder().select('*').from_('users').where('id', 1)\
+                .union(self.get_builder().select('*').from_('users').where('id', 2))
+
+        self.assertEqual(query().to_sql(), query().to_sql())
+        self.assertEqual(
+            '(SELECT * FROM `users` WHERE `id` = %s) UNION (SELECT * FROM `users` WHERE `id` = %s)',
+            query().to_sql()
+        )
+
+    def test_cache_can_be_disabled(self):
+        self.grammar = QueryGrammar(compiled_cache_size=0)
+
+        self.assertIsNone(self.grammar.get_compiled_cache())
+        self.assertEqual('SELECT * FROM "users"',
+                         self.get_builder().from_('users').to_sql())
+
+    def test_lru_cache_discards_least_recently_used_entries(self):
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+
+        self.assertEqual(1, cache.get('a'))
+
+        cache.put('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual({'hits': 1, 'misses': 1, 'size': 2, 'max_size': 2},
+                         cache.stats())
+
+    def get_builder(self):
+        processor = MockProcessor().prepare_mock()
+        connection = MockConnection().prepare_mock()
+
+        return QueryBuilder(connection, self.grammar, processor)
@@ -15,9 +15,13 @@ from orator.query.grammars import (
     MySQLQueryGrammar
 )
 from orator.query.builder import QueryBuilder
+from orator.query.processors import (
+    SQLiteQueryProcessor, MySQLQueryProcessor
+)
 from orator.query.expression import QueryExpression
 from orator.query.join_clause import JoinClause
 from orator.support import Collection
+from orator.pagination import CursorPaginator, Cursor
 
 
 class QueryBuilderTestCase(OratorTestCase):
@@ -320,6 +324,44 @@ class QueryBuilderTestCase(OratorTestCase):
         )
         self.assertEqual([1, 2, 3], builder.get_bindings())
 
+    def test_where_any(self):
+        builder = self.get_postgres_builder()
+        builder.select('*').from_('users').where_any('id', [1, 2, 3])
+        self.assertEqual(
+            'SELECT * FROM "users" WHERE "id" = ANY(%s)',
+            builder.to_sql()
+        )
+        self.assertEqual([[1, 2, 3]], builder.get_bindings())
+
+        builder = self.get_postgres_builder()
+        builder.select('*').from_('users').where_not_any('id', Collection([1, 2]))
+        self.assertEqual(
+            'SELECT * FROM "users" WHERE "id" <> ALL(%s)',
+            builder.to_sql()
+        )
+        self.assertEqual([[1, 2]], builder.get_bindings())
+
+        builder = self.get_builder()
+        builder.select('*').from_('users').where_any('id', [1, 2, 3])
+        self.assertEqual(
+            'SELECT * FROM "users" WHERE "id" IN (?, ?, ?)',
+            builder.to_sql()
+        )
+        self.assertEqual([1, 2, 3], builder.get_bindings())
+
+    def test_matches_nothing(self):
+        builder = self.get_builder()
+        builder.select('*').from_('users').where('active', 1).where_in('id', [])
+        self.assertTrue(builder.matches_nothing())
+
+        builder = self.get_builder()
+        builder.select('*').from_('users').where_in('id', []).or_where('active', 1)
+        self.assertFalse(builder.matches_nothing())
+
+        builder = self.get_builder()
+        builder.select('*').from_('users').where_in('id', [1])
+        self.assertFalse(builder.matches_nothing())
+
     def test_unions(self):
         builder = self.get_builder()
         builder.select('*').from_('users').where('id', '=', 1)
@@ -1217,6 +1259,260 @@ class QueryBuilderTestCase(OratorTestCase):
         )
         self.assertTrue(result)
 
+    def test_insert_many_batches_multi_row_inserts(self):
+        builder = self.get_postgres_builder()
+        connection = builder.get_connection()
+        connection.affecting_statement.side_effect = \
+            lambda sql, bindings: len(bindings) // 2
+
+        rows = [{'name': 'user%d' % i, 'email': 'foo%d' % i}
+                for i in range(5)]
+        result = builder.from_('users').insert_many(rows, batch_size=2)
+
+        self.assertEqual(5, result)
+        two_rows = 'INSERT INTO "users" ("email", "name") ' \
+                   'VALUES (%s, %s), (%s, %s)'
+        one_row = 'INSERT INTO "users" ("email", "name") VALUES (%s, %s)'
+        self.assertEqual(
+            [
+                mock.call(two_rows, ['foo0', 'user0', 'foo1', 'user1']),
+                mock.call(two_rows, ['foo2', 'user2', 'foo3', 'user3']),
+                mock.call(one_row, ['foo4', 'user4'])
+            ],
+            connection.affecting_statement.call_args_list
+        )
+
+    def test_insert_many_uses_executemany_when_faster(self):
+        builder = self.get_sqlite_builder()
+        connection = builder.get_connection()
+        connection.insert_many.side_effect = lambda sql, rows: len(rows)
+
+        rows = ({'name': 'user%d' % i, 'email': 'foo%d' % i}
+                for i in range(3))
+        result = builder.from_('users').insert_many(rows, batch_size=2)
+
+        self.assertEqual(3, result)
+        query = 'INSERT INTO "users" ("email", "name") VALUES (?, ?)'
+        self.assertEqual(
+            [
+                mock.call(query, [['foo0', 'user0'], ['foo1', 'user1']]),
+                mock.call(query, [['foo2', 'user2']])
+            ],
+            connection.insert_many.call_args_list
+        )
+        self.assertFalse(connection.affecting_statement.called)
+
+    def test_insert_many_respects_the_parameters_limit(self):
+        grammar = SQLiteQueryGrammar()
+        grammar._executemany_inserts = False
+
+        self.assertEqual(333, grammar.get_insert_batch_size(3))
+        self.assertEqual(100, grammar.get_insert_batch_size(3, 100))
+        self.assertEqual(1, grammar.get_insert_batch_size(1000))
+        self.assertEqual(1000, SQLiteQueryGrammar().get_insert_batch_size(3))
+        self.assertEqual(21845, PostgresQueryGrammar()
+                         .get_insert_batch_size(3, 100000))
+
+    def test_insert_many_requires_the_same_columns(self):
+        builder = self.get_postgres_builder()
+
+        self.assertEqual(0, builder.from_('users').insert_many([]))
+        self.assertRaises(
+            ArgumentError,
+            builder.from_('users').insert_many,
+            [{'email': 'foo', 'name': 'bar'}, {'email': 'foo', 'age': 12}]
+        )
+
+    def test_insert_many_get_ids(self):
+        builder = self.get_postgres_builder()
+        processor = builder.get_processor()
+        processor.process_insert_many_get_ids = mock.MagicMock(
+            side_effect=lambda query, sql, bindings, count, sequence:
+                list(range(count)))
+
+        rows = [{'name': 'user%d' % i, 'email': 'foo%d' % i}
+                for i in range(3)]
+        result = builder.from_('users').insert_many_get_ids(rows, 'id', 2)
+
+        self.assertEqual([0, 1, 0], result)
+        two_rows = 'INSERT INTO "users" ("email", "name") ' \
+                   'VALUES (%s, %s), (%s, %s) RETURNING "id"'
+        one_row = 'INSERT INTO "users" ("email", "name") ' \
+                  'VALUES (%s, %s) RETURNING "id"'
+        self.assertEqual(
+            [
+                mock.call(builder, two_rows,
+                          ['foo0', 'user0', 'foo1', 'user1'], 2, 'id'),
+                mock.call(builder, one_row, ['foo2', 'user2'], 1, 'id')
+            ],
+            processor.process_insert_many_get_ids.call_args_list
+        )
+
+    def test_insert_many_get_ids_on_sqlite(self):
+        builder = self.get_sqlite_builder()
+        connection = builder.get_connection()
+        connection.get_cursor = mock.MagicMock(
+            return_value=mock.MagicMock(lastrowid=12))
+
+        ids = SQLiteQueryProcessor().process_insert_many_get_ids(
+            builder, 'INSERT', ['foo'], 3)
+
+        self.assertEqual([10, 11, 12], ids)
+
+    def test_insert_many_get_ids_on_mysql_steps_by_the_increment(self):
+        builder = self.get_mysql_builder()
+        connection = builder.get_connection()
+        connection.get_cursor = mock.MagicMock(
+            return_value=mock.MagicMock(lastrowid=4))
+        connection.select.return_value = [{'step': 3}]
+
+        ids = MySQLQueryProcessor().process_insert_many_get_ids(
+            builder, 'INSERT', ['foo'], 3)
+
+        self.assertEqual([4, 7, 10], ids)
+        connection.select.assert_called_once_with(
+            'SELECT @@auto_increment_increment AS step', [], False)
+
+        connection.select.reset_mock()
+        connection.select.return_value = [{'step': 1}]
+
+        ids = MySQLQueryProcessor().process_insert_many_get_ids(
+            builder, 'INSERT', ['foo'], 2)
+
+        self.assertEqual([4, 5], ids)
+
+        connection.select.reset_mock()
+
+        ids = MySQLQueryProcessor().process_insert_many_get_ids(
+            builder, 'INSERT', ['foo'], 1)
+
+        self.assertEqual([4], ids)
+        self.assertFalse(connection.select.called)
+
+    def test_upsert(self):
+        rows = [{'email': 'foo', 'name': 'john'}, {'email': 'bar', 'name': 'jane'}]
+        bindings = ['foo', 'john', 'bar', 'jane']
+
+        builder = self.get_postgres_builder()
+        builder.get_connection().affecting_statement.return_value = 2
+        result = builder.from_('users').upsert(rows, 'email')
+        builder.get_connection().affecting_statement.assert_called_once_with(
+            'INSERT INTO "users" ("email", "name") VALUES (%s, %s), (%s, %s) '
+            'ON CONFLICT ("email") DO UPDATE SET "name" = excluded."name"',
+            bindings
+        )
+        self.assertEqual(2, result)
+
+        builder = self.get_sqlite_builder()
+        builder.from_('users').upsert(rows, ['email'], [])
+        builder.get_connection().affecting_statement.assert_called_once_with(
+            'INSERT INTO "users" ("email", "name") VALUES (?, ?), (?, ?) '
+            'ON CONFLICT ("email") DO NOTHING',
+            bindings
+        )
+
+        builder = self.get_mysql_builder()
+        builder.from_('users').upsert(rows, 'email')
+        builder.get_connection().affecting_statement.assert_called_once_with(
+            'INSERT INTO `users` (`email`, `name`) VALUES (%s, %s), (%s, %s) '
+            'ON DUPLICATE KEY UPDATE `name` = VALUES(`name`)',
+            bindings
+        )
+
+    def test_upsert_with_update_values(self):
+        builder = self.get_postgres_builder()
+        builder.from_('users').upsert(
+            {'email': 'foo', 'name': 'john'}, 'email',
+            {'name': 'jane', 'votes': QueryExpression('"users"."votes" + 1')}
+        )
+        builder.get_connection().affecting_statement.assert_called_once_with(
+            'INSERT INTO "users" ("email", "name") VALUES (%s, %s) '
+            'ON CONFLICT ("email") DO UPDATE SET "name" = %s, '
+            '"votes" = "users"."votes" + 1',
+            ['foo', 'john', 'jane']
+        )
+
+    def test_upsert_in_batches(self):
+        builder = self.get_sqlite_builder()
+        connection = builder.get_connection()
+        connection.affecting_statement.side_effect = \
+            lambda sql, bindings: len(bindings)
+
+        rows = ({'email': 'foo%d' % i} for i in range(3))
+        result = builder.from_('users').upsert(rows, 'email', batch_size=2)
+
+        self.assertEqual(3, result)
+        self.assertEqual(
+            [
+                mock.call('INSERT INTO "users" ("email") VALUES (?), (?) '
+                          'ON CONFLICT ("email") DO NOTHING', ['foo0', 'foo1']),
+                mock.call('INSERT INTO "users" ("email") VALUES (?) '
+                          'ON CONFLICT ("email") DO NOTHING', ['foo2'])
+            ],
+            connection.affecting_statement.call_args_list
+        )
+
+    def test_update_many(self):
+        rows = [{'id': 1, 'name': 'john', 'votes': 2},
+                {'id': 2, 'name': 'jane', 'votes': 3}]
+
+        builder = self.get_sqlite_builder()
+        builder.get_connection().update.return_value = 2
+        result = builder.from_('users').where('active', True).update_many(rows)
+        builder.get_connection().update.assert_called_once_with(
+            'UPDATE "users" SET '
+            '"name" = CASE "id" WHEN ? THEN ? WHEN ? THEN ? ELSE "name" END, '
+            '"votes" = CASE "id" WHEN ? THEN ? WHEN ? THEN ? ELSE "votes" END '
+            'WHERE "id" IN (?, ?) AND ("active" = ?)',
+            [1, 'john', 2, 'jane', 1, 2, 2, 3, 1, 2, True]
+        )
+        self.assertEqual(2, result)
+
+        builder = self.get_postgres_builder()
+        builder.from_('users').update_many(rows)
+        builder.get_connection().update.assert_called_once_with(
+            'UPDATE "users" SET "name" = "orator_values"."orator_1", '
+            '"votes" = "orator_values"."orator_2" '
+            'FROM (SELECT "id", "name", "votes" FROM "users" WHERE false '
+            'UNION ALL VALUES (%s, %s, %s), (%s, %s, %s)) '
+            'AS "orator_values" ("orator_0", "orator_1", "orator_2") '
+            'WHERE "users"."id" = "orator_values"."orator_0"',
+            [1, 'john', 2, 2, 'jane', 3]
+        )
+
+    def test_update_many_groups_rows_by_columns_and_batches(self):
+        builder = self.get_mysql_builder()
+        connection = builder.get_connection()
+        connection.update.side_effect = lambda sql, bindings: 1
+
+        result = builder.from_('users').update_many([
+            {'id': 1, 'name': 'john'},
+            {'id': 2, 'votes': 3},
+            {'id': 3, 'name': 'jane'},
+            {'id': 4}
+        ], batch_size=1)
+
+        self.assertEqual(3, result)
+        self.assertEqual(
+            [
+                mock.call('UPDATE `users` SET `name` = CASE `id` WHEN %s THEN %s '
+                          'ELSE `name` END WHERE `id` IN (%s)', [1, 'john', 1]),
+                mock.call('UPDATE `users` SET `name` = CASE `id` WHEN %s THEN %s '
+                          'ELSE `name` END WHERE `id` IN (%s)', [3, 'jane', 3]),
+                mock.call('UPDATE `users` SET `votes` = CASE `id` WHEN %s THEN %s '
+                          'ELSE `votes` END WHERE `id` IN (%s)', [2, 3, 2])
+            ],
+            connection.update.call_args_list
+        )
+
+        self.assertRaises(ArgumentError, builder.update_many, [{'name': 'foo'}])
+
+    def test_copy_requires_a_postgres_connection(self):
+        builder = self.get_builder()
+
+        self.assertRaises(ArgumentError, builder.from_('users').copy_to,
+                          mock.MagicMock())
+
     def test_insert_get_id_method(self):
         builder = self.get_builder()
         builder.get_processor().process_insert_get_id.return_value = 1
@@ -1620,6 +1916,79 @@ class QueryBuilderTestCase(OratorTestCase):
         for users in builder.from_('users').chunk(2):
             self.assertEqual(2, len(users))
 
+    def test_for_page_after_id(self):
+        builder = self.get_builder()
+        builder.select('*').from_('users').order_by('id', 'desc')\
+            .order_by('name').for_page_after_id(15, 1)
+        self.assertEqual(
+            'SELECT * FROM "users" WHERE "id" > ? '
+            'ORDER BY "name" ASC, "id" ASC LIMIT 15',
+            builder.to_sql()
+        )
+        self.assertEqual([1], builder.get_bindings())
+
+    def test_chunk_by_id(self):
+        builder = self.get_builder()
+        results = [{'id': 1}, {'id': 2}, {'id': 3}, {'id': 4}, {'id': 5}]
+        queries = []
+
+        def select(query, bindings, _):
+            queries.append((query, bindings))
+            last_id = bindings[0] if bindings else 0
+
+            return [r for r in results if r['id'] > last_id][:2]
+
+        builder.get_connection().select.side_effect = select
+        builder.get_processor().process_select = mock.MagicMock(side_effect=lambda builder_, results_: results_)
+
+        chunks = list(builder.from_('users').chunk_by_id(2))
+
+        self.assertEqual([[{'id': 1}, {'id': 2}], [{'id': 3}, {'id': 4}], [{'id': 5}]], chunks)
+        self.assertEqual([
+            ('SELECT * FROM "users" ORDER BY "id" ASC LIMIT 2', []),
+            ('SELECT * FROM "users" WHERE "id" > ? ORDER BY "id" ASC LIMIT 2', [2]),
+            ('SELECT * FROM "users" WHERE "id" > ? ORDER BY "id" ASC LIMIT 2', [4]),
+        ], queries)
+
+    def test_cursor_paginate(self):
+        builder = self.get_builder()
+        results = [{'id': 4}, {'id': 5}, {'id': 6}]
+        builder.get_connection().select.return_value = results
+        builder.get_processor().process_select = mock.MagicMock(side_effect=lambda builder_, results_: results_)
+
+        cursor = Cursor({'id': 3})
+        paginator = builder.from_('users').cursor_paginate(2, cursor.encode())
+
+        builder.get_connection().select.assert_called_once_with(
+            'SELECT * FROM "users" WHERE "id" > ? ORDER BY "id" ASC LIMIT 3',
+            [3], True
+        )
+        self.assertIsInstance(paginator, CursorPaginator)
+        self.assertEqual([{'id': 4}, {'id': 5}], paginator.items)
+        self.assertEqual(Cursor({'id': 5}), paginator.next_cursor)
+        self.assertEqual(Cursor({'id': 4}, False), paginator.previous_cursor)
+
+    def test_cursor_paginate_on_multiple_columns(self):
+        builder = self.get_builder()
+        builder.get_connection().select.return_value = []
+        builder.get_processor().process_select = mock.MagicMock(side_effect=lambda builder_, results_: results_)
+
+        cursor = Cursor({'name': 'foo', 'id': 3}, False)
+        builder.from_('users').order_by('name', 'desc').order_by('users.id')\
+            .cursor_paginate(2, cursor)
+
+        builder.get_connection().select.assert_called_once_with(
+            'SELECT * FROM "users" WHERE (("name" > ?) OR ("name" = ? AND "users"."id" < ?)) '
+            'ORDER BY "name" ASC, "users"."id" DESC LIMIT 3',
+            ['foo', 'foo', 3], True
+        )
+
+    def test_cursor_paginate_requires_column_orders(self):
+        builder = self.get_builder()
+        builder.from_('users').order_by_raw('RANDOM()')
+
+        self.assertRaises(ArgumentError, builder.cursor_paginate, 2, Cursor({'id': 3}))
+
     def test_not_specifying_columns_sects_all(self):
         builder = self.get_builder()
         builder.from_('users')
@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 
+import os
+import threading
+
 from . import OratorTestCase
 from . import mock
 from .utils import MockConnection, MockManager
@@ -75,6 +78,90 @@ class ConnectionTestCase(OratorTestCase):
 
         self.assertEqual('sqlite', manager.get_default_connection())
 
+    def test_pooled_connections_are_shared_between_threads(self):
+        database = '/tmp/orator_pool_test_database.db'
+        if os.path.exists(database):
+            os.remove(database)
+
+        manager = DatabaseManager({
+            'sqlite': {
+                'driver': 'sqlite',
+                'database': database,
+                'check_same_thread': False,
+                'pool': {'max_size': 2, 'pre_ping': False}
+            }
+        })
+        manager.statement(
+            'CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR)')
+        manager.release()
+
+        def work():
+            for _ in range(5):
+                with manager.transaction():
+                    manager.table('users').insert({'name': 'foo'})
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        pool = manager.connection().get_pool()
+
+        self.assertEqual(20, manager.table('users').count())
+        self.assertLessEqual(pool.size, 2)
+
+        manager.release()
+
+        self.assertEqual(0, pool.checked_out)
+
+        os.remove(database)
+
+    def test_pooled_connections_are_given_back_after_each_query(self):
+        manager = DatabaseManager({
+            'sqlite': {
+                'driver': 'sqlite',
+                'database': ':memory:',
+                'check_same_thread': False,
+                'pool': {'max_size': 2, 'timeout': 1, 'pre_ping': False}
+            }
+        })
+
+        # The threads never release their connections
+        def work():
+            manager.select('SELECT 1')
+
+        for _ in range(3):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+
+        pool = manager.connection().get_pool()
+
+        self.assertEqual(0, pool.checked_out)
+        self.assertEqual(1, pool.size)
+
+    def test_connection_scope_releases_pooled_connections(self):
+        manager = DatabaseManager({
+            'sqlite': {
+                'driver': 'sqlite',
+                'database': ':memory:',
+                'pool': True
+            }
+        })
+
+        connection = manager.connection()
+        pool = connection.get_pool()
+
+        with connection.scope():
+            connection.select('SELECT 1')
+
+            with connection.scope():
+                connection.select('SELECT 1')
+
+            self.assertEqual(1, pool.checked_out)
+
+        self.assertEqual(0, pool.checked_out)
+        self.assertEqual(1, pool.idle)
+
     def _get_manager(self):
         manager = MockManager({
             'default': 'sqlite',
@@ -22,6 +22,8 @@ class MockConnection(ConnectionInterface):
         self.table = mock.MagicMock()
         self.select = mock.MagicMock()
         self.insert = mock.MagicMock()
+        self.insert_many = mock.MagicMock()
+        self.affecting_statement = mock.MagicMock()
         self.update = mock.MagicMock()
         self.delete = mock.MagicMock()
         self.statement = mock.MagicMock()